@@ -6,10 +6,12 @@ from .environmental_agent import EnvironmentalAgent
 from .prediction_agent import PredictionAgent
 from .memory_agent import MemoryAgent
 from .coordinator_agent import CoordinatorAgent
+from .coordinator_pool import CoordinatorPool
 
 __all__ = [
     'EnvironmentalAgent',
     'PredictionAgent',
     'MemoryAgent',
-    'CoordinatorAgent'
+    'CoordinatorAgent',
+    'CoordinatorPool'
 ] 
\ No newline at end of file
@@ -2,8 +2,13 @@
 Coordinator Agent for managing the interaction between all agents.
 """
 
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
 import datetime
 import sys
 import os
@@ -13,33 +18,358 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from agents.environmental_agent import EnvironmentalAgent
 from agents.prediction_agent import PredictionAgent
 from agents.memory_agent import MemoryAgent
-from utils.nasa_data import NASAEarthdata
+from utils.nasa_data import NASAEarthdata, POWER_COLUMNS
+from utils.iot_data import IoTDataLoader
+from utils.timeseries_store import open_sensor_store
+from utils.rollups import RollupPyramid
+from utils.sensor_follower import SensorFileFollower
+from utils.online_stats import OnlineStats, SlidingWindowStats
+from utils.anomalies import AnomalyDetector, summarize_anomalies
+from utils.fusion import fuse_sensor_power, daily_features
+from utils.backtest import ActuatorBacktester, default_thresholds
+from utils.control import switch_events, summarize_schedule
+from utils.stages import StageGraph
 from utils.llm_assistant import LLMAssistant
-from config import CROP_TEMP_RANGES
+from config import CROP_TEMP_RANGES, POWER_CACHE_PARAMS, IOT_DATA_PATH, CONTROL_PARAMS
+
+# Number of memoized analysis results kept by the coordinator
+RESULT_CACHE_SIZE = 16
+
+# Environmental logs indexed by the assistant when present
+LOGS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "data", "environmental_logs.txt")
+
+# Sub-agents and resources built on first use, in warm-up order
+LAZY_COMPONENTS = ['env_agent', 'nasa_data', 'archive', 'memory_agent', 'llm_assistant',
+                   'sensor_store', 'sensor_rollups', 'prediction_agent', 'temperature_model']
+
+def _state_nbytes(value: Any) -> int:
+    """Approximate size of a frame, or of the frames in a result dictionary."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, dict):
+        return sum(_state_nbytes(item) for item in value.values() if isinstance(item, pd.DataFrame))
+    return 0
+
+class SharedResources:
+    """
+    Lazily built components of a coordinator.
+    
+    Coordinators given the same instance share its sub-agents, TensorFlow
+    model, NASA client and cache, POWER archive, assistant with its RAG
+    index, sensor store and rollups, so only their session state (current
+    data, crop, memoized results, live feed) is per coordinator.
+    
+    Writes to the shared models and the prediction history (training and
+    reconciling actual temperatures) all go through write(), which runs
+    them one at a time; everything else only reads them.
+    """
+    
+    def __init__(self):
+        """Initialize an empty set of resources."""
+        self.components = {}
+        self.load_times = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        # Guards syncing and querying the shared sensor rollups
+        self.rollup_lock = threading.RLock()
+        # Serializes writes to the shared models and prediction history
+        self.write_lock = threading.Lock()
+        
+    def _lock(self, name: str) -> threading.RLock:
+        """Get the lock guarding the build of one component."""
+        with self._locks_guard:
+            return self._locks.setdefault(name, threading.RLock())
+        
+    def get(self, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        Get a component, building it on first use.
+        
+        Each component is built under its own lock, so a slow build (such
+        as the TensorFlow model) only holds up callers of that component.
+        
+        Args:
+            name: Component name (recorded in load_times)
+            factory: Function building the component
+            
+        Returns:
+            The component
+        """
+        component = self.components.get(name)
+        if component is None:
+            with self._lock(name):
+                component = self.components.get(name)
+                if component is None:
+                    start = time.perf_counter()
+                    component = factory()
+                    self.load_times[name] = time.perf_counter() - start
+                    self.components[name] = component
+        return component
+        
+    def write(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run a write to shared state, one writer at a time.
+        
+        Args:
+            func: Function training a model or updating the prediction history
+            *args: Arguments for func
+            
+        Returns:
+            The result of func
+        """
+        with self.write_lock:
+            return func(*args)
+        
+    def report(self) -> Dict[str, Any]:
+        """
+        Get which components are built and how long each took.
+        
+        Returns:
+            Dictionary with the load time in seconds of each built component
+            and the names of those not built yet
+        """
+        return {
+            'loaded': dict(self.load_times),
+            'pending': [name for name in LAZY_COMPONENTS if name not in self.components]
+        }
 
 class CoordinatorAgent:
     """
     Agent for coordinating the interaction between all other agents.
     """
     
-    def __init__(self):
-        """Initialize the coordinator agent and its sub-agents."""
-        self.env_agent = EnvironmentalAgent()
-        self.prediction_agent = PredictionAgent()
-        self.memory_agent = MemoryAgent()
-        self.nasa_data = NASAEarthdata()
-        self.llm_assistant = LLMAssistant()
-        
-        self.current_data = None
+    def __init__(self, warm_up: bool = False, resources: Optional[SharedResources] = None):
+        """
+        Initialize the coordinator agent.
+        
+        Sub-agents, the POWER archive, the assistant and the TensorFlow model
+        are built the first time they are used (see LAZY_COMPONENTS), so
+        creating the coordinator is fast whichever tab is opened first.
+        
+        Args:
+            warm_up: Whether to build them in a background thread right away
+            resources: Components to share with other coordinators (own set if None)
+        """
+        self.resources = resources or SharedResources()
+        self.warm_up_thread = None
+        self.iot_loader = IoTDataLoader()
+        self.sensor_follower = None
+        self.live_stats = {}
+        self.live_window = SlidingWindowStats('24h')
+        self.anomaly_detector = AnomalyDetector()
+        self.live_anomalies = None
+        self.live_daily = None
+        self.control_engine = None
+        self.live_actuators = {}
+        self._live_lock = threading.Lock()
+        
+        self._current_data = None
+        self._temperature_stats = None
+        self.data_version = 0
+        self._results = OrderedDict()
+        # Size of each piece of session state, kept up to date as it changes
+        self._state_lock = threading.RLock()
+        self._state_bytes = {}
+        self._nbytes = 0
+        self.result_cache_stats = {'hits': 0, 'misses': 0}
         self.current_crop = None
+        self.site_data = {}
+        self.location = None
+        self.fused_data = None
+        
+        if warm_up:
+            self.warm_up()
+        
+    def _component(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Get a shared component, building it on first use."""
+        return self.resources.get(name, factory)
+        
+    @property
+    def env_agent(self) -> EnvironmentalAgent:
+        """Environmental analysis agent."""
+        return self._component('env_agent', EnvironmentalAgent)
+        
+    @property
+    def prediction_agent(self) -> PredictionAgent:
+        """Prediction agent (its TensorFlow model loads separately on first use)."""
+        return self._component('prediction_agent', PredictionAgent)
+        
+    @property
+    def memory_agent(self) -> MemoryAgent:
+        """Memory agent with the prediction history."""
+        return self._component('memory_agent', MemoryAgent)
+        
+    @property
+    def nasa_data(self) -> NASAEarthdata:
+        """NASA POWER client."""
+        return self._component('nasa_data', NASAEarthdata)
         
-        # Try to set up RAG with environmental logs if they exist
-        logs_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                                "data", "environmental_logs.txt")
-        if os.path.exists(logs_path):
-            self.llm_assistant.setup_rag(logs_path)
+    @property
+    def archive(self) -> Any:
+        """Parquet archive of POWER history (imports pyarrow on first use)."""
+        def create():
+            from utils.power_archive import PowerArchive
+            return PowerArchive()
+        return self._component('archive', create)
         
-    def fetch_data(self, lat: float, lon: float, radius: float, days: int = 6) -> Dict[str, Any]:
+    @property
+    def llm_assistant(self) -> LLMAssistant:
+        """LLM assistant, with RAG over the environmental logs if they exist."""
+        def create():
+            assistant = LLMAssistant()
+            if os.path.exists(LOGS_PATH):
+                assistant.setup_rag(LOGS_PATH)
+            return assistant
+        return self._component('llm_assistant', create)
+        
+    @property
+    def sensor_store(self) -> Any:
+        """Memory-mapped store of IoT sensor readings."""
+        return self._component('sensor_store', open_sensor_store)
+        
+    @property
+    def sensor_rollups(self) -> RollupPyramid:
+        """Rollups of the sensor store, synced by _sync_rollups; short spans read the store."""
+        def create():
+            store = self.sensor_store
+            return RollupPyramid(['temperature', 'humidity', 'water_level'], source=store.range)
+        return self._component('sensor_rollups', create)
+        
+    @property
+    def load_times(self) -> Dict[str, float]:
+        """Seconds taken to build each lazily built component."""
+        return self.resources.load_times
+        
+    def _load_temperature_model(self) -> bool:
+        """Import TensorFlow and load the saved temperature model."""
+        return self.prediction_agent.temperature_predictor.model is not None
+        
+    def warm_up(self, components: Optional[List[str]] = None,
+                background: bool = True) -> Optional[threading.Thread]:
+        """
+        Build lazy components ahead of their first use.
+        
+        Args:
+            components: Names from LAZY_COMPONENTS to build (all if None)
+            background: Whether to build them in a daemon thread
+            
+        Returns:
+            The warm-up thread, or None when run in the foreground
+        """
+        names = components or LAZY_COMPONENTS
+        
+        def run():
+            for name in names:
+                try:
+                    if name == 'temperature_model':
+                        self._component(name, self._load_temperature_model)
+                    else:
+                        getattr(self, name)
+                except Exception as e:
+                    print(f"Error warming up {name}: {e}")
+                    
+        if not background:
+            run()
+            return None
+            
+        self.warm_up_thread = threading.Thread(target=run, name="coordinator-warm-up", daemon=True)
+        self.warm_up_thread.start()
+        return self.warm_up_thread
+        
+    def get_load_report(self) -> Dict[str, Any]:
+        """
+        Get which lazy components are built and how long each took.
+        
+        Returns:
+            Dictionary with the load time in seconds of each built component
+            and the names of those not built yet
+        """
+        return self.resources.report()
+        
+    @property
+    def current_data(self) -> Optional[pd.DataFrame]:
+        """Current daily environmental data."""
+        return self._current_data
+        
+    @current_data.setter
+    def current_data(self, df: Optional[pd.DataFrame]) -> None:
+        self._current_data = df
+        self._temperature_stats = None
+        self.data_version += 1
+        self._track('current_data', df)
+        
+    def _track(self, slot: Any, value: Any) -> None:
+        """
+        Record the size of one piece of session state after it changed.
+        
+        Each value is measured once when it is stored, so session_nbytes()
+        never has to walk the frames.
+        
+        Args:
+            slot: Name of the state (e.g. 'fused_data' or a result key)
+            value: New value, or None once the state is dropped
+        """
+        nbytes = _state_nbytes(value)
+        with self._state_lock:
+            self._nbytes += nbytes - self._state_bytes.pop(slot, 0)
+            if nbytes:
+                self._state_bytes[slot] = nbytes
+        
+    def _cached(self, name: str, compute: Callable[[], Dict[str, Any]],
+                crop: Optional[str] = None, extra: tuple = ()) -> Dict[str, Any]:
+        """
+        Get a result memoized per (data version, crop, model version).
+        
+        Replacing the current data bumps the data version and training bumps
+        the model version, so a result is recomputed only when one of its
+        inputs changed; repeated calls in between return the same object,
+        which callers must treat as read-only.
+        
+        Args:
+            name: Name of the result
+            compute: Function computing the result
+            crop: Crop the result depends on (None if it does not)
+            extra: Other hashable inputs of the result, such as the sensor
+                store length and the queried time range
+            
+        Returns:
+            The memoized or freshly computed result
+        """
+        key = (name, self.data_version, crop, self.prediction_agent.model_version, extra)
+        with self._state_lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.result_cache_stats['hits'] += 1
+                return self._results[key]
+            
+        self.result_cache_stats['misses'] += 1
+        result = compute()
+        with self._state_lock:
+            self._results[key] = result
+            self._track(key, result)
+            while len(self._results) > RESULT_CACHE_SIZE:
+                evicted, _ = self._results.popitem(last=False)
+                self._track(evicted, None)
+        return result
+        
+    def _sensor_version(self) -> int:
+        """Number of readings in the sensor store, which only ever grows."""
+        self.sensor_store.refresh()
+        return len(self.sensor_store)
+        
+    def _get_temperature_stats(self) -> Optional[OnlineStats]:
+        """
+        Get the temperature accumulator of the current data.
+        
+        It is built in one pass the first time it is needed after the data
+        changes and then reused by every analysis until the next change.
+        """
+        if self._temperature_stats is None and self._current_data is not None:
+            self._temperature_stats = OnlineStats.from_values(self._current_data['temperature'].to_numpy())
+        return self._temperature_stats
+        
+    def fetch_data(self, lat: float, lon: float, radius: float, days: int = 6,
+                   use_archive: bool = True, aggregate_area: bool = False) -> Dict[str, Any]:
         """
         Fetch NASA data for the specified location.
         
@@ -48,38 +378,260 @@ class CoordinatorAgent:
             lon: Longitude
             radius: Radius in km
             days: Number of days of historical data
+            use_archive: Whether to read archived history before calling the API
+            aggregate_area: Whether to aggregate every grid cell within the radius
+                instead of using the centre point only
             
         Returns:
-            Status dictionary
+            Status dictionary with the per-stage timings
         """
-        try:
-            # Fetch temperature data
-            temp_df = self.nasa_data.get_lst_data(lat, lon, radius, days)
-            
-            # Fetch soil moisture data
-            moisture_df = self.nasa_data.get_soil_moisture(lat, lon, radius, days)
+        return self.refresh(lat, lon, radius, days, train=False,
+                            use_archive=use_archive, aggregate_area=aggregate_area)
+        
+    def refresh(self, lat: float, lon: float, radius: float, days: int = 6,
+                crop: Optional[str] = None, train: bool = True, use_archive: bool = True,
+                aggregate_area: bool = False) -> Dict[str, Any]:
+        """
+        Fetch NASA data for a location and bring everything that depends on it up to date.
+        
+        The refresh runs as a stage graph: the POWER fetch, loading the
+        prediction history and loading the TensorFlow model are independent
+        and run at the same time, and processing, the memory update and
+        training each start as soon as their inputs are ready.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            radius: Radius in km
+            days: Number of days of historical data
+            crop: Crop to set first (current crop if None)
+            train: Whether to train the prediction model on the new data
+            use_archive: Whether to read archived history before calling the API
+            aggregate_area: Whether to aggregate every grid cell within the radius
+                instead of using the centre point only
             
-            # Process temperature data
-            temp_df = self.nasa_data.process_temperature_data(temp_df)
+        Returns:
+            Status dictionary with the training results (if trained) and the
+            'stages' timings, wall time and summed stage time
+        """
+        if crop is not None:
+            result = self.set_crop(crop)
+            if result['status'] == 'error':
+                return result
+                
+        def fetch() -> pd.DataFrame:
+            if aggregate_area:
+                return self.nasa_data.fetch_area_data(lat, lon, radius, days)
+            if use_archive:
+                return self._load_power_data(lat, lon, radius, days)
+            return self.nasa_data.fetch_power_data(lat, lon, radius, days)
             
-            # Merge datasets
-            self.current_data = self.nasa_data.merge_datasets(temp_df, moisture_df)
+        def commit(df: pd.DataFrame) -> pd.DataFrame:
+            self.current_data = df
+            self.location = {'lat': lat, 'lon': lon, 'radius': radius}
+            return df
             
-            # Update actual temperatures in memory if we have a crop set
+        def update_memory(df: pd.DataFrame, memory_agent: MemoryAgent) -> None:
             if self.current_crop is not None:
-                self._update_actual_temperatures()
+                self.resources.write(self._update_actual_temperatures)
+                
+        graph = StageGraph()
+        graph.add('fetch', fetch)
+        graph.add('memory', lambda: self.memory_agent)
+        graph.add('process', lambda df: self.nasa_data.process_temperature_data(df), ['fetch'])
+        graph.add('fill', lambda df: self.nasa_data.fill_missing_values(df), ['process'])
+        graph.add('commit', commit, ['fill'])
+        graph.add('update_memory', update_memory, ['commit', 'memory'])
+        if train:
+            graph.add('model', lambda: self._component('temperature_model', self._load_temperature_model))
+            graph.add('train', lambda df, loaded: self.train_prediction_model(), ['commit', 'model'])
+        run = graph.run()
+        
+        stages = {
+            'timings': run['timings'],
+            'wall': run['wall'],
+            'total': run['total']
+        }
+        failed = next((name for name in graph.stages if name in run['errors']), None)
+        if failed in ('fetch', 'process', 'fill', 'commit'):
+            return {
+                'status': 'error',
+                'message': f'Error fetching data: {str(run["errors"][failed])}',
+                'stages': stages
+            }
+            
+        result = {
+            'status': 'success',
+            'message': f'Successfully fetched data for location ({lat}, {lon})',
+            'data_shape': self.current_data.shape,
+            'stages': stages
+        }
+        if train:
+            result['training'] = run['results'].get('train') or {
+                'status': 'error',
+                'message': f'Error training model: {run["errors"].get("train") or run["errors"].get("model")}'
+            }
+        return result
+        
+    def _load_power_data(self, lat: float, lon: float, radius: float, days: int) -> pd.DataFrame:
+        """
+        Load POWER data from the local archive, fetching only the days it lacks.
+        
+        Every day of the window missing from the archive is fetched: the
+        most recent run of missing days through the cached client, older
+        gaps (e.g. left by a failed backfill chunk) as date ranges. Fetched
+        days whose values POWER no longer revises are appended to the
+        archive, including days POWER has no values for.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            radius: Radius in km
+            days: Number of days of historical data
+            
+        Returns:
+            Raw POWER DataFrame sorted by date
+        """
+        cell = self.nasa_data.resolve_grid_cell(lat, lon)
+        end_date = pd.Timestamp(datetime.datetime.now()).normalize()
+        start_date = end_date - pd.Timedelta(days=days)
+        
+        archived = self.archive.read(cell, start_date, end_date)
+        # Only archive values POWER will no longer revise
+        last_final = end_date - pd.Timedelta(days=POWER_CACHE_PARAMS['revision_days'] + 1)
+        frames, final_frames = [], []
+        for first, last in self.archive.missing_ranges(archived['date'], start_date, end_date):
+            if last == end_date:
+                # Recent days go through the cache, which knows which values are final
+                fetched = self.nasa_data.fetch_power_data(lat, lon, radius, (end_date - first).days)
+                fetched = fetched[fetched['date'] >= first]
+                final = pd.to_datetime(self.nasa_data.final_dates(
+                    lat, lon, pd.date_range(first, last_final, freq='D').strftime("%Y%m%d").tolist()
+                ), format="%Y%m%d")
+                frames.append(fetched)
+                final_frames.append(self._final_power_rows(fetched, first, last_final, final))
+            else:
+                for chunk_start, chunk_end, df in self.nasa_data.backfill(lat, lon, first, last):
+                    frames.append(df)
+                    final_frames.append(self._final_power_rows(
+                        df, pd.Timestamp(chunk_start), min(pd.Timestamp(chunk_end), last_final)
+                    ))
+        
+        final_frames = [df for df in final_frames if not df.empty]
+        if final_frames:
+            self.archive.append(cell, pd.concat(final_frames, ignore_index=True))
+        
+        # Days archived as known-missing have no values to return
+        archived = archived.dropna(subset=POWER_COLUMNS[1:], how='all')
+        frames = [df for df in frames if not df.empty]
+        power_df = pd.concat([archived] + frames, ignore_index=True) if frames else archived
+        return power_df.drop_duplicates(subset='date', keep='last').sort_values('date').reset_index(drop=True)
+    
+    def _final_power_rows(self, fetched: pd.DataFrame, first: pd.Timestamp, last: pd.Timestamp,
+                          final: Optional[pd.DatetimeIndex] = None) -> pd.DataFrame:
+        """
+        Get the rows of a fetched run of days that can be archived for good.
+        
+        Days after the last date the response returned are left out, since
+        it may have stopped short. Earlier days without any value come back
+        as all-NaN rows, so the archive records them as known-missing and
+        they are not requested again on every refresh.
+        
+        Args:
+            fetched: POWER rows returned for the run
+            first: First date of the run
+            last: Last date of the run outside the revision window
+            final: Dates whose values are final (all if None)
+            
+        Returns:
+            Frame with POWER_COLUMNS and one row per archivable day
+        """
+        if fetched.empty or last < first:
+            return fetched.iloc[:0]
+        days = pd.date_range(first, min(last, fetched['date'].max()), freq='D')
+        if final is not None:
+            days = days[days.isin(final)]
+        rows = fetched.drop_duplicates(subset='date').set_index('date')
+        return rows.reindex(days).rename_axis('date').reset_index()
+            
+    def backfill_history(self, lat: float, lon: float, years: int = 20,
+                         chunk_days: int = 365) -> Dict[str, Any]:
+        """
+        Seed the local archive with long-range POWER history for a location.
+        
+        Chunks are written to the archive as they arrive; an interrupted
+        backfill resumes from the last completed chunk.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            years: Number of years of history
+            chunk_days: Number of days per request
             
+        Returns:
+            Status dictionary
+        """
+        cell = self.nasa_data.resolve_grid_cell(lat, lon)
+        today = pd.Timestamp(datetime.datetime.now()).normalize()
+        # Start on January 1st so chunk boundaries stay stable across runs
+        start_date = pd.Timestamp(year=today.year - years, month=1, day=1)
+        end_date = today - pd.Timedelta(days=POWER_CACHE_PARAMS['revision_days'])
+        
+        rows = chunks = 0
+        try:
+            for _, _, chunk_df in self.nasa_data.backfill(
+                lat, lon, start_date, end_date, chunk_days=chunk_days,
+                checkpoint_path=self.archive.checkpoint_path(cell)
+            ):
+                rows += self.archive.append(cell, chunk_df)
+                chunks += 1
+        except Exception as e:
             return {
-                'status': 'success',
-                'message': f'Successfully fetched data for location ({lat}, {lon})',
-                'data_shape': self.current_data.shape
+                'status': 'error',
+                'message': f'Backfill interrupted after {chunks} chunks: {str(e)}',
+                'rows_written': rows
             }
+        
+        return {
+            'status': 'success',
+            'message': f'Backfilled {chunks} chunks for grid cell {cell}',
+            'rows_written': rows
+        }
             
+    def fetch_data_many(self, sites: List[Dict[str, Any]], days: int = 6) -> Dict[str, Any]:
+        """
+        Fetch NASA data for many sites concurrently.
+        
+        Args:
+            sites: List of dicts with 'lat', 'lon' and optional 'name' and 'radius'
+            days: Number of days of historical data
+            
+        Returns:
+            Status dictionary with a per-site status
+        """
+        try:
+            results = asyncio.run(self.nasa_data.fetch_many(sites, days))
         except Exception as e:
             return {
                 'status': 'error',
                 'message': f'Error fetching data: {str(e)}'
             }
+        
+        site_status = {}
+        for name, result in results.items():
+            if isinstance(result, Exception):
+                site_status[name] = {'status': 'error', 'message': str(result)}
+            else:
+                self.site_data[name] = result
+                self._track(('site', name), result)
+                site_status[name] = {'status': 'success', 'data_shape': result.shape}
+        
+        failed = sum(1 for status in site_status.values() if status['status'] == 'error')
+        return {
+            'status': 'success' if not failed else 'partial' if failed < len(site_status) else 'error',
+            'message': f'Fetched data for {len(site_status) - failed} of {len(site_status)} sites',
+            'sites': site_status
+        }
             
     def _update_actual_temperatures(self) -> None:
         """
@@ -88,27 +640,21 @@ class CoordinatorAgent:
         if self.current_data is None:
             return
             
-        # Get the last few days of data
-        recent_data = self.current_data.copy()
-        
+        dates = self.current_data['date']
         try:
-            # Ensure date column is datetime type
-            if not pd.api.types.is_datetime64_any_dtype(recent_data['date']):
-                recent_data['date'] = pd.to_datetime(recent_data['date'])
-            
-            # Convert date to string format used in memory
-            recent_data['date_str'] = recent_data['date'].dt.strftime('%Y-%m-%d')
+            # Convert dates to the string format used in memory
+            date_str = pd.to_datetime(dates).dt.strftime('%Y-%m-%d')
         except Exception as e:
             print(f"Error converting dates in _update_actual_temperatures: {e}")
             # Use a simple string conversion as fallback
-            recent_data['date_str'] = recent_data['date'].astype(str)
-        
-        # Update actual temperatures in memory
-        for _, row in recent_data.iterrows():
-            try:
-                self.memory_agent.update_actual_temperature(row['date_str'], float(row['temperature']))
-            except Exception as e:
-                print(f"Error updating temperature in memory: {e}")
+            date_str = dates.astype(str)
+            
+        # Reconcile the whole window in one pass and one write
+        try:
+            temperatures = self.current_data['temperature'].to_numpy(dtype=float)
+            self.memory_agent.update_actual_temperatures(zip(date_str.tolist(), temperatures.tolist()))
+        except Exception as e:
+            print(f"Error updating temperatures in memory: {e}")
             
     def set_crop(self, crop: str) -> Dict[str, Any]:
         """
@@ -127,6 +673,9 @@ class CoordinatorAgent:
             }
             
         self.current_crop = crop
+        with self._live_lock:
+            self.control_engine = self.env_agent.get_control_engine(crop)
+            self.live_actuators = {}
         return {
             'status': 'success',
             'message': f'Crop set to {crop}'
@@ -136,9 +685,15 @@ class CoordinatorAgent:
         """
         Analyze current environmental conditions.
         
+        The result is memoized until the current data changes.
+        
         Returns:
             Analysis results
         """
+        return self._cached('analyze_conditions', self._analyze_conditions)
+        
+    def _analyze_conditions(self) -> Dict[str, Any]:
+        """Compute the analysis of the current conditions."""
         if self.current_data is None:
             return {
                 'status': 'error',
@@ -146,7 +701,7 @@ class CoordinatorAgent:
             }
             
         # Analyze temperature
-        temp_metrics = self.env_agent.analyze_temperature(self.current_data)
+        temp_metrics = self.env_agent.analyze_temperature(self.current_data, self._get_temperature_stats())
         
         # Assess crop suitability for all crops
         crop_suitability = self.env_agent.assess_crop_suitability(temp_metrics)
@@ -163,6 +718,27 @@ class CoordinatorAgent:
             'soil_moisture': soil_moisture
         }
         
+    def get_suitability_timeline(self) -> pd.DataFrame:
+        """
+        Get the daily suitability score of every crop for the current data.
+        
+        Returns:
+            Frame of 0-100 scores indexed by date with one column per crop
+            (empty if no data has been fetched)
+        """
+        if self.current_data is None:
+            return pd.DataFrame(columns=self.env_agent.suitability.crops)
+        return self.env_agent.assess_suitability_timeline(self.current_data)
+        
+    def get_site_suitability(self) -> pd.DataFrame:
+        """
+        Get the suitability score of every crop at every site fetched with fetch_data_many.
+        
+        Returns:
+            Frame of 0-100 scores indexed by site with one column per crop
+        """
+        return self.env_agent.assess_site_suitability(self.site_data)
+        
     def train_prediction_model(self) -> Dict[str, Any]:
         """
         Train the prediction model with current data.
@@ -176,15 +752,581 @@ class CoordinatorAgent:
                 'message': 'No data available. Please fetch data first.'
             }
             
-        return self.prediction_agent.train(self.current_data)
+        return self.resources.write(self.prediction_agent.train, self.current_data)
+        
+    def import_sensor_data(self, path: str = IOT_DATA_PATH) -> Dict[str, Any]:
+        """
+        Import an IoT sensor CSV export into the sensor store.
+        
+        Readings older than the last stored one are skipped, so importing
+        the same export again is a no-op.
+        
+        Args:
+            path: Path of the CSV export
+            
+        Returns:
+            Status dictionary
+        """
+        try:
+            readings = self.iot_loader.load(path)
+            last = self.sensor_store.last_timestamp()
+            if last is not None:
+                readings = readings[readings.index > last]
+            rows = self.sensor_store.append(readings)
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': f'Error importing sensor data: {str(e)}'
+            }
+            
+        return {
+            'status': 'success',
+            'message': f'Imported {rows} sensor readings',
+            'rows': rows,
+            'total_rows': len(self.sensor_store)
+        }
+        
+    def get_sensor_history(self, start: Optional[Any] = None, end: Optional[Any] = None,
+                           columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Get stored sensor readings for a time range.
+        
+        Args:
+            start: First timestamp to include (None for the beginning)
+            end: Last timestamp to include (None for the end)
+            columns: Columns to return (all if None)
+            
+        Returns:
+            Frame indexed by datetime64 'date' backed by the memory-mapped store
+        """
+        return self.sensor_store.range(start, end, columns)
+        
+    def _sync_rollups(self) -> None:
+        """Fold sensor store rows appended since the last sync into the rollups."""
+        # The rollups are shared, so their reading count is the synced store offset
+        with self.resources.rollup_lock:
+            rollups = self.sensor_rollups
+            self.sensor_store.refresh()
+            arrays = self.sensor_store.rows_since(rollups.readings, rollups.columns)
+            timestamps = arrays.pop('timestamp')
+            if len(timestamps):
+                rollups.update_arrays(timestamps, arrays)
+
+    def get_sensor_rollup(self, start: Optional[Any] = None, end: Optional[Any] = None,
+                          columns: Optional[List[str]] = None, min_points: int = 200) -> pd.DataFrame:
+        """
+        Get min/mean/max sensor aggregates for a time range.
+        
+        The resolution (hourly, daily or weekly) is the coarsest one that
+        still gives at least `min_points` points for the range, so the
+        result size does not grow with the length of the history. Ranges
+        too short for that return the raw readings from the store.
+        
+        Args:
+            start: First timestamp to include (None for the beginning)
+            end: Last timestamp to include (None for the end)
+            columns: Sensor columns to aggregate (all rolled-up columns if None)
+            min_points: Minimum number of points wanted for the range
+            
+        Returns:
+            Frame indexed by bucket start with <column>_mean, _min, _max and
+            _count columns; the resolution is in .attrs['resolution']
+        """
+        with self.resources.rollup_lock:
+            self._sync_rollups()
+            return self.sensor_rollups.query(start, end, columns, min_points)
+
+    def analyze_sensor_trends(self, start: Optional[Any] = None, end: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Analyze greenhouse temperature over a time range from the rollups.
+        
+        Args:
+            start: First timestamp to include (None for the beginning)
+            end: Last timestamp to include (None for the end)
+            
+        Returns:
+            Temperature metrics in the EnvironmentalAgent.analyze_temperature
+            shape (trend from the slope per day) and the rollup resolution
+        """
+        rollup = self.get_sensor_rollup(start, end, ['temperature'], min_points=30)
+        rollup = rollup[rollup['temperature_count'] > 0]
+        # Fit the trend against time in days, so the slope (and the verdict)
+        # does not depend on the resolution the rollup was served at
+        days = rollup.index.as_unit('ns').asi8 / 86_400e9
+        metrics = OnlineStats.from_values(rollup['temperature_mean'].to_numpy(), days).metrics()
+        if not rollup.empty:
+            # Exact extremes and count-weighted mean over the raw readings
+            counts = rollup['temperature_count']
+            metrics['mean'] = float((rollup['temperature_mean'] * counts).sum() / counts.sum())
+            metrics['min'] = float(rollup['temperature_min'].min())
+            metrics['max'] = float(rollup['temperature_max'].max())
+            metrics['resolution'] = rollup.attrs.get('resolution')
+        return metrics
+
+    def ingest_live_readings(self, readings: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Ingest a batch of newly arrived sensor readings.
+        
+        The batch is appended to the sensor store and folded into the
+        rollups and running statistics, and the indoor daily mean
+        temperatures of the days it touches are updated in live_daily. The
+        outdoor POWER data in current_data is left alone, so its memoized
+        analysis stays valid.
+        
+        Args:
+            readings: Frame with IOT_COLUMNS indexed by datetime64 'date'
+            
+        Returns:
+            Status dictionary
+        """
+        if readings.empty:
+            return {'status': 'success', 'rows': 0}
+            
+        with self._live_lock:
+            rows = self.sensor_store.append(readings)
+            self._sync_rollups()
+            self._update_live_stats(readings)
+            self._score_live_anomalies(readings)
+            self._control_live_actuators(readings)
+            
+            # Daily means of the touched days, read from the daily rollup level
+            days = readings.index.normalize()
+            with self.resources.rollup_lock:
+                daily = self.sensor_rollups.level('1D').frame(
+                    days.min().value, days.max().value, ['temperature']
+                )
+            daily = daily[daily['temperature_count'] > 0]
+            self._merge_live_daily(pd.DataFrame({
+                'temperature': daily['temperature_mean'],
+                'readings': daily['temperature_count']
+            }))
+            
+        return {
+            'status': 'success',
+            'rows': rows,
+            'total_rows': len(self.sensor_store)
+        }
+        
+    def _update_live_stats(self, readings: pd.DataFrame) -> None:
+        """Fold a batch into the running per-sensor statistics and the 24 h window."""
+        readings = readings.sort_index(kind='stable')
+        days = readings.index.as_unit('ns').asi8 / 86_400e9
+        for column in ['temperature', 'humidity', 'water_level']:
+            values = readings[column].to_numpy(dtype=float)
+            self.live_stats.setdefault(column, OnlineStats()).update(values, days)
+        self.live_window.update(readings['temperature'].to_numpy(dtype=float), readings.index.to_numpy())
+        
+    def _score_live_anomalies(self, readings: pd.DataFrame) -> None:
+        """Score a live batch and keep the most recent anomalous readings."""
+        scores = self.anomaly_detector.update(readings.sort_index(kind='stable'))
+        flagged = scores[scores['anomaly']]
+        if self.live_anomalies is not None:
+            flagged = pd.concat([self.live_anomalies, flagged])
+        self.live_anomalies = flagged.tail(100)
+        self._track('live_anomalies', self.live_anomalies)
+        
+    def detect_anomalies(self, start: Optional[Any] = None, end: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Detect abnormal sensor readings in a time range of the sensor store.
+        
+        The result is memoized until readings are added to the store or
+        the current data changes.
+        
+        Args:
+            start: First timestamp to include (None for the beginning)
+            end: Last timestamp to include (None for the end)
+            
+        Returns:
+            Status dictionary with the summary from summarize_anomalies and
+            the per-reading scores joined to the readings
+        """
+        return self._cached('anomalies', lambda: self._detect_anomalies(start, end),
+                            extra=(self._sensor_version(), start, end))
+        
+    def _detect_anomalies(self, start: Optional[Any], end: Optional[Any]) -> Dict[str, Any]:
+        """Score the readings of a time range of the sensor store."""
+        readings = self.sensor_store.range(start, end, self.anomaly_detector.columns)
+        if readings.empty:
+            return {
+                'status': 'error',
+                'message': 'No sensor readings available. Please import sensor data first.'
+            }
+            
+        scores = self.anomaly_detector.score(readings)
+        return {
+            'status': 'success',
+            'summary': summarize_anomalies(scores),
+            'scores': readings.assign(**{c: scores[c].to_numpy() for c in scores.columns})
+        }
+        
+    def backtest_actuator_rules(self, crop: Optional[str] = None, start: Optional[Any] = None,
+                                end: Optional[Any] = None,
+                                thresholds: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Replay the actuator rules over stored sensor readings and compare
+        them with the recorded actuator states.
+        
+        The recordings have no soil moisture, so the watering pump rule is
+        applied to humidity, and the water pump rule (tank level below 50%)
+        is an added rule so the recorded water pump is scored too. The
+        result is memoized until readings are added to the store.
+        
+        Args:
+            crop: Crop whose temperature range sets the fan threshold (current crop if None)
+            start: First timestamp to include (None for the beginning)
+            end: Last timestamp to include (None for the end)
+            thresholds: Thresholds overriding the crop's rule set (optional)
+            
+        Returns:
+            Status dictionary with agreement, duty cycle and switches per day per actuator
+        """
+        crop = crop or self.current_crop
+        if crop not in CROP_TEMP_RANGES:
+            return {
+                'status': 'error',
+                'message': 'Crop not set. Please set a crop first.'
+            }
+            
+        return self._cached('backtest', lambda: self._backtest_actuator_rules(crop, start, end, thresholds),
+                            crop, (self._sensor_version(), start, end,
+                                   tuple(sorted((thresholds or {}).items()))))
+        
+    def _backtest_actuator_rules(self, crop: str, start: Optional[Any], end: Optional[Any],
+                                 thresholds: Optional[Dict[str, float]]) -> Dict[str, Any]:
+        """Backtest the rules of a crop over a time range of the sensor store."""
+        readings = self.sensor_store.range(start, end)
+        if readings.empty:
+            return {
+                'status': 'error',
+                'message': 'No sensor readings available. Please import sensor data first.'
+            }
+            
+        rules = default_thresholds(CROP_TEMP_RANGES[crop][1])
+        rules.update(thresholds or {})
+        return {
+            'status': 'success',
+            'crop': crop,
+            'report': ActuatorBacktester(readings).evaluate(rules)
+        }
+        
+    def sweep_actuator_thresholds(self, grid: Dict[str, Any], start: Optional[Any] = None,
+                                  end: Optional[Any] = None, combine: bool = False) -> pd.DataFrame:
+        """
+        Backtest many thresholds per actuator over stored sensor readings.
+        
+        Args:
+            grid: Mapping of actuator to an array of thresholds
+            start: First timestamp to include (None for the beginning)
+            end: Last timestamp to include (None for the end)
+            combine: Whether to score every combination of the thresholds
+            
+        Returns:
+            Frame of results as returned by ActuatorBacktester.sweep
+        """
+        readings = self.sensor_store.range(start, end)
+        return ActuatorBacktester(readings).sweep(grid, combine=combine)
+        
+    def _control_live_actuators(self, readings: pd.DataFrame) -> None:
+        """Run the control engine over a live batch and keep the latest actuator states."""
+        if self.control_engine is None:
+            return
+        schedule = self.control_engine.schedule(readings.sort_index(kind='stable'))
+        if not schedule.empty:
+            self.live_actuators = {actuator: 'ON' if state else 'OFF'
+                                   for actuator, state in schedule.iloc[-1].items()}
+            
+    def simulate_control(self, crop: Optional[str] = None, start: Optional[Any] = None,
+                         end: Optional[Any] = None,
+                         params: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Simulate the actuator control engine over stored sensor readings,
+        e.g. to try setpoint, deadband or dwell time changes before using them.
+        
+        Args:
+            crop: Crop whose rules are simulated (current crop if None)
+            start: First timestamp to include (None for the beginning)
+            end: Last timestamp to include (None for the end)
+            params: Control settings per actuator (CONTROL_PARAMS if None)
+            
+        Returns:
+            Status dictionary with the schedule (ON states per reading), the
+            switch events and a summary per actuator. Actuators whose sensor
+            is not recorded are left out. The result is memoized until
+            readings are added to the store.
+        """
+        crop = crop or self.current_crop
+        engine = self.env_agent.get_control_engine(crop, params) if crop else None
+        if engine is None:
+            return {
+                'status': 'error',
+                'message': 'Crop not set. Please set a crop first.'
+            }
+            
+        settings = json.dumps(params or CONTROL_PARAMS, sort_keys=True, default=str)
+        return self._cached('control', lambda: self._simulate_control(crop, engine, start, end),
+                            crop, (self._sensor_version(), start, end, settings))
+        
+    def _simulate_control(self, crop: str, engine: Any, start: Optional[Any],
+                          end: Optional[Any]) -> Dict[str, Any]:
+        """Run a fresh control engine over a time range of the sensor store."""
+        readings = self.sensor_store.range(start, end)
+        if readings.empty:
+            return {
+                'status': 'error',
+                'message': 'No sensor readings available. Please import sensor data first.'
+            }
+            
+        schedule = engine.schedule(readings)
+        return {
+            'status': 'success',
+            'crop': crop,
+            'schedule': schedule,
+            'events': switch_events(schedule),
+            'summary': summarize_schedule(schedule)
+        }
+        
+    def get_live_metrics(self) -> Dict[str, Any]:
+        """
+        Get running statistics of the live sensor feed.
+        
+        Returns:
+            Temperature metrics over the last 24 hours and over all live
+            readings per sensor, in the analyze_temperature shape, the
+            actuator states and the indoor daily means ('daily', a frame
+            indexed by day with temperature and readings columns, or None)
+        """
+        with self._live_lock:
+            return {
+                'last_24h': self.live_window.metrics(),
+                'sensors': {column: stats.metrics() for column, stats in self.live_stats.items()},
+                'actuators': dict(self.live_actuators),
+                'daily': self.live_daily
+            }
+            
+    def _merge_live_daily(self, daily: pd.DataFrame) -> None:
+        """Overwrite or add the indoor daily temperatures of the touched days in live_daily."""
+        if daily.empty:
+            return
+        if self.live_daily is None:
+            self.live_daily = daily
+        else:
+            # Days in the batch were recomputed from the rollups, so they win
+            self.live_daily = daily.combine_first(self.live_daily)
+        self._track('live_daily', self.live_daily)
+        
+    def poll_live_readings(self) -> Dict[str, Any]:
+        """
+        Ingest rows appended to the followed sensor file since the last poll.
+        
+        Returns:
+            Status dictionary
+        """
+        if self.sensor_follower is None:
+            return {
+                'status': 'error',
+                'message': 'No sensor file is being followed.'
+            }
+            
+        try:
+            return self.ingest_live_readings(self.sensor_follower.poll())
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': f'Error reading live sensor data: {str(e)}'
+            }
+            
+    def start_live_ingestion(self, path: str = IOT_DATA_PATH, interval: Optional[float] = None,
+                             from_start: bool = False) -> Dict[str, Any]:
+        """
+        Start following an appending sensor CSV.
+        
+        Args:
+            path: Path of the CSV file gateways append to
+            interval: Seconds between polls on a background thread; if None,
+                new rows are only ingested by poll_live_readings
+            from_start: Whether to ingest rows already in the file
+            
+        Returns:
+            Status dictionary
+        """
+        self.stop_live_ingestion()
+        self.sensor_follower = SensorFileFollower(path, self.iot_loader, from_start=from_start)
+        if not from_start:
+            # Position the follower at the current end of the file
+            self.sensor_follower.poll()
+        if interval is not None:
+            self.sensor_follower.follow(self.ingest_live_readings, interval)
+            
+        return {
+            'status': 'success',
+            'message': f'Following {path}'
+        }
+        
+    def session_nbytes(self) -> int:
+        """
+        Estimate the memory held by this coordinator's own state.
+        
+        Shared resources are not counted. The count is kept up to date as
+        the state changes, so this is cheap and safe to call from other
+        threads.
+        
+        Returns:
+            Approximate size in bytes of the coordinator's data frames,
+            including memoized results such as anomaly scores
+        """
+        return self._nbytes
+        
+    def stop_live_ingestion(self) -> None:
+        """Stop following the sensor file."""
+        if self.sensor_follower is not None:
+            self.sensor_follower.stop()
+            self.sensor_follower = None
+            
+    def _load_outdoor_history(self, lat: float, lon: float, start: pd.Timestamp,
+                              end: pd.Timestamp) -> pd.DataFrame:
+        """
+        Get daily POWER data covering a date range, archive first.
+        
+        Each run of days the archive lacks is fetched in yearly chunks; those
+        outside the POWER revision window are archived for next time, days
+        without values as known-missing.
+        """
+        cell = self.nasa_data.resolve_grid_cell(lat, lon)
+        archived = self.archive.read(cell, start, end)
+        last_final = (pd.Timestamp(datetime.datetime.now()).normalize()
+                      - pd.Timedelta(days=POWER_CACHE_PARAMS['revision_days'] + 1))
+        chunks, final_chunks = [], []
+        for first, last in self.archive.missing_ranges(archived['date'], start, end):
+            for chunk_start, chunk_end, df in self.nasa_data.backfill(lat, lon, first, last):
+                chunks.append(df)
+                final_chunks.append(self._final_power_rows(
+                    df, pd.Timestamp(chunk_start), min(pd.Timestamp(chunk_end), last_final)
+                ))
+        
+        final_chunks = [df for df in final_chunks if not df.empty]
+        if final_chunks:
+            self.archive.append(cell, pd.concat(final_chunks, ignore_index=True))
+        
+        archived = archived.dropna(subset=POWER_COLUMNS[1:], how='all')
+        frames = ([archived] if not archived.empty else []) + [df for df in chunks if not df.empty]
+        if not frames:
+            return archived.reset_index(drop=True)
+        combined = pd.concat(frames, ignore_index=True)
+        return combined.drop_duplicates(subset='date', keep='last').sort_values('date').reset_index(drop=True)
+        
+    def fuse_sensor_data(self, start: Optional[Any] = None, end: Optional[Any] = None,
+                         tolerance: str = '1D', lat: Optional[float] = None,
+                         lon: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Join stored sensor readings with the daily outdoor POWER data.
+        
+        Args:
+            start: First timestamp to include (None for the beginning)
+            end: Last timestamp to include (None for the end)
+            tolerance: Maximum distance between a reading and its POWER day
+            lat: Latitude of the greenhouse (last fetched location if None)
+            lon: Longitude of the greenhouse (last fetched location if None)
+            
+        Returns:
+            Status dictionary with the indoor/outdoor comparison
+        """
+        if lat is None or lon is None:
+            if self.location is None:
+                return {
+                    'status': 'error',
+                    'message': 'No location set. Please fetch data first.'
+                }
+            lat, lon = self.location['lat'], self.location['lon']
+            
+        readings = self.sensor_store.range(start, end)
+        if readings.empty:
+            return {
+                'status': 'error',
+                'message': 'No sensor readings available. Please import sensor data first.'
+            }
+            
+        try:
+            power_df = self._load_outdoor_history(
+                lat, lon, readings.index[0].normalize(), readings.index[-1].normalize()
+            )
+        except Exception as e:
+            return {
+                'status': 'error',
+                'message': f'Error fetching outdoor data: {str(e)}'
+            }
+            
+        self.fused_data = fuse_sensor_power(readings, power_df, tolerance=tolerance)
+        self._track('fused_data', self.fused_data)
+        return {
+            'status': 'success',
+            'comparison': self.env_agent.analyze_indoor_outdoor(self.fused_data),
+            'data_shape': self.fused_data.shape
+        }
+        
+    def train_fused_model(self) -> Dict[str, Any]:
+        """
+        Train the indoor temperature model on fused indoor and outdoor features.
+        
+        Returns:
+            Training results
+        """
+        if self.fused_data is None:
+            return {
+                'status': 'error',
+                'message': 'No fused data available. Please fuse sensor data first.'
+            }
+            
+        return self.resources.write(self.prediction_agent.train_fused, daily_features(self.fused_data))
+        
+    def predict_indoor_temperature(self) -> Dict[str, Any]:
+        """
+        Predict the next day's indoor temperature from the fused data.
+        
+        Returns:
+            Dictionary of predictions
+        """
+        if self.fused_data is None:
+            return {
+                'status': 'error',
+                'message': 'No fused data available. Please fuse sensor data first.'
+            }
+            
+        return self.prediction_agent.predict_next_day_fused(daily_features(self.fused_data))
+        
+    def train_sensor_model(self, start: Optional[Any] = None, end: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Train the prediction model on a window of stored sensor readings.
+        
+        Args:
+            start: First timestamp of the training window (None for the beginning)
+            end: Last timestamp of the training window (None for the end)
+            
+        Returns:
+            Training results
+        """
+        window = self.sensor_store.range(start, end, ['temperature'])
+        if window.empty:
+            return {
+                'status': 'error',
+                'message': 'No sensor readings in the selected window. Please import sensor data first.'
+            }
+            
+        return self.resources.write(self.prediction_agent.train, window)
         
     def get_recommendations(self) -> Dict[str, Any]:
         """
         Get recommendations for the current crop and conditions.
         
+        The result, including the model prediction, is memoized until the
+        current data, the crop or the prediction model changes.
+        
         Returns:
             Recommendations dictionary
         """
+        return self._cached('recommendations', self._get_recommendations, self.current_crop)
+        
+    def _get_recommendations(self) -> Dict[str, Any]:
+        """Compute the recommendations for the current crop and conditions."""
         if self.current_data is None or self.current_crop is None:
             return {
                 'status': 'error',
@@ -192,7 +1334,7 @@ class CoordinatorAgent:
             }
             
         # Analyze current conditions
-        temp_metrics = self.env_agent.analyze_temperature(self.current_data)
+        temp_metrics = self.env_agent.analyze_temperature(self.current_data, self._get_temperature_stats())
         
         # Get soil moisture if available
         soil_moisture = None
@@ -0,0 +1,128 @@
+"""
+Pool of per-session coordinators sharing one set of heavy resources.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Any
+import sys
+import os
+
+# Add the project root to the path so we can import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents.coordinator_agent import CoordinatorAgent, SharedResources
+from config import COORDINATOR_POOL_PARAMS
+
+class CoordinatorPool:
+    """
+    Gives every session its own CoordinatorAgent.
+
+    The coordinators share one SharedResources instance, so the TensorFlow
+    model, the NASA client and its cache, the assistant's RAG index, the
+    memory agent and the sensor store exist once. Each session only holds
+    its own current data, crop and memoized results, so sessions never see
+    each other's state. Training and reconciling actual temperatures go
+    through the resources' single writer, so two sessions never train the
+    shared model or write the prediction history at the same time.
+    Sessions are kept in least-recently-used order and the oldest are
+    evicted when there are too many of them or their estimated size
+    exceeds the memory cap.
+    """
+
+    def __init__(self, max_sessions: int = COORDINATOR_POOL_PARAMS['max_sessions'],
+                 max_bytes: int = COORDINATOR_POOL_PARAMS['max_bytes'], warm_up: bool = True):
+        """
+        Initialize the pool.
+
+        Args:
+            max_sessions: Maximum number of sessions kept
+            max_bytes: Cap on the summed session_nbytes() of all sessions
+            warm_up: Whether to build the shared resources in a background thread now
+        """
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.resources = SharedResources()
+        self.stats = {'created': 0, 'reused': 0, 'evicted': 0}
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+        if warm_up:
+            CoordinatorAgent(warm_up=True, resources=self.resources)
+
+    def get(self, session_id: str) -> CoordinatorAgent:
+        """
+        Get the coordinator of a session, creating it if needed.
+
+        Args:
+            session_id: Unique session identifier
+
+        Returns:
+            The session's coordinator (a fresh one if it was evicted)
+        """
+        with self._lock:
+            coordinator = self._sessions.get(session_id)
+            if coordinator is None:
+                coordinator = CoordinatorAgent(resources=self.resources)
+                self._sessions[session_id] = coordinator
+                self.stats['created'] += 1
+            else:
+                self._sessions.move_to_end(session_id)
+                self.stats['reused'] += 1
+            self._evict(keep=session_id)
+        return coordinator
+
+    def remove(self, session_id: str) -> bool:
+        """
+        Drop a session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            True if the session existed
+        """
+        with self._lock:
+            coordinator = self._sessions.pop(session_id, None)
+        if coordinator is None:
+            return False
+        coordinator.stop_live_ingestion()
+        return True
+
+    def _evict(self, keep: str) -> None:
+        """
+        Evict least recently used sessions (never keep) until both limits hold.
+
+        Sessions keep their own byte counts up to date, so this only sums
+        them and never walks another session's state.
+        """
+        sizes = {session_id: coordinator.session_nbytes()
+                 for session_id, coordinator in self._sessions.items()}
+        total = sum(sizes.values())
+
+        for session_id in list(self._sessions):
+            if len(self._sessions) <= self.max_sessions and total <= self.max_bytes:
+                break
+            if session_id == keep:
+                continue
+            self._sessions.pop(session_id).stop_live_ingestion()
+            total -= sizes[session_id]
+            self.stats['evicted'] += 1
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Get the state of the pool.
+
+        Returns:
+            Dictionary with the number of sessions, their estimated size in
+            bytes, the creation/reuse/eviction counts and the shared
+            resources' load report
+        """
+        with self._lock:
+            sessions = len(self._sessions)
+            nbytes = sum(coordinator.session_nbytes() for coordinator in self._sessions.values())
+        return {
+            'sessions': sessions,
+            'session_bytes': nbytes,
+            'stats': dict(self.stats),
+            'shared': self.resources.report()
+        }
@@ -4,13 +4,16 @@ Environmental Analysis Agent for analyzing NASA data and assessing crop suitabil
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 import sys
 import os
 
 # Add the project root to the path so we can import the config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import CROP_TEMP_RANGES
+from utils.online_stats import OnlineStats
+from utils.suitability import SuitabilityScorer
+from utils.control import ControlEngine
 
 class EnvironmentalAgent:
     """
@@ -20,17 +23,23 @@ class EnvironmentalAgent:
     def __init__(self):
         """Initialize the environmental agent."""
         self.crop_temp_ranges = CROP_TEMP_RANGES
+        self.suitability = SuitabilityScorer(self.crop_temp_ranges)
         
-    def analyze_temperature(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def analyze_temperature(self, df: pd.DataFrame, stats: Optional[OnlineStats] = None) -> Dict[str, Any]:
         """
         Analyze temperature data and extract key metrics.
         
         Args:
             df: DataFrame with temperature data
+            stats: Accumulator already holding the temperatures of df; when
+                given its metrics are returned without rescanning df
             
         Returns:
             Dictionary of temperature metrics
         """
+        if stats is not None:
+            return stats.metrics()
+            
         if df.empty:
             return {
                 'mean': None,
@@ -39,26 +48,39 @@ class EnvironmentalAgent:
                 'trend': None
             }
             
-        # Calculate basic statistics
-        mean_temp = df['temperature'].mean()
-        min_temp = df['temperature'].min()
-        max_temp = df['temperature'].max()
+        # Mean, extremes and the least-squares trend in one pass
+        return OnlineStats.from_values(df['temperature'].to_numpy()).metrics()
         
-        # Calculate trend (simple linear regression)
-        x = np.arange(len(df))
-        y = df['temperature'].values
+    def analyze_indoor_outdoor(self, fused: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Compare greenhouse temperatures with the outdoor conditions.
         
-        if len(x) > 1:
-            slope = np.polyfit(x, y, 1)[0]
-            trend = 'rising' if slope > 0.1 else 'falling' if slope < -0.1 else 'stable'
-        else:
-            trend = 'unknown'
+        Args:
+            fused: Sensor readings with outdoor columns (see utils.fusion.fuse_sensor_power)
+            
+        Returns:
+            Dictionary with indoor and outdoor temperature metrics, the mean
+            indoor-outdoor difference and the share of readings with outdoor data
+        """
+        if fused.empty:
+            return {'indoor': self.analyze_temperature(fused), 'outdoor': None,
+                    'mean_delta': None, 'coverage': 0.0}
+            
+        outdoor = fused['outdoor_temperature'] if 'outdoor_temperature' in fused.columns else None
+        coverage = float(outdoor.notna().mean()) if outdoor is not None else 0.0
         
+        # Outdoor values repeat for every reading of a day, so analyze one per day
+        outdoor_metrics = None
+        if outdoor is not None and coverage > 0:
+            daily = outdoor.resample('1D').first().dropna()
+            outdoor_metrics = self.analyze_temperature(daily.to_frame('temperature'))
+            
+        delta = fused['temperature_delta'].mean() if 'temperature_delta' in fused.columns else None
         return {
-            'mean': mean_temp,
-            'min': min_temp,
-            'max': max_temp,
-            'trend': trend
+            'indoor': self.analyze_temperature(fused),
+            'outdoor': outdoor_metrics,
+            'mean_delta': None if delta is None or pd.isna(delta) else float(delta),
+            'coverage': coverage
         }
         
     def assess_crop_suitability(self, temp_metrics: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
@@ -74,38 +96,53 @@ class EnvironmentalAgent:
         if temp_metrics['mean'] is None:
             return {}
             
-        results = {}
+        return self.suitability.to_dict(self.suitability.score(temp_metrics['mean']))
         
-        for crop, (min_temp, max_temp) in self.crop_temp_ranges.items():
-            # Calculate how close the mean temperature is to the ideal range
-            mean_temp = temp_metrics['mean']
+    def assess_suitability_timeline(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score every crop at every timestep of a temperature series.
+        
+        Args:
+            df: DataFrame with 'date' and 'temperature' columns
             
-            if min_temp <= mean_temp <= max_temp:
-                status = 'Ideal'
-                deviation = 0
-            elif mean_temp < min_temp:
-                status = 'Below Ideal'
-                deviation = min_temp - mean_temp
-            else:  # mean_temp > max_temp
-                status = 'Above Ideal'
-                deviation = mean_temp - max_temp
-                
-            # Calculate a suitability score (0-100)
-            if status == 'Ideal':
-                score = 100
-            else:
-                # Reduce score based on deviation from ideal range
-                # Assume a 1°C deviation reduces score by 10 points
-                score = max(0, 100 - 10 * abs(deviation))
-                
-            results[crop] = {
-                'status': status,
-                'deviation': deviation,
-                'score': score,
-                'ideal_range': f"{min_temp}°C – {max_temp}°C"
-            }
+        Returns:
+            Frame of 0-100 scores indexed by date with one column per crop
+        """
+        return self.suitability.timeline(df.set_index('date')['temperature'])
+        
+    def assess_site_suitability(self, site_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Score every crop for every site from its mean temperature.
+        
+        Args:
+            site_data: Mapping of site name to a DataFrame with a 'temperature' column
             
-        return results
+        Returns:
+            Frame of 0-100 scores indexed by site with one column per crop
+        """
+        sites = list(site_data)
+        means = np.array([site_data[site]['temperature'].mean() for site in sites], dtype=np.float64)
+        scores = self.suitability.score(means)['score']
+        return pd.DataFrame(scores.T, index=pd.Index(sites, name='site'), columns=self.suitability.crops)
+        
+    def get_control_engine(self, crop: str, params: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[ControlEngine]:
+        """
+        Get a stateful control engine with the actuator rules of a crop.
+        
+        Unlike get_recommendations, which judges each call on its own, the
+        engine applies a deadband and minimum ON/OFF times, so readings
+        hovering around a threshold do not make an actuator flap.
+        
+        Args:
+            crop: Selected crop
+            params: Control settings per actuator (CONTROL_PARAMS if None)
+            
+        Returns:
+            ControlEngine instance, or None for an unknown crop
+        """
+        if crop not in self.crop_temp_ranges:
+            return None
+        return ControlEngine.for_crop(self.crop_temp_ranges[crop], params)
         
     def get_recommendations(self, crop: str, temp_metrics: Dict[str, Any], 
                            soil_moisture: float = None) -> Dict[str, Any]:
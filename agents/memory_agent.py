@@ -4,9 +4,10 @@ Memory Agent for maintaining history of predictions and decisions.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Tuple
 import json
 import os
+import threading
 from datetime import datetime
 
 class MemoryAgent:
@@ -23,6 +24,9 @@ class MemoryAgent:
         """
         self.memory_file = memory_file
         self.memory = self._load_memory()
+        self._prediction_index = None
+        # Coordinators of several sessions may share one memory agent
+        self._lock = threading.RLock()
         
     def _load_memory(self) -> Dict[str, Any]:
         """
@@ -51,15 +55,33 @@ class MemoryAgent:
         
     def _save_memory(self) -> None:
         """Save memory to file."""
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(self.memory_file), exist_ok=True)
+        with self._lock:
+            # Create directory if it doesn't exist
+            os.makedirs(os.path.dirname(self.memory_file), exist_ok=True)
+            
+            # Update last_updated timestamp
+            self.memory['metadata']['last_updated'] = datetime.now().isoformat()
+            
+            # Write a temporary file first so readers never see a partial file
+            tmp_path = f"{self.memory_file}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.memory, f, indent=2)
+            os.replace(tmp_path, self.memory_file)
+            
+    def _get_prediction_index(self) -> Dict[str, int]:
+        """
+        Get the position of the first prediction of each date.
         
-        # Update last_updated timestamp
-        self.memory['metadata']['last_updated'] = datetime.now().isoformat()
+        Built in one pass on first use and kept up to date as predictions
+        are added, so looking up a date does not scan the predictions.
+        """
+        if self._prediction_index is None:
+            index = {}
+            for i, pred in enumerate(self.memory['predictions']):
+                index.setdefault(pred['date'], i)
+            self._prediction_index = index
+        return self._prediction_index
         
-        with open(self.memory_file, 'w') as f:
-            json.dump(self.memory, f, indent=2)
-            
     def store_prediction(self, date: str, crop: str, 
                         predicted_temp: float, actual_temp: float = None) -> None:
         """
@@ -71,31 +93,29 @@ class MemoryAgent:
             predicted_temp: Predicted temperature
             actual_temp: Actual temperature (if known)
         """
-        # Check if we already have a prediction for this date
-        existing_index = None
-        for i, pred in enumerate(self.memory['predictions']):
-            if pred['date'] == date:
-                existing_index = i
-                break
-        
-        if existing_index is not None:
-            # Update existing prediction with actual temperature
-            self.memory['predictions'][existing_index]['actual_temp'] = actual_temp
-            self.memory['predictions'][existing_index]['updated_at'] = datetime.now().isoformat()
-        else:
-            # Create new prediction
-            prediction = {
-                'date': date,
-                'crop': crop,
-                'predicted_temp': predicted_temp,
-                'actual_temp': actual_temp,
-                'recorded_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
-            }
+        with self._lock:
+            # Check if we already have a prediction for this date
+            existing_index = self._get_prediction_index().get(date)
             
-            self.memory['predictions'].append(prediction)
-        
-        self._save_memory()
+            if existing_index is not None:
+                # Update existing prediction with actual temperature
+                self.memory['predictions'][existing_index]['actual_temp'] = actual_temp
+                self.memory['predictions'][existing_index]['updated_at'] = datetime.now().isoformat()
+            else:
+                # Create new prediction
+                prediction = {
+                    'date': date,
+                    'crop': crop,
+                    'predicted_temp': predicted_temp,
+                    'actual_temp': actual_temp,
+                    'recorded_at': datetime.now().isoformat(),
+                    'updated_at': datetime.now().isoformat()
+                }
+            
+                self._get_prediction_index()[date] = len(self.memory['predictions'])
+                self.memory['predictions'].append(prediction)
+            
+            self._save_memory()
         
     def store_recommendation(self, date: str, crop: str, 
                            recommendations: Dict[str, Any]) -> None:
@@ -107,15 +127,16 @@ class MemoryAgent:
             crop: Crop being grown
             recommendations: Dictionary of recommendations
         """
-        recommendation = {
-            'date': date,
-            'crop': crop,
-            'recommendations': recommendations,
-            'recorded_at': datetime.now().isoformat()
-        }
-        
-        self.memory['recommendations'].append(recommendation)
-        self._save_memory()
+        with self._lock:
+            recommendation = {
+                'date': date,
+                'crop': crop,
+                'recommendations': recommendations,
+                'recorded_at': datetime.now().isoformat()
+            }
+            
+            self.memory['recommendations'].append(recommendation)
+            self._save_memory()
         
     def update_crop_performance(self, crop: str, performance_score: float) -> None:
         """
@@ -125,16 +146,17 @@ class MemoryAgent:
             crop: Crop name
             performance_score: Performance score (0-100)
         """
-        if crop not in self.memory['crop_history']:
-            self.memory['crop_history'][crop] = []
+        with self._lock:
+            if crop not in self.memory['crop_history']:
+                self.memory['crop_history'][crop] = []
             
-        entry = {
-            'date': datetime.now().isoformat(),
-            'score': performance_score
-        }
-        
-        self.memory['crop_history'][crop].append(entry)
-        self._save_memory()
+            entry = {
+                'date': datetime.now().isoformat(),
+                'score': performance_score
+            }
+            
+            self.memory['crop_history'][crop].append(entry)
+            self._save_memory()
         
     def get_prediction_accuracy(self) -> Dict[str, float]:
         """
@@ -195,14 +217,37 @@ class MemoryAgent:
         Returns:
             True if prediction was found and updated, False otherwise
         """
-        for pred in self.memory['predictions']:
-            if pred['date'] == date:
-                pred['actual_temp'] = actual_temp
-                pred['updated_at'] = datetime.now().isoformat()
+        return self.update_actual_temperatures([(date, actual_temp)]) > 0
+        
+    def update_actual_temperatures(self, actuals: Iterable[Tuple[str, float]]) -> int:
+        """
+        Update many predictions with their actual temperatures at once.
+        
+        The dates are looked up in the prediction index in a single pass and
+        the memory file is written once, however many predictions change.
+        
+        Args:
+            actuals: (date, actual temperature) pairs
+            
+        Returns:
+            Number of predictions found and updated
+        """
+        with self._lock:
+            index = self._get_prediction_index()
+            predictions = self.memory['predictions']
+            now = datetime.now().isoformat()
+            updated = 0
+            for date, actual_temp in actuals:
+                position = index.get(date)
+                if position is None:
+                    continue
+                predictions[position]['actual_temp'] = actual_temp
+                predictions[position]['updated_at'] = now
+                updated += 1
+            
+            if updated:
                 self._save_memory()
-                return True
-                
-        return False
+            return updated
         
     def get_performance_history(self, crop: str) -> Dict[str, Any]:
         """
@@ -7,10 +7,12 @@ import numpy as np
 from typing import Dict, Any
 import os
 import sys
+import threading
 
 # Add the project root to the path so we can import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models.temperature_predictor import TemperaturePredictor
+from utils.fusion import FUSED_FEATURES
 
 class PredictionAgent:
     """
@@ -20,7 +22,11 @@ class PredictionAgent:
     def __init__(self):
         """Initialize the prediction agent."""
         self.temperature_predictor = TemperaturePredictor()
+        self.fused_predictor = None
         self.is_trained = False
+        self.model_version = 0  # Bumped whenever the temperature model's weights change
+        # Coordinators of several sessions may share the agent and its models
+        self._lock = threading.RLock()
         
     def train(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -37,13 +43,19 @@ class PredictionAgent:
             return {'status': 'error', 'message': 'Not enough data for training'}
             
         # Train temperature model
-        history = self.temperature_predictor.train(df)
-        self.is_trained = True
+        with self._lock:
+            weights_version = self.temperature_predictor.weights_version
+            history = self.temperature_predictor.train(df)
+            retrained = self.temperature_predictor.weights_version != weights_version
+            if retrained or not self.is_trained:
+                self.model_version += 1
+            self.is_trained = True
         
         return {
             'status': 'success',
             'temperature_loss': history['loss'][-1],
-            'epochs': len(history['loss'])
+            'epochs': len(history['loss']),
+            'retrained': retrained
         }
         
     def predict_next_day(self, df: pd.DataFrame) -> Dict[str, Any]:
@@ -61,7 +73,8 @@ class PredictionAgent:
             
         # Predict temperature
         try:
-            predicted_temp = self.temperature_predictor.predict_next_day(df)
+            with self._lock:
+                predicted_temp = self.temperature_predictor.predict_next_day(df)
             
             return {
                 'status': 'success',
@@ -70,6 +83,58 @@ class PredictionAgent:
         except Exception as e:
             return {'status': 'error', 'message': str(e)}
             
+    def train_fused(self, daily: pd.DataFrame, force: bool = True) -> Dict[str, Any]:
+        """
+        Train a temperature model on daily indoor and outdoor features.
+        
+        Args:
+            daily: Daily frame with FUSED_FEATURES (see utils.fusion.daily_features)
+            force: Whether to retrain the fused model if it was already saved
+                (it is trained on whatever fused window is passed in)
+            
+        Returns:
+            Training metrics
+        """
+        if len(daily) < 10:
+            return {'status': 'error', 'message': 'Not enough data for training'}
+            
+        with self._lock:
+            if self.fused_predictor is None:
+                self.fused_predictor = TemperaturePredictor(features=FUSED_FEATURES, model_name="fused_model")
+            weights_version = self.fused_predictor.weights_version
+            history = self.fused_predictor.train(daily, force=force)
+        
+        return {
+            'status': 'success',
+            'temperature_loss': history['loss'][-1],
+            'epochs': len(history['loss']),
+            'features': FUSED_FEATURES,
+            'retrained': self.fused_predictor.weights_version != weights_version
+        }
+        
+    def predict_next_day_fused(self, daily: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Predict the next day's indoor temperature from indoor and outdoor features.
+        
+        Args:
+            daily: Recent daily frame with FUSED_FEATURES
+            
+        Returns:
+            Dictionary of predictions
+        """
+        if self.fused_predictor is None or self.fused_predictor.model is None:
+            return {'status': 'error', 'message': 'Fused model not trained yet'}
+            
+        try:
+            with self._lock:
+                predicted_temp = self.fused_predictor.predict_next_day(daily)
+            return {
+                'status': 'success',
+                'predicted_temperature': predicted_temp
+            }
+        except Exception as e:
+            return {'status': 'error', 'message': str(e)}
+            
     def save_models(self, directory: str) -> None:
         """
         Save trained models to disk.
@@ -91,4 +156,5 @@ class PredictionAgent:
             directory: Directory containing saved models
         """
         self.temperature_predictor.load_model(os.path.join(directory, 'temperature_model'))
-        self.is_trained = True 
\ No newline at end of file
+        self.is_trained = True
+        self.model_version += 1 
\ No newline at end of file
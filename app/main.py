@@ -8,9 +8,11 @@ from streamlit_folium import st_folium
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
+import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
 import sys
 import os
+import uuid
 from datetime import datetime, timedelta
 
     # Set up the page - MUST be the first Streamlit command
@@ -310,15 +312,18 @@ st.markdown("""
 
 # Add the project root to the path so we can import modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from agents.coordinator_agent import CoordinatorAgent
-from config import DEFAULT_LATITUDE, DEFAULT_LONGITUDE, DEFAULT_RADIUS, CROP_TEMP_RANGES
+from agents.coordinator_pool import CoordinatorPool
+from config import DEFAULT_LATITUDE, DEFAULT_LONGITUDE, DEFAULT_RADIUS, CROP_TEMP_RANGES, IOT_DATA_PATH
 
-# Initialize the coordinator agent
+# One coordinator per browser session; the model, caches and RAG index are shared
 @st.cache_resource
-def get_coordinator():
-    return CoordinatorAgent()
+def get_coordinator_pool():
+    # Shared resources load in the background while the first page renders
+    return CoordinatorPool(warm_up=True)
 
-coordinator = get_coordinator()
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+coordinator = get_coordinator_pool().get(st.session_state.session_id)
 
 # Header
 st.title("🌿 Greenhouse Intelligence System")
@@ -397,6 +402,11 @@ with st.sidebar.expander("Select Location on Map", expanded=True):
     # Radius selection with better styling
     st.markdown("#### Area Settings")
     radius = st.slider("Radius (km)", min_value=1, max_value=50, value=DEFAULT_RADIUS)
+    aggregate_area = st.checkbox("Average all grid cells within radius", value=False)
+    
+    # Nearby coordinates share a NASA POWER grid cell and therefore the same data
+    cell_lat, cell_lon = coordinator.nasa_data.resolve_grid_cell(latitude, longitude)
+    st.caption(f"NASA POWER grid cell: {cell_lat:.3f}, {cell_lon:.3f}")
 
 # Crop selection with improved styling
 st.sidebar.header("Crop Selection")
@@ -418,29 +428,36 @@ days = st.sidebar.slider("Days of Historical Data", min_value=1, max_value=30, v
 
 fetch_button = st.sidebar.button("Fetch NASA Data", use_container_width=True)
 if fetch_button:
-    with st.spinner("Fetching data from NASA Earth Data APIs..."):
-        result = coordinator.fetch_data(
+    with st.spinner("Fetching data from NASA Earth Data APIs and training the prediction model..."):
+        # Fetch, processing, memory update and training run as one concurrent refresh
+        result = coordinator.refresh(
             st.session_state.latitude,
             st.session_state.longitude,
             radius,
-            days
+            days,
+            crop=selected_crop,
+            aggregate_area=aggregate_area
         )
         
         if result['status'] == 'success':
             st.sidebar.success(result['message'])
             
-            # Set the crop
-            coordinator.set_crop(selected_crop)
-            
-            # Train the prediction model
-            with st.spinner("Training prediction model..."):
-                training_result = coordinator.train_prediction_model()
-                if training_result['status'] == 'success':
-                    st.sidebar.success("Prediction model trained successfully")
-                else:
-                    st.sidebar.error(training_result['message'])
+            training_result = result['training']
+            if training_result['status'] == 'success':
+                st.sidebar.success("Prediction model trained successfully")
+            else:
+                st.sidebar.error(training_result['message'])
         else:
             st.sidebar.error(result['message'])
+            
+        if 'stages' in result:
+            with st.sidebar.expander("Refresh timings"):
+                timings = pd.DataFrame(result['stages']['timings']).T
+                st.dataframe(timings[['status', 'start', 'seconds']].style.format(
+                    {'start': '{:.2f}', 'seconds': '{:.2f}'}, na_rep='-'
+                ), use_container_width=True)
+                st.caption(f"Wall time {result['stages']['wall']:.2f} s "
+                           f"(stages sum {result['stages']['total']:.2f} s)")
 
 # Main content area
 tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Info", "🔍 Analysis", "📈 History", "🤖 AI Assistant", "🌱 Crop Recommendation"])
@@ -694,11 +711,12 @@ with tab1:
             cmap = plt.cm.RdYlGn_r
             norm = plt.Normalize(min_temp - 5, max_temp + 5)
             
-            for i in range(len(data) - 1):
-                ax.plot([data['date'].iloc[i], data['date'].iloc[i+1]], 
-                       [data['temperature'].iloc[i], data['temperature'].iloc[i+1]], 
-                       color=cmap(norm(data['temperature'].iloc[i])), 
-                       linewidth=3)
+            # Draw all segments as one collection rather than one line per point
+            dates = mdates.date2num(pd.to_datetime(data['date']))
+            temps = data['temperature'].to_numpy(dtype=float)
+            points = np.column_stack([dates, temps])
+            segments = np.stack([points[:-1], points[1:]], axis=1)
+            ax.add_collection(LineCollection(segments, colors=cmap(norm(temps[:-1])), linewidth=3))
             
             # Add scatter points
             scatter = ax.scatter(data['date'], data['temperature'], 
@@ -817,6 +835,10 @@ with tab2:
                 
             st.pyplot(fig)
             
+            # Daily suitability of every crop over the fetched period
+            st.subheader("Crop Suitability Over Time")
+            st.line_chart(coordinator.get_suitability_timeline())
+            
             # Display soil moisture if available
             if analysis['soil_moisture'] is not None:
                 st.subheader("Soil Moisture")
@@ -858,6 +880,73 @@ with tab2:
             st.warning(analysis['message'])
     else:
         st.info("Please fetch data using the sidebar controls to view the analysis.")
+    
+    # Abnormal greenhouse sensor readings
+    if len(coordinator.sensor_store) > 0:
+        st.subheader("Sensor Anomalies")
+        anomalies = coordinator.detect_anomalies()
+        if anomalies['status'] == 'success':
+            summary = anomalies['summary']
+            anomaly_cols = st.columns(len(summary['counts']) + 1)
+            anomaly_cols[0].metric("Readings", f"{summary['readings']:,}")
+            for col, (sensor, count) in zip(anomaly_cols[1:], summary['counts'].items()):
+                col.metric(sensor.replace('_', ' ').title(), f"{count:,}",
+                           f"{count / summary['readings']:.1%} of readings", delta_color="off")
+            
+            scores = anomalies['scores']
+            fig, ax = plt.subplots(figsize=(10, 4))
+            fig.patch.set_facecolor('#121212')
+            ax.set_facecolor('#121212')
+            ax.plot(scores.index, scores['temperature'], color='#4CAF50', linewidth=1, label='Temperature')
+            flagged = scores[scores['temperature_anomaly']]
+            ax.scatter(flagged.index, flagged['temperature'], color='#F44336', s=15, zorder=5, label='Anomaly')
+            ax.set_ylabel('Temperature (°C)', color='#999')
+            ax.grid(True, linestyle='--', alpha=0.3, color='#555')
+            ax.tick_params(colors='#999')
+            for spine in ax.spines.values():
+                spine.set_edgecolor('#555')
+            ax.legend(loc='upper right', framealpha=0.8, facecolor='#121212', edgecolor='#555')
+            fig.autofmt_xdate()
+            fig.tight_layout()
+            st.pyplot(fig)
+            
+            if summary['anomalies']:
+                st.write("Most recent anomalous readings:")
+                st.dataframe(scores[scores['anomaly']].tail(20).iloc[::-1], use_container_width=True)
+        else:
+            st.info(anomalies['message'])
+        
+        # How the actuator rules would have performed on the recorded history
+        if coordinator.current_crop is not None:
+            st.subheader("Actuator Rule Backtest")
+            backtest = coordinator.backtest_actuator_rules()
+            if backtest['status'] == 'success':
+                backtest_df = pd.DataFrame(backtest['report']).T
+                backtest_df.index = [name.replace('_', ' ').title() for name in backtest_df.index]
+                st.dataframe(backtest_df.style.format({
+                    'threshold': '{:.1f}', 'agreement': '{:.1%}', 'duty_cycle': '{:.1%}',
+                    'recorded_duty_cycle': '{:.1%}', 'switches_per_day': '{:.1f}',
+                    'recorded_switches_per_day': '{:.1f}'
+                }), use_container_width=True)
+                st.caption("The sensor log has no soil moisture, so the watering pump rule uses humidity "
+                           "as a proxy. The water pump rule (tank level below 50%) is not one of the "
+                           "recommendation rules; it is added so the recorded water pump is scored too.")
+            else:
+                st.info(backtest['message'])
+
+            # Same history through the control engine (deadband and minimum ON/OFF times)
+            st.subheader("Actuator Control Simulation")
+            control = coordinator.simulate_control()
+            if control['status'] == 'success':
+                control_df = pd.DataFrame(control['summary']).T
+                control_df.index = [name.replace('_', ' ').title() for name in control_df.index]
+                st.dataframe(control_df.style.format({
+                    'duty_cycle': '{:.1%}', 'switches': '{:.0f}', 'switches_per_day': '{:.1f}'
+                }), use_container_width=True)
+                st.line_chart(control['schedule'].astype(int).resample('1h').mean())
+                st.caption("Share of each hour the actuators would run")
+            else:
+                st.info(control['message'])
 
 # History tab
 with tab3:
@@ -921,6 +1010,96 @@ with tab3:
         st.warning(f"Historical performance data is not available yet. Please set a crop and generate some predictions first.")
         print(f"Error in historical performance tab: {e}")
 
+    # Greenhouse sensor history from the memory-mapped sensor store
+    st.subheader("Greenhouse Sensor History")
+    
+    if st.button("Import Sensor Data", use_container_width=True):
+        with st.spinner("Importing sensor readings..."):
+            import_result = coordinator.import_sensor_data()
+            if import_result['status'] == 'success':
+                st.success(import_result['message'])
+            else:
+                st.error(import_result['message'])
+
+    # Follow a gateway CSV and ingest only newly appended rows on each rerun
+    live_path = st.text_input("Live sensor file", value=IOT_DATA_PATH)
+    if st.toggle("Follow live sensor file", value=False):
+        if coordinator.sensor_follower is None or coordinator.sensor_follower.path != live_path:
+            coordinator.start_live_ingestion(live_path)
+        live_result = coordinator.poll_live_readings()
+        if live_result['status'] == 'success':
+            st.caption(f"{live_result['rows']} new readings ingested")
+        else:
+            st.error(live_result['message'])
+    elif coordinator.sensor_follower is not None:
+        coordinator.stop_live_ingestion()
+
+    if len(coordinator.sensor_store) > 0:
+        all_readings = coordinator.sensor_store.range_arrays(columns=[])['timestamp']
+        first_day = pd.Timestamp(all_readings[0]).date()
+        last_day = pd.Timestamp(all_readings[-1]).date()
+        
+        sensor_range = st.date_input("Date range", value=(first_day, last_day),
+                                     min_value=first_day, max_value=last_day)
+        if isinstance(sensor_range, (tuple, list)) and len(sensor_range) == 2:
+            range_start = pd.Timestamp(sensor_range[0])
+            range_end = pd.Timestamp(sensor_range[1]) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+            sensor_history = coordinator.get_sensor_rollup(
+                range_start, range_end, ['temperature', 'humidity', 'water_level']
+            )
+            
+            if not sensor_history.empty:
+                resolution = sensor_history.attrs.get('resolution')
+                if resolution == 'raw':
+                    st.caption(f"Showing raw readings ({len(sensor_history)} points)")
+                else:
+                    st.caption(f"Showing {resolution} averages ({len(sensor_history)} points)")
+                st.line_chart(sensor_history[['temperature_mean', 'humidity_mean', 'water_level_mean']].rename(
+                    columns=lambda c: c[:-len('_mean')]
+                ))
+                
+                # Temperature range within each bucket
+                fig, ax = plt.subplots(figsize=(10, 3))
+                fig.patch.set_facecolor('#121212')
+                ax.set_facecolor('#121212')
+                ax.fill_between(sensor_history.index, sensor_history['temperature_min'],
+                                sensor_history['temperature_max'], color='#4CAF50', alpha=0.3, label='Min-Max')
+                ax.plot(sensor_history.index, sensor_history['temperature_mean'], color='#4CAF50',
+                        linewidth=2, label='Mean')
+                ax.set_ylabel('Temperature (°C)', color='#999')
+                ax.grid(True, linestyle='--', alpha=0.3, color='#555')
+                ax.tick_params(colors='#999')
+                for spine in ax.spines.values():
+                    spine.set_edgecolor('#555')
+                ax.legend(loc='upper right', framealpha=0.8, facecolor='#121212', edgecolor='#555')
+                fig.autofmt_xdate()
+                fig.tight_layout()
+                st.pyplot(fig)
+                
+                trends = coordinator.analyze_sensor_trends(range_start, range_end)
+                if trends['mean'] is not None:
+                    st.write(f"Mean {trends['mean']:.1f}°C, min {trends['min']:.1f}°C, "
+                             f"max {trends['max']:.1f}°C, trend: {trends['trend']}")
+                
+                # Indoor readings against the outdoor conditions at the selected location
+                if st.button("Compare with Outdoor Conditions", use_container_width=True):
+                    with st.spinner("Joining sensor readings with NASA POWER data..."):
+                        fusion = coordinator.fuse_sensor_data(range_start, range_end)
+                    if fusion['status'] == 'success':
+                        comparison = fusion['comparison']
+                        indoor_col, outdoor_col, delta_col = st.columns(3)
+                        indoor_col.metric("Indoor Mean", f"{comparison['indoor']['mean']:.1f}°C")
+                        if comparison['outdoor'] is not None:
+                            outdoor_col.metric("Outdoor Mean", f"{comparison['outdoor']['mean']:.1f}°C")
+                            delta_col.metric("Indoor - Outdoor", f"{comparison['mean_delta']:+.1f}°C")
+                        st.caption(f"{comparison['coverage']:.0%} of readings matched to outdoor data")
+                    else:
+                        st.error(fusion['message'])
+            else:
+                st.info("No sensor readings in the selected range.")
+    else:
+        st.info("No sensor readings stored yet. Import sensor data to view greenhouse history.")
+
 # AI Assistant tab
 with tab4:
     st.header("🤖 AI-Powered Greenhouse Assistant")
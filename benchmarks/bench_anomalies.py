@@ -0,0 +1,67 @@
+"""
+Benchmark of rolling robust z-score anomaly detection on the bundled IoT
+sensor export: a full-history pass, streaming batches, and a full pass over
+the export tiled to millions of rows.
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import IOT_DATA_PATH
+from utils.iot_data import IoTDataLoader
+from utils.anomalies import AnomalyDetector, summarize_anomalies
+
+def report(name: str, count: int, elapsed: float, unit: str = "rows") -> None:
+    """Print one benchmark result line."""
+    print(f"{name:<38} {count:>9} {unit:<5} {elapsed * 1000:>10.1f} ms "
+          f"{count / elapsed:>14.0f} {unit}/s")
+
+def tile(df: pd.DataFrame, rows: int, seed: int = 0) -> pd.DataFrame:
+    """Repeat the readings with a little noise on a regular 5-minute index."""
+    rng = np.random.default_rng(seed)
+    repeats = -(-rows // len(df))
+    tiled = pd.concat([df] * repeats).iloc[:rows].copy()
+    for column in ['temperature', 'humidity', 'water_level']:
+        tiled[column] += rng.normal(0, 0.5, rows).astype(np.float32)
+    tiled.index = pd.date_range("2000-01-01", periods=rows, freq="5min", name="date")
+    return tiled
+
+def main():
+    """Run the anomaly detection benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", default=IOT_DATA_PATH)
+    parser.add_argument("--batch", type=int, default=500, help="Rows per streaming batch")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Rows in the tiled history")
+    args = parser.parse_args()
+
+    df = IoTDataLoader().load(args.path)
+    detector = AnomalyDetector()
+
+    start = time.perf_counter()
+    scores = detector.score(df)
+    report("score (IoT export)", len(df), time.perf_counter() - start)
+    summary = summarize_anomalies(scores)
+    print(f"{'':<38} {summary['anomalies']} anomalous readings {summary['counts']}")
+
+    start = time.perf_counter()
+    batches = 0
+    for i in range(0, len(df), args.batch):
+        detector.update(df.iloc[i:i + args.batch])
+        batches += 1
+    elapsed = time.perf_counter() - start
+    report(f"update (batches of {args.batch})", len(df), elapsed)
+    print(f"{'':<38} {elapsed / batches * 1000:.2f} ms per batch")
+
+    big = tile(df, args.rows)
+    start = time.perf_counter()
+    detector.score(big)
+    report(f"score (tiled)", len(big), time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark of the actuator rule backtester on the bundled IoT sensor export:
+replaying one rule set, scoring a rule set, and sweeping thousands of
+thresholds per actuator and every combination of them.
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import IOT_DATA_PATH
+from utils.iot_data import IoTDataLoader
+from utils.backtest import ActuatorBacktester, default_thresholds
+
+def report(name: str, count: int, elapsed: float, unit: str = "ops") -> None:
+    """Print one benchmark result line."""
+    print(f"{name:<38} {count:>9} {unit:<6} {elapsed * 1000:>10.1f} ms "
+          f"{count / elapsed:>14.0f} {unit}/s")
+
+def main():
+    """Run the backtest benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", default=IOT_DATA_PATH)
+    parser.add_argument("--thresholds", type=int, default=2000, help="Thresholds per actuator")
+    parser.add_argument("--combine", type=int, default=100, help="Thresholds per actuator in the combined sweep")
+    args = parser.parse_args()
+
+    readings = IoTDataLoader().load(args.path)
+    rules = default_thresholds(27)
+
+    start = time.perf_counter()
+    backtester = ActuatorBacktester(readings)
+    report("prepare", len(readings), time.perf_counter() - start, "rows")
+
+    start = time.perf_counter()
+    backtester.replay(rules)
+    report("replay (one rule set)", len(readings), time.perf_counter() - start, "rows")
+
+    start = time.perf_counter()
+    result = backtester.evaluate(rules)
+    report("evaluate (one rule set)", 1, time.perf_counter() - start, "sets")
+    for actuator, metrics in result.items():
+        print(f"{'':<38} {actuator}: agreement {metrics['agreement']:.1%}, "
+              f"duty {metrics['duty_cycle']:.1%}, {metrics['switches_per_day']:.1f} switches/day")
+
+    grid = {
+        'fan': np.linspace(10, 40, args.thresholds),
+        'watering_pump': np.linspace(0, 80, args.thresholds),
+        'water_pump': np.linspace(0, 100, args.thresholds)
+    }
+    start = time.perf_counter()
+    backtester.sweep(grid)
+    report("sweep (per actuator)", 3 * args.thresholds, time.perf_counter() - start, "rules")
+
+    small = {actuator: values[::max(1, args.thresholds // args.combine)][:args.combine]
+             for actuator, values in grid.items()}
+    start = time.perf_counter()
+    combos = backtester.sweep(small, combine=True)
+    report("sweep (all combinations)", len(combos), time.perf_counter() - start, "sets")
+    best = combos.iloc[0]
+    print(f"{'':<38} best: " + ", ".join(f"{a} {best[f'{a}_threshold']:.1f}" for a in small)
+          + f" (mean agreement {best['mean_agreement']:.1%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Offline benchmarks of the NASA POWER fetch path against the local stand-in
+server: single fetches (cold and cached), concurrent multi-site fetches,
+response parsing and merge_datasets throughput.
+"""
+
+import os
+import sys
+import time
+import json
+import asyncio
+import argparse
+import tempfile
+import contextlib
+import io
+import datetime
+import requests
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import NASA_POWER_PARAMETERS, POWER_HTTP_PARAMS
+from utils.nasa_data import NASAEarthdata, parse_power_parameters
+from utils.power_cache import PowerCache
+from utils.power_stub_server import PowerStubServer
+
+def out(message: str = "") -> None:
+    """Print to the real stdout even while fetch logging is silenced."""
+    print(message, file=sys.__stdout__)
+
+def report(name: str, count: int, elapsed: float, unit: str = "ops") -> None:
+    """Print one benchmark result line."""
+    out(f"{name:<38} {count:>7} {unit:<5} {elapsed * 1000:>10.1f} ms "
+        f"{count / elapsed:>12.1f} {unit}/s")
+
+def bench_fetch(server: PowerStubServer, args) -> None:
+    """Benchmark single-site fetches without and with the cache."""
+    http_params = dict(POWER_HTTP_PARAMS, requests_per_second=0)
+
+    nasa = NASAEarthdata(use_cache=False, base_url=server.url, http_params=http_params)
+    start = time.perf_counter()
+    for i in range(args.requests):
+        nasa.fetch_power_data(10 + i, 70, 0, args.days)
+    report("fetch_power_data (no cache)", args.requests, time.perf_counter() - start, "req")
+    stats = nasa.get_request_stats()
+    out(f"{'':<38} mean latency {stats['mean_latency'] * 1000:.1f} ms, "
+        f"max {stats['max_latency'] * 1000:.1f} ms, retries {stats['retries']}")
+
+    # Bare requests.get without connection reuse, as before the pooled session
+    params = {"start": "20240101", "end": "20240110", "latitude": 10, "longitude": 70,
+              "parameters": ",".join(NASA_POWER_PARAMETERS), "format": "JSON"}
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        requests.get(server.url, params=params, timeout=30).json()
+    report("bare requests.get (no keep-alive)", args.requests, time.perf_counter() - start, "req")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        nasa = NASAEarthdata(cache=PowerCache(cache_dir), base_url=server.url, http_params=http_params)
+        nasa.fetch_power_data(10, 70, 0, args.days)
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            nasa.fetch_power_data(10, 70, 0, args.days)
+        report("fetch_power_data (warm cache)", args.requests, time.perf_counter() - start, "req")
+
+def bench_fetch_many(server: PowerStubServer, args) -> None:
+    """Benchmark concurrent multi-site fetches."""
+    nasa = NASAEarthdata(use_cache=False, base_url=server.url,
+                         http_params=dict(POWER_HTTP_PARAMS, requests_per_second=0))
+    sites = [{'name': f"site{i}", 'lat': -40 + i, 'lon': 10 + i} for i in range(args.sites)]
+    start = time.perf_counter()
+    results = asyncio.run(nasa.fetch_many(sites, args.days))
+    report(f"fetch_many ({args.sites} sites)", len(results), time.perf_counter() - start, "site")
+
+def bench_parse_and_merge(server: PowerStubServer, args) -> None:
+    """Benchmark parsing and merging a long response."""
+    end = datetime.date.today()
+    start_date = end - datetime.timedelta(days=args.parse_days)
+    params = {"start": start_date.strftime("%Y%m%d"), "end": end.strftime("%Y%m%d"),
+              "latitude": 10, "longitude": 70, "parameters": ",".join(NASA_POWER_PARAMETERS)}
+    payload = requests.get(server.url, params=params, timeout=30).content
+    out(f"{'payload size':<38} {len(payload) / 1024:>7.0f} KiB")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        parameters = json.loads(payload)['properties']['parameter']
+    elapsed = time.perf_counter() - start
+    report("json decode", args.repeat, elapsed, "resp")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        df = parse_power_parameters(parameters)
+    elapsed = time.perf_counter() - start
+    report("parse_power_parameters", len(df) * args.repeat, elapsed, "rows")
+
+    nasa = NASAEarthdata(use_cache=False, base_url=server.url)
+    temp_df = nasa.process_temperature_data(df[['date', 'temperature']].copy())
+    moisture_df = df[['date', 'soil_moisture']].copy()
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        merged = nasa.merge_datasets(temp_df, moisture_df)
+    report("merge_datasets", len(merged) * args.repeat, time.perf_counter() - start, "rows")
+
+def main():
+    """Run the fetch path benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stand-in server delay per request (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of injected 503 errors")
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--sites", type=int, default=24)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--parse-days", type=int, default=7300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with PowerStubServer(latency=args.latency, error_rate=args.error_rate, seed=0) as server:
+        out(f"Stand-in server at {server.url} (latency {args.latency * 1000:.0f} ms, "
+            f"error rate {args.error_rate:.0%})\n")
+        # Silence the per-request fetch logging
+        with contextlib.redirect_stdout(io.StringIO()):
+            bench_fetch(server, args)
+            bench_fetch_many(server, args)
+            bench_parse_and_merge(server, args)
+        out(f"\nServer stats: {server.stats}")
+
+if __name__ == "__main__":
+    main()
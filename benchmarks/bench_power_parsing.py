@@ -0,0 +1,72 @@
+"""
+Micro-benchmark of NASA POWER response parsing: the original per-row loop
+against the vectorized parser in utils/nasa_data.py.
+"""
+
+import os
+import sys
+import time
+import datetime
+import argparse
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import NASA_POWER_PARAMETERS
+from utils.nasa_data import parse_power_parameters
+
+def make_parameters(days: int, missing_rate: float = 0.02, seed: int = 0) -> dict:
+    """Build a synthetic POWER 'parameter' section covering the given number of days."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2000-01-01", periods=days, freq="D").strftime("%Y%m%d")
+    parameters = {}
+    for param in NASA_POWER_PARAMETERS:
+        values = rng.normal(20, 5, days).round(2)
+        values[rng.random(days) < missing_rate] = -999
+        parameters[param] = dict(zip(dates, values.tolist()))
+    return parameters
+
+def parse_loop(parameters: dict) -> pd.DataFrame:
+    """The original parser: one strptime/float/-999 check per row and parameter."""
+    columns = {}
+    for param, values_by_date in parameters.items():
+        values = {}
+        for date_str, value in values_by_date.items():
+            if date_str != 'units':
+                try:
+                    date = datetime.datetime.strptime(date_str, "%Y%m%d")
+                    if float(value) == -999:
+                        continue
+                    values[date] = float(value)
+                except (ValueError, TypeError):
+                    pass
+        columns[param] = pd.Series(values, dtype=float)
+    return pd.DataFrame(columns).sort_index().rename_axis('date').reset_index()
+
+def best_time(func, *args, repeat: int = 5) -> float:
+    """Best wall-clock time of several runs in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    """Run the parsing benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 365, 3650, 7300])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"{'days':>8} {'loop (ms)':>12} {'vectorized (ms)':>16} {'speedup':>9}")
+    for days in args.days:
+        parameters = make_parameters(days)
+        loop_time = best_time(parse_loop, parameters, repeat=args.repeat)
+        vector_time = best_time(parse_power_parameters, parameters, repeat=args.repeat)
+        print(f"{days:>8} {loop_time * 1000:>12.2f} {vector_time * 1000:>16.2f} "
+              f"{loop_time / vector_time:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
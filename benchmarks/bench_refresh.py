@@ -0,0 +1,94 @@
+"""
+Benchmark of CoordinatorAgent.refresh: a cold refresh, where every shared
+component (NASA client, prediction history, TensorFlow model) is built during
+the refresh, then a warm refresh of the same coordinator. Prints the stage
+timings of both.
+
+By default the POWER request, the prediction history load, the model load
+and training are replaced by sleeps of the given lengths, so the overlap of
+the stages can be measured offline; --live uses the real components.
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import DEFAULT_LATITUDE, DEFAULT_LONGITUDE, DEFAULT_RADIUS
+from agents.coordinator_agent import CoordinatorAgent, SharedResources
+from utils.nasa_data import NASAEarthdata
+from utils.stages import format_timings
+
+ORDER = ['fetch', 'memory', 'model', 'process', 'fill', 'commit', 'update_memory', 'train']
+
+class SimulatedResources(SharedResources):
+    """Shared resources whose slow builds sleep instead of doing the work."""
+
+    def __init__(self, delays: dict):
+        super().__init__()
+        self.delays = delays
+
+    def get(self, name, factory):
+        if name == 'temperature_model':
+            factory = lambda: time.sleep(self.delays['model']) or True
+        elif name == 'memory_agent':
+            build = factory
+            factory = lambda: time.sleep(self.delays['memory']) or build()
+        return super().get(name, factory)
+
+def simulate_fetch(delay: float):
+    """Replace the POWER fetch with a sleep returning synthetic daily data."""
+    def fetch_power_data(self, lat, lon, radius, days=6):
+        time.sleep(delay)
+        dates = pd.date_range(end=pd.Timestamp.now().normalize(), periods=days + 1, freq='D')
+        temperature = 25 + np.sin(np.arange(len(dates)) / 3)
+        return pd.DataFrame({
+            'date': dates,
+            'temperature': temperature,
+            'temperature_max': temperature + 4,
+            'temperature_min': temperature - 4,
+            'precipitation': 0.0,
+            'humidity': 60.0,
+            'soil_moisture': 0.4
+        })
+    NASAEarthdata.fetch_power_data = fetch_power_data
+
+def run_refresh(coordinator: CoordinatorAgent, label: str, days: int) -> None:
+    """Refresh once and print the stage timings."""
+    start = time.perf_counter()
+    result = coordinator.refresh(DEFAULT_LATITUDE, DEFAULT_LONGITUDE, DEFAULT_RADIUS,
+                                 days=days, use_archive=False)
+    elapsed = time.perf_counter() - start
+    print(f"{label} refresh: {result['status']}, {elapsed * 1000:.1f} ms")
+    print(format_timings(result['stages'], [name for name in ORDER if name in result['stages']['timings']]))
+    print()
+
+def main():
+    """Run the cold and warm refresh benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--live", action="store_true", help="Use the real components")
+    parser.add_argument("--fetch", type=float, default=0.5, help="Simulated POWER request (s)")
+    parser.add_argument("--memory", type=float, default=0.3, help="Simulated history load (s)")
+    parser.add_argument("--model", type=float, default=1.0, help="Simulated TensorFlow load (s)")
+    parser.add_argument("--train", type=float, default=0.2, help="Simulated training (s)")
+    args = parser.parse_args()
+
+    if args.live:
+        coordinator = CoordinatorAgent()
+    else:
+        simulate_fetch(args.fetch)
+        coordinator = CoordinatorAgent(resources=SimulatedResources(vars(args)))
+        coordinator.train_prediction_model = lambda: time.sleep(args.train) or {'status': 'success'}
+
+    run_refresh(coordinator, "cold", args.days)
+    run_refresh(coordinator, "warm", args.days)
+    for name, seconds in coordinator.get_load_report()['loaded'].items():
+        print(f"  first use of {name:<23} {seconds * 1000:>10.1f} ms")
+
+if __name__ == "__main__":
+    main()
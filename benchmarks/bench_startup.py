@@ -0,0 +1,58 @@
+"""
+Startup report: import time of the coordinator and its modules (from
+python -X importtime in a fresh interpreter), coordinator construction time
+and the time to build each lazily loaded component.
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+# Add the project root to the path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+def import_times(module: str) -> list:
+    """Get (cumulative seconds, module) for every module imported by a fresh `import module`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times.append((int(cumulative) / 1e6, name.strip()))
+    return times
+
+def main():
+    """Print the startup report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="agents.coordinator_agent")
+    parser.add_argument("--top", type=int, default=15, help="Slowest top-level imports to list")
+    args = parser.parse_args()
+
+    times = import_times(args.module)
+    total = next(seconds for seconds, name in reversed(times) if name == args.module)
+    print(f"import {args.module}: {total * 1000:.1f} ms")
+    top_level = {}
+    for seconds, name in times:
+        package = name.split(".")[0]
+        top_level[package] = max(top_level.get(package, 0.0), seconds)
+    for package, seconds in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {package:<36} {seconds * 1000:>10.1f} ms")
+
+    from agents.coordinator_agent import CoordinatorAgent
+    start = time.perf_counter()
+    coordinator = CoordinatorAgent()
+    print(f"CoordinatorAgent(): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    coordinator.warm_up(background=False)
+    for name, seconds in coordinator.get_load_report()['loaded'].items():
+        print(f"  first use of {name:<23} {seconds * 1000:>10.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 Configuration settings for the Greenhouse Intelligence System.
 """
 
+import os
+
 # NASA Earthdata API credentials
 NASA_API_KEY = ""
 
@@ -31,6 +33,82 @@ CROP_TEMP_RANGES = {
 # NASA POWER API parameters
 # We don't need specific dataset IDs for the POWER API
 # as we specify parameters directly in the API call
+NASA_POWER_URL = "https://power.larc.nasa.gov/api/temporal/daily/point"
+NASA_POWER_PARAMETERS = [
+    "T2M", "T2M_MAX", "T2M_MIN",                # Temperature parameters
+    "PRECTOTCORR", "RH2M",                      # Precipitation and humidity
+    "GWETPROF", "GWETROOT", "GWETTOP"           # Soil moisture parameters
+]
+
+# NASA POWER meteorological grid resolution (degrees latitude, longitude)
+NASA_POWER_GRID = (0.5, 0.625)
+
+# Seconds the single-variable views reuse the last combined frame they fetched
+NASA_POWER_VIEW_TTL = 60
+
+# NASA POWER HTTP client settings
+POWER_HTTP_PARAMS = {
+    "connect_timeout": 5,     # Seconds to establish a connection
+    "read_timeout": 60,       # Seconds to wait for response data
+    "max_retries": 3,         # Retries on connection errors, 429 and 5xx
+    "backoff_factor": 0.5,    # Exponential backoff base in seconds
+    "pool_size": 10,          # Keep-alive connections per host
+    "max_concurrency": 8,     # Concurrent requests in multi-site fetches
+    "requests_per_second": 5  # Request rate limit per host
+}
+
+# NASA POWER response cache settings
+POWER_CACHE_PARAMS = {
+    "max_files": 512,         # Maximum number of cached grid cells
+    "revision_days": 7,       # Recent days that POWER may still revise
+    "recent_ttl_hours": 6     # Time after which those days are refetched
+}
+
+# Greenhouse IoT sensor export (5-minute readings)
+IOT_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "IoTProcessed_Data.csv")
+
+# Sensor anomaly detection (rolling median / MAD robust z-scores)
+ANOMALY_PARAMS = {
+    "window": 288,            # Readings per rolling window (24 h of 5-minute data)
+    "min_periods": 36,        # Readings needed before scoring starts
+    "threshold": 3.5,         # Robust z-score flagged as anomalous
+    "min_scale": {            # Floor for the MAD of near-constant sensors
+        "temperature": 0.5,
+        "humidity": 1.0,
+        "water_level": 1.0
+    }
+}
+
+# Actuator control engine (hysteresis and minimum dwell times per actuator)
+CONTROL_PARAMS = {
+    "fan": {
+        "sensor": "temperature",
+        "margin": 1.0,        # ON above the crop's maximum temperature + margin
+        "deadband": 1.0,      # OFF once back below the ON threshold - deadband
+        "min_on": "15min",
+        "min_off": "15min"
+    },
+    "heater": {
+        "sensor": "temperature",
+        "margin": 1.0,        # ON below the crop's minimum temperature - margin
+        "deadband": 1.0,
+        "min_on": "15min",
+        "min_off": "15min"
+    },
+    "water_pump": {
+        "sensor": "soil_moisture",
+        "threshold": 30.0,    # ON below this soil moisture (%)
+        "deadband": 5.0,
+        "min_on": "5min",
+        "min_off": "30min"
+    }
+}
+
+# Per-session coordinators of the web app (heavy resources are shared)
+COORDINATOR_POOL_PARAMS = {
+    "max_sessions": 50,               # Sessions kept before the least recently used is evicted
+    "max_bytes": 256 * 1024 * 1024    # Cap on the estimated size of all session state
+}
 
 # Model settings
 MODEL_PARAMS = {
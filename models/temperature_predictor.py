@@ -6,12 +6,9 @@ import numpy as np
 import pandas as pd
 import os
 from typing import Tuple, List, Dict, Any
-import tensorflow as tf
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import GRU, Dense, Dropout
-from sklearn.preprocessing import MinMaxScaler
 import sys
 import os
+import threading
 
 # Add the project root to the path so we can import the config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,28 +17,69 @@ from config import MODEL_PARAMS
 class TemperaturePredictor:
     """GRU-based model for predicting next-day temperature."""
     
-    def __init__(self, params: Dict[str, Any] = None):
+    def __init__(self, params: Dict[str, Any] = None, features: List[str] = None,
+                 model_name: str = "saved_model"):
         """
         Initialize the temperature predictor.
         
         Args:
             params: Model hyperparameters
+            features: Input columns, starting with the 'temperature' target
+                (temperature only if None)
+            model_name: File name (without extension) of the saved model
         """
         self.params = params or MODEL_PARAMS['gru']
-        self.model = None
-        self.scaler = MinMaxScaler(feature_range=(0, 1))
-        self.model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saved_model.keras")
-        self.scaler_data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scaler_data.npy")
+        self.features = features or ['temperature']
+        self._model = None
+        self._model_checked = False
+        self._model_lock = threading.Lock()
+        self._scaler = None
+        self.weights_version = 0  # Bumped whenever fit() changes the weights
+        model_dir = os.path.dirname(os.path.abspath(__file__))
+        self.model_path = os.path.join(model_dir, f"{model_name}.keras")
+        self.scaler_data_path = os.path.join(
+            model_dir, "scaler_data.npy" if model_name == "saved_model" else f"{model_name}_scaler.npy"
+        )
         
-        # Try to load pre-trained model if it exists
-        self._try_load_model()
+    @property
+    def model(self) -> Any:
+        """
+        Keras model, or None if not trained yet.
+        
+        TensorFlow is only imported and a pre-trained model only loaded the
+        first time the model is needed, so creating a predictor is cheap.
+        """
+        if not self._model_checked:
+            with self._model_lock:
+                if not self._model_checked:
+                    self._try_load_model()
+                    self._model_checked = True
+        return self._model
+        
+    @model.setter
+    def model(self, model: Any) -> None:
+        self._model = model
+        self._model_checked = True
+        
+    @property
+    def scaler(self) -> Any:
+        """Min-max scaler of the features, created on first use."""
+        if self._scaler is None:
+            from sklearn.preprocessing import MinMaxScaler
+            self._scaler = MinMaxScaler(feature_range=(0, 1))
+        return self._scaler
+        
+    @scaler.setter
+    def scaler(self, scaler: Any) -> None:
+        self._scaler = scaler
         
     def _try_load_model(self) -> None:
         """Try to load a pre-trained model if it exists."""
         try:
             if os.path.exists(self.model_path):
                 print(f"Loading pre-trained model from {self.model_path}")
-                self.model = load_model(self.model_path)
+                from tensorflow.keras.models import load_model
+                self._model = load_model(self.model_path)
                 
                 # Load scaler data if available
                 if os.path.exists(self.scaler_data_path):
@@ -51,7 +89,7 @@ class TemperaturePredictor:
                     print("Loaded scaler data")
         except Exception as e:
             print(f"Error loading model: {e}")
-            self.model = None
+            self._model = None
         
     def _create_sequences(self, data: np.ndarray, seq_length: int = 5) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -67,7 +105,7 @@ class TemperaturePredictor:
         X, y = [], []
         for i in range(len(data) - seq_length):
             X.append(data[i:i + seq_length])
-            y.append(data[i + seq_length])
+            y.append(data[i + seq_length, :1])  # Target is the first feature
         return np.array(X), np.array(y)
     
     def build_model(self, input_shape: Tuple[int, int]) -> None:
@@ -77,6 +115,9 @@ class TemperaturePredictor:
         Args:
             input_shape: Shape of input data (sequence_length, features)
         """
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import GRU, Dense
+        
         model = Sequential()
         model.add(GRU(
             units=self.params['units'],
@@ -95,20 +136,21 @@ class TemperaturePredictor:
         model.compile(optimizer='adam', loss='mse')
         self.model = model
         
-    def train(self, df: pd.DataFrame, sequence_length: int = 5) -> Dict[str, Any]:
+    def train(self, df: pd.DataFrame, sequence_length: int = 5, force: bool = False) -> Dict[str, Any]:
         """
         Train the model on temperature data.
         
         Args:
-            df: DataFrame with 'temperature' column
+            df: DataFrame with the feature columns ('temperature' by default)
             sequence_length: Length of input sequences
+            force: Whether to retrain a model that was already trained and saved
             
         Returns:
             Training history
         """
         try:
             # If model already exists and has been trained, skip training
-            if self.model is not None and os.path.exists(self.model_path):
+            if not force and self.model is not None and os.path.exists(self.model_path):
                 print("Using pre-trained model. Skipping training.")
                 return {'loss': [0], 'val_loss': [0]}
                 
@@ -116,21 +158,24 @@ class TemperaturePredictor:
             if df.empty:
                 return {'loss': [0], 'val_loss': [0]}
                 
-            # Ensure temperature column exists and has numeric values
-            if 'temperature' not in df.columns:
-                raise ValueError("DataFrame must contain 'temperature' column")
+            # Ensure feature columns exist and have numeric values
+            missing = [c for c in self.features if c not in df.columns]
+            if missing:
+                raise ValueError(f"DataFrame must contain {', '.join(missing)} column(s)")
                 
-            # Convert temperature to numeric if needed
-            df['temperature'] = pd.to_numeric(df['temperature'], errors='coerce')
+            # Convert features to numeric if needed
+            df = df.copy()
+            for column in self.features:
+                df[column] = pd.to_numeric(df[column], errors='coerce')
             
             # Drop any NaN values
-            df = df.dropna(subset=['temperature'])
+            df = df.dropna(subset=self.features)
             
             if len(df) < sequence_length + 1:
                 raise ValueError(f"Not enough data points after cleaning. Need at least {sequence_length + 1}, got {len(df)}")
             
             # Scale the data
-            data = self.scaler.fit_transform(df[['temperature']].values)
+            data = self.scaler.fit_transform(df[self.features].values)
             
             # Save scaler data for future use
             scaler_data = np.array([
@@ -156,6 +201,7 @@ class TemperaturePredictor:
                 validation_split=self.params['validation_split'],
                 verbose=1
             )
+            self.weights_version += 1
             
             # Save the trained model
             os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
@@ -188,21 +234,24 @@ class TemperaturePredictor:
             if df.empty:
                 raise ValueError("DataFrame is empty")
                 
-            # Ensure temperature column exists and has numeric values
-            if 'temperature' not in df.columns:
-                raise ValueError("DataFrame must contain 'temperature' column")
+            # Ensure feature columns exist and have numeric values
+            missing = [c for c in self.features if c not in df.columns]
+            if missing:
+                raise ValueError(f"DataFrame must contain {', '.join(missing)} column(s)")
                 
-            # Convert temperature to numeric if needed
-            df['temperature'] = pd.to_numeric(df['temperature'], errors='coerce')
+            # Convert features to numeric if needed
+            df = df.copy()
+            for column in self.features:
+                df[column] = pd.to_numeric(df[column], errors='coerce')
             
             # Drop any NaN values
-            df = df.dropna(subset=['temperature'])
+            df = df.dropna(subset=self.features)
             
             if len(df) < sequence_length:
                 raise ValueError(f"Not enough data points after cleaning. Need at least {sequence_length}, got {len(df)}")
             
             # Scale the data
-            data = self.scaler.transform(df[['temperature']].values[-sequence_length:])
+            data = self.scaler.transform(df[self.features].values[-sequence_length:])
             
             # Reshape for prediction
             X = np.array([data])
@@ -210,10 +259,10 @@ class TemperaturePredictor:
             # Make prediction
             prediction = self.model.predict(X, verbose=0)  # Set verbose=0 to avoid printing progress
             
-            # Inverse transform to get actual temperature
-            prediction_rescaled = self.scaler.inverse_transform(prediction)
+            # Inverse transform the target (first feature) to get actual temperature
+            prediction_rescaled = (prediction[0, 0] - self.scaler.min_[0]) / self.scaler.scale_[0]
             
-            return float(prediction_rescaled[0, 0])
+            return float(prediction_rescaled)
             
         except Exception as e:
             print(f"Error predicting temperature: {e}")
@@ -253,4 +302,5 @@ class TemperaturePredictor:
         if not os.path.exists(filepath):
             raise ValueError(f"Model file not found: {filepath}")
             
+        from tensorflow.keras.models import load_model
         self.model = load_model(filepath) 
\ No newline at end of file
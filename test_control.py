@@ -0,0 +1,73 @@
+"""
+Tests that the vectorized actuator control engine matches streaming use.
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.control import ControlEngine
+from config import CROP_TEMP_RANGES
+
+
+def make_readings(count=5000, seed=0):
+    """Noisy 5-minute temperature and soil moisture readings with some gaps."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=count, freq='5min').as_unit('ns')
+    temperature = 24 + 5 * np.sin(np.arange(count) / 60) + rng.normal(0, 1, count)
+    soil_moisture = 32 + 4 * np.sin(np.arange(count) / 200) + rng.normal(0, 2, count)
+    temperature[rng.choice(count, 50, replace=False)] = np.nan
+    return pd.DataFrame({'temperature': temperature, 'soil_moisture': soil_moisture}, index=index)
+
+
+def make_engine():
+    return ControlEngine.for_crop(CROP_TEMP_RANGES['Tomato'])
+
+
+def test_schedule_matches_step():
+    readings = make_readings()
+    schedule = make_engine().schedule(readings)
+
+    engine = make_engine()
+    stepped = [engine.step(timestamp, row) for timestamp, row in
+               zip(readings.index, readings.to_dict('records'))]
+    for actuator in schedule.columns:
+        expected = np.array([decisions[actuator] == 'ON' for decisions in stepped])
+        assert (schedule[actuator].to_numpy() == expected).all(), actuator
+
+
+def test_split_batches_match_one_batch():
+    readings = make_readings()
+    whole = make_engine().schedule(readings)
+
+    engine = make_engine()
+    parts = [engine.schedule(readings.iloc[start:start + 777]) for start in range(0, len(readings), 777)]
+    assert pd.concat(parts).equals(whole)
+
+
+def test_zones_match_single_series():
+    readings = [make_readings(seed=seed) for seed in range(3)]
+    engine = make_engine()
+    states, _ = engine.simulate(readings[0].index.to_numpy(), {
+        'temperature': np.stack([r['temperature'].to_numpy() for r in readings]),
+        'soil_moisture': np.stack([r['soil_moisture'].to_numpy() for r in readings])
+    })
+    for zone, zone_readings in enumerate(readings):
+        single = make_engine().schedule(zone_readings)
+        for actuator in single.columns:
+            assert (states[actuator][zone] == single[actuator].to_numpy()).all()
+
+
+def main():
+    """Run the tests."""
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"{name}: ok")
+
+if __name__ == "__main__":
+    main()
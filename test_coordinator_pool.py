@@ -0,0 +1,93 @@
+"""
+Tests for the per-session coordinator pool.
+"""
+
+import os
+import sys
+import time
+import threading
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agents.coordinator_pool import CoordinatorPool
+from agents.coordinator_agent import RESULT_CACHE_SIZE
+
+
+class SlowPredictionAgent:
+    """Stand-in prediction agent recording how many trainings overlap."""
+
+    model_version = 0
+
+    def __init__(self):
+        self.running = self.peak = 0
+        self._lock = threading.Lock()
+
+    def train(self, df):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.05)
+        with self._lock:
+            self.running -= 1
+        return {'status': 'success'}
+
+
+def daily_frame(days=30):
+    """Daily temperatures for a session's current data."""
+    return pd.DataFrame({'date': pd.date_range('2024-01-01', periods=days),
+                         'temperature': np.linspace(20, 30, days)})
+
+
+def test_sessions_train_the_shared_model_one_at_a_time():
+    pool = CoordinatorPool(warm_up=False)
+    agent = pool.resources.get('prediction_agent', SlowPredictionAgent)
+    sessions = [pool.get(f"session{i}") for i in range(4)]
+    for coordinator in sessions:
+        coordinator.current_data = daily_frame()
+
+    threads = [threading.Thread(target=coordinator.train_prediction_model) for coordinator in sessions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert agent.peak == 1
+
+
+def test_session_bytes_follow_state_changes():
+    pool = CoordinatorPool(warm_up=False)
+    pool.resources.get('prediction_agent', SlowPredictionAgent)
+    coordinator = pool.get('session')
+    df = daily_frame()
+    size = int(df.memory_usage(deep=True).sum())
+
+    coordinator.current_data = df
+    assert coordinator.session_nbytes() == size
+    for i in range(RESULT_CACHE_SIZE + 4):
+        coordinator._cached(f"result{i}", lambda: {'frame': df})
+    # Results pushed out of the memo no longer count
+    assert coordinator.session_nbytes() == size * (RESULT_CACHE_SIZE + 1)
+    coordinator.current_data = None
+    assert coordinator.session_nbytes() == size * RESULT_CACHE_SIZE
+
+
+def test_evicts_oldest_sessions_over_the_byte_cap():
+    pool = CoordinatorPool(max_bytes=8_000, warm_up=False)
+    for i in range(3):
+        pool.get(f"session{i}").current_data = daily_frame(200)
+    pool.get('session3')
+    assert pool.report()['session_bytes'] <= 8_000
+    assert 'session0' not in pool._sessions and 'session3' in pool._sessions
+
+
+def main():
+    """Run the tests."""
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"{name}: ok")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Tests for the concurrent NASA POWER fetch against the local stand-in server.
+"""
+
+import os
+import sys
+import asyncio
+import contextlib
+import io
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import POWER_HTTP_PARAMS
+from utils.nasa_data import NASAEarthdata
+from utils.power_stub_server import PowerStubServer
+
+SITES = [{'name': f"site{i}", 'lat': 10 + i, 'lon': 70 + i} for i in range(6)]
+
+
+def test_fetch_many_retries_injected_errors():
+    # Fast backoff and enough retries that every site gets through
+    http_params = dict(POWER_HTTP_PARAMS, max_retries=8, backoff_factor=0.01,
+                       requests_per_second=0)
+    with PowerStubServer(error_rate=0.3, seed=1) as server:
+        nasa = NASAEarthdata(use_cache=False, base_url=server.url, http_params=http_params)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = asyncio.run(nasa.fetch_many(SITES, days=5, max_concurrency=3))
+
+    assert set(results) == {site['name'] for site in SITES}
+    for name, df in results.items():
+        assert not isinstance(df, Exception), f"{name}: {df}"
+        assert len(df) == 6 and df['temperature'].notna().all()
+
+    stats = nasa.get_request_stats()
+    assert server.stats['errors'] > 0
+    assert stats['retries'] > 0
+    assert stats['requests'] == len(SITES)
+    assert stats['failures'] == 0
+
+
+def main():
+    """Run the tests."""
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"{name}: ok")
+
+if __name__ == "__main__":
+    main()
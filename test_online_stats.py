@@ -0,0 +1,59 @@
+"""
+Tests for the streaming temperature statistics.
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.online_stats import OnlineStats
+
+
+def test_merge_matches_single_pass():
+    rng = np.random.default_rng(0)
+    values = rng.normal(25, 3, 1000)
+    x = np.sort(rng.uniform(0, 100, 1000))
+
+    merged = OnlineStats.from_values(values[:300], x[:300])
+    merged.merge(OnlineStats.from_values(values[300:], x[300:]))
+
+    assert merged.count == len(values)
+    assert np.isclose(merged.mean, values.mean())
+    assert np.isclose(merged.variance, values.var(ddof=1))
+    assert np.isclose(merged.slope, np.polyfit(x, values, 1)[0])
+    assert merged.min == values.min() and merged.max == values.max()
+
+
+def test_add_matches_batch_update():
+    values = np.array([20.0, 21.5, 21.0, 22.0, 23.5])
+    stats = OnlineStats()
+    for value in values:
+        stats.add(value)
+    stats.add(np.nan)
+    batch = OnlineStats.from_values(values)
+    assert stats.count == batch.count == 5
+    assert np.isclose(stats.mean, batch.mean)
+    assert np.isclose(stats.slope, batch.slope)
+
+
+def test_merge_into_empty_and_with_empty():
+    stats = OnlineStats.from_values([1.0, 2.0, 3.0])
+    empty = OnlineStats()
+    empty.merge(stats)
+    stats.merge(OnlineStats())
+    assert empty.count == stats.count == 3
+    assert empty.mean == stats.mean == 2.0
+
+
+def main():
+    """Run the tests."""
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"{name}: ok")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Tests for the expiry rules of the NASA POWER response cache.
+"""
+
+import os
+import sys
+import json
+import time
+import datetime
+import tempfile
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.power_cache import PowerCache, MISSING_VALUE
+
+CELL = (12.75, 77.5)
+PARAMETERS = ['T2M']
+
+
+def days_ago(days):
+    """Date a number of days before today as YYYYMMDD."""
+    return (datetime.datetime.now() - datetime.timedelta(days=days)).strftime("%Y%m%d")
+
+
+def make_cache():
+    """Cache in a fresh temporary directory (7 revision days, 6 h TTL)."""
+    return PowerCache(tempfile.mkdtemp(), revision_days=7, recent_ttl_hours=6)
+
+
+def set_fetched_at(cache, date_str, fetched_at):
+    """Rewrite the fetch time of a cached date."""
+    path = cache._path(CELL, PARAMETERS)
+    with open(path) as f:
+        entry = json.load(f)
+    entry['fetched_at'][date_str] = fetched_at
+    with open(path, 'w') as f:
+        json.dump(entry, f)
+
+
+def test_value_fetched_after_revision_window_is_final():
+    cache = make_cache()
+    date = days_ago(30)
+    cache.store(CELL, PARAMETERS, {'T2M': {date: 21.5}}, [date])
+    # Fetched 10 days after the date, long past the TTL
+    set_fetched_at(cache, date, time.time() - 20 * 86400)
+    assert cache.missing_dates(CELL, PARAMETERS, [date]) == []
+
+
+def test_provisional_value_expires_after_leaving_revision_window():
+    cache = make_cache()
+    date = days_ago(30)
+    cache.store(CELL, PARAMETERS, {'T2M': {date: 21.5}}, [date])
+    # Fetched the day after the date, while POWER could still revise it
+    set_fetched_at(cache, date, time.time() - 29 * 86400)
+    assert cache.missing_dates(CELL, PARAMETERS, [date]) == [date]
+
+
+def test_recent_value_expires_after_ttl():
+    cache = make_cache()
+    date = days_ago(2)
+    cache.store(CELL, PARAMETERS, {'T2M': {date: 21.5}}, [date])
+    assert cache.missing_dates(CELL, PARAMETERS, [date]) == []
+    set_fetched_at(cache, date, time.time() - 7 * 3600)
+    assert cache.missing_dates(CELL, PARAMETERS, [date]) == [date]
+
+
+def test_missing_recent_value_is_not_stored():
+    cache = make_cache()
+    old, recent = days_ago(30), days_ago(1)
+    cache.store(CELL, PARAMETERS, {'T2M': {old: MISSING_VALUE, recent: MISSING_VALUE}},
+                [old, recent])
+    # The old date is final even if missing; the recent one is asked for again
+    assert cache.missing_dates(CELL, PARAMETERS, [old, recent]) == [recent]
+    assert cache.load(CELL, PARAMETERS, [old, recent]) == {'T2M': {old: MISSING_VALUE}}
+
+
+def test_dates_absent_from_response_are_not_stored():
+    cache = make_cache()
+    old, older = days_ago(30), days_ago(31)
+    cache.store(CELL, PARAMETERS, {}, [older, old])
+    assert not os.path.exists(cache._path(CELL, PARAMETERS))
+    cache.store(CELL, PARAMETERS, {'T2M': {older: 20.0}}, [older, old])
+    assert cache.missing_dates(CELL, PARAMETERS, [older, old]) == [old]
+
+
+def main():
+    """Run the tests."""
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"{name}: ok")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Tests for the NASA POWER stand-in server.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import requests
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.power_stub_server import PowerStubServer, recording_key
+
+QUERY = {'start': '20240101', 'end': '20240105', 'latitude': '12.5', 'longitude': '77.5',
+         'parameters': 'T2M,GWETROOT', 'format': 'JSON'}
+
+
+def test_synthetic_response():
+    with PowerStubServer(port=0, recordings_dir=tempfile.mkdtemp()) as server:
+        response = requests.get(server.url, params=QUERY, timeout=10)
+
+    assert response.status_code == 200
+    parameters = response.json()['properties']['parameter']
+    assert set(parameters) == {'T2M', 'GWETROOT'}
+    assert list(parameters['T2M']) == ['20240101', '20240102', '20240103', '20240104', '20240105']
+    assert all(0 <= value <= 1 for value in parameters['GWETROOT'].values())
+    assert server.stats['synthetic'] == 1
+
+
+def test_replays_recorded_response():
+    recordings_dir = tempfile.mkdtemp()
+    body = {'properties': {'parameter': {'T2M': {'20240101': 21.5}}}}
+    with open(os.path.join(recordings_dir, f"{recording_key(QUERY)}.json"), 'w') as f:
+        json.dump(body, f)
+
+    with PowerStubServer(port=0, recordings_dir=recordings_dir) as server:
+        # The API key does not change which recording is served
+        response = requests.get(server.url, params=dict(QUERY, api_key='secret'), timeout=10)
+
+    assert response.json() == body
+    assert server.stats['replayed'] == 1 and server.stats['synthetic'] == 0
+
+
+def test_injected_errors():
+    with PowerStubServer(port=0, recordings_dir=tempfile.mkdtemp(), error_rate=1.0,
+                         error_status=429) as server:
+        response = requests.get(server.url, params=QUERY, timeout=10)
+        missing_dates = requests.get(server.url, params={'latitude': '1'}, timeout=10)
+
+    assert response.status_code == 429
+    assert missing_dates.status_code == 422
+    assert server.stats['errors'] == 1 and server.stats['requests'] == 2
+
+
+def test_record_then_replay():
+    recordings_dir = tempfile.mkdtemp()
+    # A replay server with its own empty recordings stands in for the real API
+    with PowerStubServer(port=0, recordings_dir=tempfile.mkdtemp()) as upstream:
+        with PowerStubServer(mode='record', port=0, recordings_dir=recordings_dir,
+                             upstream_url=upstream.url) as recorder:
+            recorded = requests.get(recorder.url, params=QUERY, timeout=10)
+    assert recorded.status_code == 200
+    assert recorder.stats['recorded'] == 1 and upstream.stats['synthetic'] == 1
+
+    with PowerStubServer(port=0, recordings_dir=recordings_dir) as server:
+        replayed = requests.get(server.url, params=QUERY, timeout=10)
+    assert replayed.content == recorded.content
+    assert server.stats['replayed'] == 1
+
+
+def main():
+    """Run the tests."""
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"{name}: ok")
+
+if __name__ == "__main__":
+    main()
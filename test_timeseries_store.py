@@ -0,0 +1,83 @@
+"""
+Tests for appending to the memory-mapped sensor store.
+"""
+
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.timeseries_store import SensorStore
+
+
+def readings(start, values):
+    """Two float32 columns of 5-minute readings starting at a time."""
+    index = pd.date_range(start, periods=len(values), freq='5min')
+    values = np.asarray(values, dtype=np.float32)
+    return pd.DataFrame({'temperature': values, 'humidity': values * 10}, index=index)
+
+
+def test_append_and_range():
+    store = SensorStore(tempfile.mkdtemp())
+    store.append(readings('2024-01-01', [1, 2, 3]))
+    store.append(readings('2024-01-02', [4, 5]))
+
+    df = SensorStore(store.directory).range('2024-01-01 00:05', '2024-01-02 00:00')
+    assert list(df['temperature']) == [2, 3, 4]
+    assert list(df['humidity']) == [20, 30, 40]
+
+
+def test_append_discards_bytes_of_interrupted_append():
+    store = SensorStore(tempfile.mkdtemp())
+    store.append(readings('2024-01-01', [1, 2, 3]))
+
+    # An append that wrote one column file but was never committed
+    with open(store._column_path('temperature'), 'ab') as f:
+        f.write(np.float32([99, 99]).tobytes())
+
+    store.append(readings('2024-01-02', [4, 5]))
+    df = SensorStore(store.directory).range()
+    assert list(df['temperature']) == [1, 2, 3, 4, 5]
+    assert list(df['humidity']) == [10, 20, 30, 40, 50]
+    assert os.path.getsize(store._column_path('temperature')) == 5 * 4
+
+
+def test_append_drops_rows_older_than_last_timestamp():
+    store = SensorStore(tempfile.mkdtemp())
+    store.append(readings('2024-01-02', [1, 2]))
+    assert store.append(readings('2024-01-01', [3])) == 0
+    assert len(store) == 2
+
+
+def test_append_drops_repeated_last_timestamp():
+    store = SensorStore(tempfile.mkdtemp())
+    store.append(readings('2024-01-01', [1, 2]))
+    assert store.append(readings('2024-01-01 00:05', [3, 4])) == 1
+    assert list(store.range()['temperature']) == [1, 2, 4]
+
+
+def test_append_keeps_rows_committed_by_another_writer():
+    directory = tempfile.mkdtemp()
+    first, second = SensorStore(directory), SensorStore(directory)
+    first.append(readings('2024-01-01', [1, 2]))
+    # The second writer has not refreshed since the first one committed
+    second.append(readings('2024-01-02', [3]))
+
+    df = SensorStore(directory).range()
+    assert list(df['temperature']) == [1, 2, 3]
+    assert list(df['humidity']) == [10, 20, 30]
+
+
+def main():
+    """Run the tests."""
+    for name, test in sorted(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"{name}: ok")
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,13 @@
 Utilities module initialization.
 """
 
-from .nasa_data import NASAEarthdata
+from .nasa_data import NASAEarthdata, NASADataError
 from .llm_assistant import LLMAssistant
+from .iot_data import IoTDataLoader
 
 __all__ = [
     'NASAEarthdata',
-    'LLMAssistant'
+    'NASADataError',
+    'LLMAssistant',
+    'IoTDataLoader'
 ] 
\ No newline at end of file
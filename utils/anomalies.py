@@ -0,0 +1,135 @@
+"""
+Rolling robust z-score (median / MAD) anomaly detection over sensor readings.
+"""
+
+import os
+import sys
+from typing import Dict, List, Optional, Any
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path so we can import the config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import ANOMALY_PARAMS
+
+# Sensors scored by default
+ANOMALY_COLUMNS = ['temperature', 'humidity', 'water_level']
+
+# Scale factor making the MAD a consistent estimator of the standard deviation
+MAD_SCALE = 1.4826
+
+
+class AnomalyDetector:
+    """
+    Flags readings that deviate strongly from their recent history.
+
+    Each reading is compared with the median of the `window` readings
+    before it, scaled by the rolling median absolute deviation (MAD) of
+    those readings from their own medians. Windows are trailing, so a
+    reading is only judged on the past and streaming batches score exactly
+    like a full-history pass.
+    """
+
+    def __init__(self, columns: List[str] = ANOMALY_COLUMNS, window: int = ANOMALY_PARAMS['window'],
+                 min_periods: int = ANOMALY_PARAMS['min_periods'],
+                 threshold: float = ANOMALY_PARAMS['threshold'],
+                 min_scale: Optional[Dict[str, float]] = None):
+        """
+        Initialize the detector.
+
+        Args:
+            columns: Sensor columns to score
+            window: Number of past readings each reading is compared with
+            min_periods: Readings needed before scores are produced
+            threshold: Absolute robust z-score above which a reading is anomalous
+            min_scale: Lower bound of the MAD per column, so near-constant
+                sensors do not flag every small change
+        """
+        self.columns = columns
+        self.window = window
+        self.min_periods = min_periods
+        self.threshold = threshold
+        self.min_scale = min_scale if min_scale is not None else ANOMALY_PARAMS['min_scale']
+        self._history = None
+
+    def score(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score a whole time-ordered history in one vectorized pass.
+
+        Args:
+            df: Readings sorted by time with the detector's columns
+
+        Returns:
+            Frame on df's index with <column>_z and <column>_anomaly for each
+            column and an overall 'anomaly' flag
+        """
+        values = df[self.columns].astype(np.float64)
+
+        # Trailing median of the previous readings and the deviation from it
+        median = values.rolling(self.window, min_periods=self.min_periods).median().shift(1)
+        deviation = values - median
+        mad = deviation.abs().rolling(self.window, min_periods=self.min_periods).median().shift(1)
+
+        scale = mad * MAD_SCALE
+        floor = pd.Series({c: self.min_scale.get(c, 0.0) for c in self.columns})
+        scale = scale.clip(lower=floor, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = (deviation / scale).replace([np.inf, -np.inf], np.nan)
+
+        result = pd.DataFrame(index=df.index)
+        for column in self.columns:
+            result[f"{column}_z"] = z[column].to_numpy(dtype=np.float32)
+            result[f"{column}_anomaly"] = (z[column].abs() > self.threshold).to_numpy()
+        result['anomaly'] = result[[f"{c}_anomaly" for c in self.columns]].any(axis=1)
+        return result
+
+    def update(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score a batch of new readings in streaming mode.
+
+        Only the last two windows of history are kept, which is all the
+        rolling median and MAD of the next reading depend on.
+
+        Args:
+            batch: New readings sorted by time, following the previous batch
+
+        Returns:
+            Scores of the batch rows, as returned by score()
+        """
+        if batch.empty:
+            return self.score(batch)
+
+        batch = batch[self.columns]
+        if self._history is not None:
+            combined = pd.concat([self._history, batch])
+        else:
+            combined = batch
+        scores = self.score(combined).iloc[-len(batch):]
+        self._history = combined.iloc[-2 * self.window - 1:]
+        return scores
+
+    def reset(self) -> None:
+        """Forget the streaming history."""
+        self._history = None
+
+
+def summarize_anomalies(scores: pd.DataFrame, limit: int = 20) -> Dict[str, Any]:
+    """
+    Summarize anomaly scores for display.
+
+    Args:
+        scores: Output of AnomalyDetector.score or update
+        limit: Number of most recent anomalous readings to list
+
+    Returns:
+        Dictionary with the number of readings, anomaly counts per column
+        and the most recent anomalous readings
+    """
+    columns = [c[:-len('_anomaly')] for c in scores.columns if c.endswith('_anomaly')]
+    flagged = scores[scores['anomaly']] if 'anomaly' in scores else scores.iloc[:0]
+    return {
+        'readings': len(scores),
+        'anomalies': int(len(flagged)),
+        'counts': {c: int(scores[f"{c}_anomaly"].sum()) for c in columns},
+        'recent': flagged.tail(limit)
+    }
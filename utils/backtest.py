@@ -0,0 +1,205 @@
+"""
+Vectorized backtesting of threshold actuator rules against recorded actuator states.
+"""
+
+import os
+import sys
+from typing import Dict, Any
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path so we can import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.iot_data import decode_actuators
+
+# Rule per recorded actuator: the sensor it reacts to, whether it switches
+# ON above or below the threshold, and the default threshold. The fan uses
+# the crop's maximum temperature plus the 1°C margin of
+# EnvironmentalAgent.get_recommendations, the watering pump its 30%
+# moisture threshold (applied to humidity), the water pump refills the tank.
+ACTUATOR_RULES = {
+    'fan': {'sensor': 'temperature', 'direction': 'above', 'threshold': None},
+    'watering_pump': {'sensor': 'humidity', 'direction': 'below', 'threshold': 30.0},
+    'water_pump': {'sensor': 'water_level', 'direction': 'below', 'threshold': 50.0}
+}
+
+# Margin above the crop's maximum temperature at which the fan switches ON
+FAN_MARGIN = 1.0
+
+
+def default_thresholds(max_temp: float) -> Dict[str, float]:
+    """
+    Get the thresholds of the current rule set for a crop.
+
+    Args:
+        max_temp: Maximum ideal temperature of the crop
+
+    Returns:
+        Mapping of actuator to threshold
+    """
+    thresholds = {actuator: rule['threshold'] for actuator, rule in ACTUATOR_RULES.items()}
+    thresholds['fan'] = max_temp + FAN_MARGIN
+    return thresholds
+
+
+class _ActuatorSeries:
+    """Sorted views of one sensor and recorded actuator used to score any threshold."""
+
+    def __init__(self, values: np.ndarray, recorded: np.ndarray, direction: str):
+        valid = ~np.isnan(values)
+        self.values = values[valid]
+        self.recorded = recorded[valid]
+        self.direction = direction
+        self.count = len(self.values)
+
+        # Values while the actuator was recorded ON / OFF, sorted
+        self.on_values = np.sort(self.values[self.recorded])
+        self.off_values = np.sort(self.values[~self.recorded])
+
+        # Consecutive readings switch the rule's output exactly when the
+        # threshold falls between their two values
+        self.pair_low = np.sort(np.minimum(self.values[:-1], self.values[1:]))
+        self.pair_high = np.sort(np.maximum(self.values[:-1], self.values[1:]))
+
+        self.recorded_duty = float(self.recorded.mean()) if self.count else np.nan
+        self.recorded_switches = int(np.count_nonzero(self.recorded[1:] != self.recorded[:-1]))
+
+    def score(self, thresholds: np.ndarray) -> Dict[str, np.ndarray]:
+        """Agreement, ON count and switch count for many thresholds at once."""
+        if self.direction == 'above':
+            # ON when value > t
+            side = 'right'
+            on_agree = len(self.on_values) - np.searchsorted(self.on_values, thresholds, side)
+            off_agree = np.searchsorted(self.off_values, thresholds, side)
+            on_count = on_agree + len(self.off_values) - off_agree
+        else:
+            # ON when value < t
+            side = 'left'
+            on_agree = np.searchsorted(self.on_values, thresholds, side)
+            off_agree = len(self.off_values) - np.searchsorted(self.off_values, thresholds, side)
+            on_count = on_agree + len(self.off_values) - off_agree
+
+        switches = (np.searchsorted(self.pair_low, thresholds, side)
+                    - np.searchsorted(self.pair_high, thresholds, side))
+        return {
+            'agreement': (on_agree + off_agree) / max(self.count, 1),
+            'duty_cycle': on_count / max(self.count, 1),
+            'switches': switches
+        }
+
+
+class ActuatorBacktester:
+    """
+    Replays threshold rules over a recorded sensor history.
+
+    Every metric of a rule is a count over sorted arrays, so a threshold is
+    scored with a few binary searches instead of a pass over the readings,
+    and thousands of thresholds are scored at once.
+    """
+
+    def __init__(self, readings: pd.DataFrame):
+        """
+        Prepare a history for backtesting.
+
+        Args:
+            readings: Time-sorted frame indexed by datetime64 'date' with the
+                rule sensors and the 'actuator_state' bitfield
+        """
+        self.readings = readings
+        recorded = decode_actuators(readings['actuator_state'])
+        index = readings.index
+        self.days = max((index[-1] - index[0]) / pd.Timedelta(days=1), 1e-9) if len(index) > 1 else np.nan
+        self.series = {
+            actuator: _ActuatorSeries(readings[rule['sensor']].to_numpy(dtype=np.float64),
+                                      recorded[actuator].to_numpy(), rule['direction'])
+            for actuator, rule in ACTUATOR_RULES.items()
+        }
+
+    def replay(self, thresholds: Dict[str, float]) -> pd.DataFrame:
+        """
+        Get the rule decisions for every reading next to the recorded states.
+
+        Args:
+            thresholds: Mapping of actuator to threshold
+
+        Returns:
+            Frame indexed like the readings with <actuator> (rule output) and
+            <actuator>_recorded boolean columns
+        """
+        recorded = decode_actuators(self.readings['actuator_state'])
+        result = pd.DataFrame(index=self.readings.index)
+        for actuator, threshold in thresholds.items():
+            rule = ACTUATOR_RULES[actuator]
+            values = self.readings[rule['sensor']].to_numpy(dtype=np.float64)
+            result[actuator] = values > threshold if rule['direction'] == 'above' else values < threshold
+            result[f"{actuator}_recorded"] = recorded[actuator].to_numpy()
+        return result
+
+    def evaluate(self, thresholds: Dict[str, float]) -> Dict[str, Dict[str, float]]:
+        """
+        Score one rule set.
+
+        Args:
+            thresholds: Mapping of actuator to threshold
+
+        Returns:
+            Mapping of actuator to agreement, duty cycle, switches per day and
+            the recorded duty cycle and switches per day for comparison
+        """
+        report = {}
+        for actuator, threshold in thresholds.items():
+            series = self.series[actuator]
+            scores = series.score(np.array([threshold], dtype=np.float64))
+            report[actuator] = {
+                'threshold': float(threshold),
+                'agreement': float(scores['agreement'][0]),
+                'duty_cycle': float(scores['duty_cycle'][0]),
+                'switches_per_day': float(scores['switches'][0] / self.days),
+                'recorded_duty_cycle': series.recorded_duty,
+                'recorded_switches_per_day': series.recorded_switches / self.days
+            }
+        return report
+
+    def sweep(self, grid: Dict[str, Any], combine: bool = False) -> pd.DataFrame:
+        """
+        Score many thresholds per actuator at once.
+
+        Args:
+            grid: Mapping of actuator to an array of thresholds
+            combine: Whether to return every combination of the actuators'
+                thresholds with the mean agreement, instead of one row per
+                actuator and threshold
+
+        Returns:
+            Frame with actuator, threshold, agreement, duty_cycle and
+            switches_per_day columns, or one row per combination with a
+            <actuator>_threshold and <actuator>_agreement column per actuator
+            and the mean_agreement, sorted best first
+        """
+        per_actuator = {}
+        for actuator, thresholds in grid.items():
+            thresholds = np.asarray(thresholds, dtype=np.float64)
+            scores = self.series[actuator].score(thresholds)
+            per_actuator[actuator] = pd.DataFrame({
+                'actuator': actuator,
+                'threshold': thresholds,
+                'agreement': scores['agreement'],
+                'duty_cycle': scores['duty_cycle'],
+                'switches_per_day': scores['switches'] / self.days
+            })
+
+        if not combine:
+            return pd.concat(per_actuator.values(), ignore_index=True)
+
+        # Actuators are independent, so a combination's metrics are those of
+        # its thresholds; only the index grid is built
+        actuators = list(per_actuator)
+        grids = np.meshgrid(*[np.arange(len(per_actuator[a])) for a in actuators], indexing='ij')
+        combos = pd.DataFrame(index=pd.RangeIndex(grids[0].size))
+        for actuator, positions in zip(actuators, grids):
+            frame = per_actuator[actuator]
+            positions = positions.ravel()
+            combos[f"{actuator}_threshold"] = frame['threshold'].to_numpy()[positions]
+            combos[f"{actuator}_agreement"] = frame['agreement'].to_numpy()[positions]
+        combos['mean_agreement'] = combos[[f"{a}_agreement" for a in actuators]].mean(axis=1)
+        return combos.sort_values('mean_agreement', ascending=False, kind='stable').reset_index(drop=True)
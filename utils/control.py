@@ -0,0 +1,314 @@
+"""
+Stateful actuator control with hysteresis and minimum ON/OFF dwell times.
+"""
+
+import os
+import sys
+from typing import Dict, List, Tuple, Any, Optional
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path so we can import the config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CONTROL_PARAMS
+
+# Marker for an actuator that has not switched yet (no dwell time to honour)
+NO_SWITCH = np.iinfo(np.int64).min
+
+
+class ControlRule:
+    """Compiled hysteresis rule of one actuator."""
+
+    def __init__(self, actuator: str, sensor: str, direction: str, on_threshold: float,
+                 off_threshold: float, min_on: Any = 0, min_off: Any = 0):
+        """
+        Create a rule.
+
+        Args:
+            actuator: Actuator name
+            sensor: Reading column the actuator reacts to
+            direction: 'above' to switch ON above on_threshold and OFF below
+                off_threshold, 'below' for the reverse
+            on_threshold: Value past which the actuator switches ON
+            off_threshold: Value past which it switches back OFF
+            min_on: Minimum time the actuator stays ON (Timedelta or string)
+            min_off: Minimum time the actuator stays OFF (Timedelta or string)
+        """
+        if direction not in ('above', 'below'):
+            raise ValueError(f"Unknown rule direction: {direction}")
+        if (on_threshold < off_threshold) if direction == 'above' else (on_threshold > off_threshold):
+            raise ValueError(f"{actuator}: OFF threshold must be on the other side of the deadband")
+
+        self.actuator = actuator
+        self.sensor = sensor
+        self.direction = direction
+        self.on_threshold = float(on_threshold)
+        self.off_threshold = float(off_threshold)
+        self.min_on = pd.Timedelta(min_on).value
+        self.min_off = pd.Timedelta(min_off).value
+
+    def triggers(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get where readings would switch the actuator ON and OFF.
+
+        Args:
+            values: Sensor readings (NaN never triggers)
+
+        Returns:
+            Tuple of (on_trigger, off_trigger) boolean arrays
+        """
+        if self.direction == 'above':
+            return values > self.on_threshold, values < self.off_threshold
+        return values < self.on_threshold, values > self.off_threshold
+
+
+def compile_rules(crop_range: Tuple[float, float],
+                  params: Optional[Dict[str, Dict[str, Any]]] = None) -> List[ControlRule]:
+    """
+    Compile the control settings for a crop.
+
+    Args:
+        crop_range: (min, max) ideal temperature of the crop
+        params: Settings per actuator (CONTROL_PARAMS if None)
+
+    Returns:
+        List of rules, one per actuator
+    """
+    params = params or CONTROL_PARAMS
+    min_temp, max_temp = crop_range
+    rules = []
+    for actuator, settings in params.items():
+        deadband = settings.get('deadband', 0.0)
+        if actuator == 'fan':
+            on, direction = max_temp + settings.get('margin', 0.0), 'above'
+        elif actuator == 'heater':
+            on, direction = min_temp - settings.get('margin', 0.0), 'below'
+        else:
+            on, direction = settings['threshold'], settings.get('direction', 'below')
+        off = on - deadband if direction == 'above' else on + deadband
+        rules.append(ControlRule(actuator, settings['sensor'], direction, on, off,
+                                 settings.get('min_on', 0), settings.get('min_off', 0)))
+    return rules
+
+
+def _next_index(mask: np.ndarray) -> np.ndarray:
+    """Index of the first True at or after each position (len(mask) if none), with a trailing sentinel."""
+    n = len(mask)
+    positions = np.where(mask, np.arange(n), n)
+    following = np.minimum.accumulate(positions[::-1])[::-1]
+    return np.append(following, n)
+
+
+class ControlEngine:
+    """
+    Evaluates actuator rules over a timeline, keeping each actuator's state.
+
+    An actuator switches ON when its sensor passes the ON threshold and only
+    switches back OFF once the sensor is past the OFF threshold on the other
+    side of the deadband and it has been ON for at least min_on (likewise for
+    min_off). The vectorized path finds, for every reading, the next reading
+    that could switch the actuator ON or OFF and where each dwell time ends;
+    it then jumps from one switch to the next, so the cost of the Python loop
+    is the number of switches rather than the number of readings.
+    """
+
+    def __init__(self, rules: List[ControlRule]):
+        """
+        Create an engine.
+
+        Args:
+            rules: Compiled rules (see compile_rules)
+        """
+        self.rules = {rule.actuator: rule for rule in rules}
+        self.reset()
+
+    @classmethod
+    def for_crop(cls, crop_range: Tuple[float, float],
+                 params: Optional[Dict[str, Dict[str, Any]]] = None) -> 'ControlEngine':
+        """
+        Create an engine with the rules of a crop.
+
+        Args:
+            crop_range: (min, max) ideal temperature of the crop
+            params: Settings per actuator (CONTROL_PARAMS if None)
+
+        Returns:
+            ControlEngine instance
+        """
+        return cls(compile_rules(crop_range, params))
+
+    def reset(self) -> None:
+        """Switch every actuator OFF and forget when it last switched."""
+        self.state = {actuator: {'on': False, 'since': NO_SWITCH} for actuator in self.rules}
+
+    def _run_rule(self, rule: ControlRule, timestamps: np.ndarray, values: np.ndarray,
+                  on: bool, since: int, on_release: np.ndarray,
+                  off_release: np.ndarray) -> Tuple[np.ndarray, bool, int]:
+        """Evaluate one rule over one series; returns the states and the final (on, since)."""
+        n = len(values)
+        on_trigger, off_trigger = rule.triggers(values)
+        next_on = _next_index(on_trigger)
+        next_off = _next_index(off_trigger)
+
+        # Carried-over dwell time of the previous batch
+        if since == NO_SWITCH:
+            position = 0
+        else:
+            position = int(np.searchsorted(timestamps, since + (rule.min_on if on else rule.min_off)))
+
+        start_on = on
+        switches = []
+        while position < n:
+            index = int(next_off[position] if on else next_on[position])
+            if index >= n:
+                break
+            switches.append(index)
+            on = not on
+            position = max(int(on_release[index] if on else off_release[index]), index + 1)
+
+        toggles = np.zeros(n, dtype=np.int8)
+        toggles[switches] = 1
+        states = (np.cumsum(toggles) + int(start_on)) % 2 == 1
+        if switches:
+            since = int(timestamps[switches[-1]])
+        return states, on, since
+
+    def simulate(self, timestamps: Any, sensors: Dict[str, Any],
+                 state: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[Dict[str, np.ndarray], Dict[str, Dict[str, Any]]]:
+        """
+        Evaluate every rule over whole arrays of readings.
+
+        Args:
+            timestamps: Sorted datetime64 timestamps of the readings, shape (n,)
+            sensors: Mapping of sensor name to readings shaped (n,), or
+                (zones, n) to run several zones sharing the timestamps
+            state: Starting state per actuator, {'on': bool or array per
+                zone, 'since': int ns or array per zone}; all OFF if None
+
+        Returns:
+            Tuple of (states, final_state): boolean ON arrays per actuator
+            shaped like the sensor readings, and the state to pass to the next
+            call. Actuators whose sensor is missing are left out.
+        """
+        timestamps = np.asarray(timestamps, dtype='datetime64[ns]').view(np.int64)
+        outputs, final = {}, {}
+        for actuator, rule in self.rules.items():
+            if rule.sensor not in sensors:
+                continue
+            values = np.asarray(sensors[rule.sensor], dtype=np.float64)
+            zones = np.atleast_2d(values)
+
+            # Where a dwell time that starts at each reading ends
+            on_release = np.searchsorted(timestamps, timestamps + rule.min_on)
+            off_release = np.searchsorted(timestamps, timestamps + rule.min_off)
+
+            start = (state or {}).get(actuator, {'on': False, 'since': NO_SWITCH})
+            start_on = np.broadcast_to(start['on'], len(zones))
+            start_since = np.broadcast_to(start['since'], len(zones))
+
+            states = np.empty(zones.shape, dtype=bool)
+            end_on = np.empty(len(zones), dtype=bool)
+            end_since = np.empty(len(zones), dtype=np.int64)
+            for zone, series in enumerate(zones):
+                states[zone], end_on[zone], end_since[zone] = self._run_rule(
+                    rule, timestamps, series, bool(start_on[zone]), int(start_since[zone]),
+                    on_release, off_release)
+
+            outputs[actuator] = states.reshape(values.shape)
+            if values.ndim == 1:
+                final[actuator] = {'on': bool(end_on[0]), 'since': int(end_since[0])}
+            else:
+                final[actuator] = {'on': end_on, 'since': end_since}
+        return outputs, final
+
+    def schedule(self, readings: pd.DataFrame) -> pd.DataFrame:
+        """
+        Evaluate the rules over a batch of readings, continuing from the
+        engine's state so consecutive batches give the same result as one.
+
+        Args:
+            readings: Time-sorted frame indexed by datetime64 'date' with the
+                rule sensors
+
+        Returns:
+            Frame indexed like the readings with a boolean ON column per actuator
+        """
+        sensors = {column: readings[column].to_numpy() for column in readings.columns}
+        states, final = self.simulate(readings.index.to_numpy(), sensors, self.state)
+        self.state.update(final)
+        return pd.DataFrame(states, index=readings.index)
+
+    def step(self, timestamp: Any, reading: Dict[str, float]) -> Dict[str, str]:
+        """
+        Evaluate the rules for a single new reading.
+
+        Args:
+            timestamp: Time of the reading
+            reading: Mapping of sensor name to value
+
+        Returns:
+            Dictionary mapping each actuator to 'ON' or 'OFF'
+        """
+        now = pd.Timestamp(timestamp).value
+        decisions = {}
+        for actuator, rule in self.rules.items():
+            state = self.state[actuator]
+            value = reading.get(rule.sensor)
+            if value is not None and not np.isnan(value):
+                dwell = rule.min_on if state['on'] else rule.min_off
+                ready = state['since'] == NO_SWITCH or now >= state['since'] + dwell
+                on_trigger, off_trigger = rule.triggers(np.float64(value))
+                if ready and (off_trigger if state['on'] else on_trigger):
+                    state['on'], state['since'] = not state['on'], now
+            decisions[actuator] = 'ON' if state['on'] else 'OFF'
+        return decisions
+
+
+def switch_events(schedule: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn a schedule of actuator states into a list of switch events.
+
+    Args:
+        schedule: Output of ControlEngine.schedule
+
+    Returns:
+        Frame with date, actuator and state ('ON'/'OFF') columns, one row per
+        switch, sorted by time
+    """
+    events = []
+    for actuator in schedule.columns:
+        states = schedule[actuator].to_numpy()
+        changed = np.flatnonzero(states[1:] != states[:-1]) + 1
+        if len(states) and states[0]:
+            changed = np.insert(changed, 0, 0)
+        events.append(pd.DataFrame({
+            'date': schedule.index[changed],
+            'actuator': actuator,
+            'state': np.where(states[changed], 'ON', 'OFF')
+        }))
+    if not events:
+        return pd.DataFrame(columns=['date', 'actuator', 'state'])
+    return pd.concat(events, ignore_index=True).sort_values('date', kind='stable').reset_index(drop=True)
+
+
+def summarize_schedule(schedule: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """
+    Summarize how much each actuator runs and how often it switches.
+
+    Args:
+        schedule: Output of ControlEngine.schedule
+
+    Returns:
+        Mapping of actuator to duty cycle, number of switches and switches per day
+    """
+    days = (schedule.index[-1] - schedule.index[0]) / pd.Timedelta(days=1) if len(schedule) > 1 else np.nan
+    summary = {}
+    for actuator in schedule.columns:
+        states = schedule[actuator].to_numpy()
+        switches = int(np.count_nonzero(states[1:] != states[:-1]))
+        summary[actuator] = {
+            'duty_cycle': float(states.mean()) if len(states) else np.nan,
+            'switches': switches,
+            'switches_per_day': switches / days if days else np.nan
+        }
+    return summary
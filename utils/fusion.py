@@ -0,0 +1,80 @@
+"""
+Fusion of high-frequency greenhouse sensor readings with daily NASA POWER data.
+"""
+
+from typing import List, Optional, Any
+import pandas as pd
+
+# Outdoor POWER columns joined to the sensor readings
+OUTDOOR_COLUMNS = ['temperature', 'temperature_max', 'temperature_min',
+                   'precipitation', 'humidity', 'soil_moisture']
+
+# Prefix of the joined outdoor columns
+OUTDOOR_PREFIX = 'outdoor_'
+
+# Daily features used to train the temperature model on fused data
+# (the indoor temperature, the prediction target, comes first)
+FUSED_FEATURES = ['temperature', 'humidity', 'outdoor_temperature', 'outdoor_humidity',
+                  'outdoor_soil_moisture']
+
+
+def fuse_sensor_power(sensors: pd.DataFrame, power: pd.DataFrame, tolerance: Any = '1D',
+                      direction: str = 'backward',
+                      columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Attach the daily outdoor POWER values to each sensor reading.
+
+    Both inputs are sorted once and combined with a sorted as-of join, so
+    the cost is O(n + m) and no reading-by-day cross product is built. With
+    the default backward direction a reading gets the POWER row of its own
+    day (dated midnight), or nothing if that day is further back than the
+    tolerance.
+
+    Args:
+        sensors: Sensor readings indexed by datetime64 'date'
+        power: POWER frame with a 'date' column and OUTDOOR_COLUMNS
+        tolerance: Maximum distance between a reading and its POWER row
+        direction: 'backward', 'forward' or 'nearest' (see pd.merge_asof)
+        columns: POWER columns to join (those of OUTDOOR_COLUMNS present if None)
+
+    Returns:
+        Sensor readings with outdoor_<column> columns and the indoor-outdoor
+        temperature difference, indexed by 'date'
+    """
+    if columns is None:
+        columns = [c for c in OUTDOOR_COLUMNS if c in power.columns]
+
+    left = sensors
+    if not left.index.is_monotonic_increasing:
+        left = left.sort_index(kind='stable')
+    left = left.reset_index()
+    left['date'] = left['date'].astype('datetime64[ns]')
+
+    right = power[['date'] + columns].rename(columns={c: f"{OUTDOOR_PREFIX}{c}" for c in columns})
+    right = right.assign(date=pd.to_datetime(right['date']).astype('datetime64[ns]'))
+    right = right.dropna(subset=['date']).sort_values('date', kind='stable')
+
+    fused = pd.merge_asof(left, right, on='date', direction=direction,
+                          tolerance=pd.Timedelta(tolerance))
+
+    if 'temperature' in fused.columns and f"{OUTDOOR_PREFIX}temperature" in fused.columns:
+        fused['temperature_delta'] = fused['temperature'] - fused[f"{OUTDOOR_PREFIX}temperature"]
+
+    return fused.set_index('date')
+
+
+def daily_features(fused: pd.DataFrame, features: List[str] = FUSED_FEATURES) -> pd.DataFrame:
+    """
+    Aggregate fused readings to daily means for the temperature model.
+
+    Args:
+        fused: Output of fuse_sensor_power
+        features: Columns to keep
+
+    Returns:
+        Frame with a 'date' column and the daily mean of each feature, for
+        days where every feature is present
+    """
+    features = [c for c in features if c in fused.columns]
+    daily = fused[features].resample('1D').mean()
+    return daily.dropna().reset_index()
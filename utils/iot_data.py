@@ -0,0 +1,172 @@
+"""
+Chunked streaming ingestion of greenhouse IoT sensor CSV exports.
+"""
+
+import os
+import sys
+from typing import Iterator, Optional, Dict
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path so we can import the config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import IOT_DATA_PATH
+
+# Sensor columns in the export and their normalised names
+SENSOR_COLUMNS = {
+    'tempreature': 'temperature',  # Misspelled in the export
+    'temperature': 'temperature',
+    'humidity': 'humidity',
+    'water_level': 'water_level'
+}
+
+# Soil nutrient columns (0-255 readings)
+NUTRIENT_COLUMNS = ['N', 'P', 'K']
+
+# Bits of the actuator state bitfield and the one-hot ON column for each
+ACTUATOR_BITS = {
+    'fan': 1,
+    'watering_pump': 2,
+    'water_pump': 4
+}
+ACTUATOR_COLUMNS = {
+    'fan': 'Fan_actuator_ON',
+    'watering_pump': 'Watering_plant_pump_ON',
+    'water_pump': 'Water_pump_actuator_ON'
+}
+
+# Columns of the ingested frame (indexed by datetime64 'date')
+IOT_COLUMNS = ['temperature', 'humidity', 'water_level'] + NUTRIENT_COLUMNS + ['actuator_state']
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class IoTDataLoader:
+    """
+    Streams IoT sensor CSV files in chunks with compact dtypes.
+
+    Sensors are stored as float32, N/P/K as uint8 and the six one-hot
+    *_actuator_ON/OFF columns are collapsed into one uint8 bitfield
+    (see ACTUATOR_BITS), so a reading takes 16 bytes plus its timestamp.
+    """
+
+    def __init__(self, chunksize: int = 100_000):
+        """
+        Initialize the loader.
+
+        Args:
+            chunksize: Number of CSV rows parsed per chunk
+        """
+        self.chunksize = chunksize
+
+    def _read_options(self, path: str) -> Dict:
+        """Build read_csv options for the columns present in the file header."""
+        return self.read_options(pd.read_csv(path, nrows=0).columns)
+
+    def read_options(self, header) -> Dict:
+        """
+        Build read_csv options for a file with the given header columns.
+
+        Args:
+            header: Column names of the export
+
+        Returns:
+            Keyword arguments for pd.read_csv
+        """
+        usecols = ['date'] + [c for c in header if c in SENSOR_COLUMNS or c in NUTRIENT_COLUMNS]
+        usecols += [c for c in ACTUATOR_COLUMNS.values() if c in header]
+
+        # Parse straight into compact dtypes; the OFF columns are never read
+        dtype = {c: np.float32 for c in usecols if c != 'date'}
+        return {'usecols': usecols, 'dtype': dtype}
+
+    def iter_chunks(self, path: str = IOT_DATA_PATH) -> Iterator[pd.DataFrame]:
+        """
+        Stream a sensor CSV as compact frames, one chunk at a time.
+
+        Peak memory depends on the chunk size only, not on the file size.
+
+        Args:
+            path: Path of the CSV export
+
+        Yields:
+            Frames with IOT_COLUMNS indexed by datetime64 'date', in file order
+        """
+        options = self._read_options(path)
+        for chunk in pd.read_csv(path, chunksize=self.chunksize, **options):
+            yield self.normalise(chunk)
+
+    def normalise(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert a raw chunk of the export to the compact layout.
+
+        Args:
+            chunk: Raw rows with the export's column names
+
+        Returns:
+            Frame with IOT_COLUMNS indexed by datetime64 'date'
+        """
+        result = pd.DataFrame(index=pd.DatetimeIndex(
+            pd.to_datetime(chunk['date'], format=DATE_FORMAT, errors='coerce'), name='date'
+        ))
+
+        for raw, column in SENSOR_COLUMNS.items():
+            if raw in chunk.columns:
+                result[column] = chunk[raw].to_numpy(dtype=np.float32)
+
+        for column in NUTRIENT_COLUMNS:
+            if column in chunk.columns:
+                values = chunk[column].to_numpy(dtype=np.float32)
+                result[column] = np.clip(np.nan_to_num(values), 0, 255).astype(np.uint8)
+
+        state = np.zeros(len(chunk), dtype=np.uint8)
+        for actuator, column in ACTUATOR_COLUMNS.items():
+            if column in chunk.columns:
+                on = chunk[column].to_numpy(dtype=np.float32) > 0.5
+                state |= np.where(on, ACTUATOR_BITS[actuator], 0).astype(np.uint8)
+        result['actuator_state'] = state
+
+        result = result.reindex(columns=IOT_COLUMNS)
+        return result[result.index.notna()]
+
+    def load(self, path: str = IOT_DATA_PATH, start: Optional[str] = None,
+             end: Optional[str] = None) -> pd.DataFrame:
+        """
+        Load a sensor CSV into a single compact frame sorted by time.
+
+        Args:
+            path: Path of the CSV export
+            start: Only keep readings at or after this time (optional)
+            end: Only keep readings at or before this time (optional)
+
+        Returns:
+            Frame with IOT_COLUMNS indexed by datetime64 'date'
+        """
+        chunks = []
+        for chunk in self.iter_chunks(path):
+            if start is not None:
+                chunk = chunk[chunk.index >= pd.Timestamp(start)]
+            if end is not None:
+                chunk = chunk[chunk.index <= pd.Timestamp(end)]
+            if not chunk.empty:
+                chunks.append(chunk)
+
+        if not chunks:
+            return pd.DataFrame(columns=IOT_COLUMNS, index=pd.DatetimeIndex([], name='date'))
+
+        return pd.concat(chunks).sort_index(kind='stable')
+
+
+def decode_actuators(state: pd.Series) -> pd.DataFrame:
+    """
+    Expand an actuator state bitfield into one boolean column per actuator.
+
+    Args:
+        state: uint8 actuator_state values
+
+    Returns:
+        Frame with a boolean column per actuator in ACTUATOR_BITS
+    """
+    values = np.asarray(state, dtype=np.uint8)
+    return pd.DataFrame({actuator: (values & bit) != 0 for actuator, bit in ACTUATOR_BITS.items()},
+                        index=getattr(state, 'index', None))
@@ -3,24 +3,354 @@ Utility functions for fetching and processing NASA Earth data.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
 import datetime
+import itertools
+import json
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse
 import numpy as np
 import pandas as pd
-import xarray as xr
-from typing import Tuple, Dict, List, Optional
+from typing import Tuple, Dict, List, Optional, Any, Iterator
 import sys
 import os
 
 # Add the project root to the path so we can import the config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import NASA_API_KEY
+from config import (NASA_API_KEY, NASA_POWER_URL, NASA_POWER_PARAMETERS, NASA_POWER_GRID,
+                    NASA_POWER_VIEW_TTL, POWER_HTTP_PARAMS)
+from utils.power_cache import PowerCache
+
+# Mapping of NASA POWER parameters to DataFrame columns
+POWER_COLUMN_MAP = {
+    'T2M': 'temperature',
+    'T2M_MAX': 'temperature_max',
+    'T2M_MIN': 'temperature_min',
+    'PRECTOTCORR': 'precipitation',
+    'RH2M': 'humidity',
+    'GWETROOT': 'soil_moisture',
+    'GWETPROF': 'soil_moisture',
+    'GWETTOP': 'soil_moisture'
+}
+
+# Soil moisture parameters in order of preference
+SOIL_MOISTURE_PARAMETERS = ['GWETROOT', 'GWETPROF', 'GWETTOP']
+
+# Columns of the combined POWER DataFrame
+POWER_COLUMNS = ['date', 'temperature', 'temperature_max', 'temperature_min',
+                 'precipitation', 'humidity', 'soil_moisture']
+
+
+class NASADataError(Exception):
+    """Raised when NASA POWER data cannot be fetched."""
+
+
+def create_power_session(params: Dict[str, Any] = None) -> requests.Session:
+    """
+    Create a pooled keep-alive HTTP session for the NASA POWER API.
+    
+    Connection errors and 429/5xx responses are retried with exponential
+    backoff, honouring any Retry-After header.
+    
+    Args:
+        params: HTTP client settings (POWER_HTTP_PARAMS if None)
+        
+    Returns:
+        Configured requests session
+    """
+    params = params or POWER_HTTP_PARAMS
+    retry = Retry(
+        total=params['max_retries'],
+        backoff_factor=params['backoff_factor'],
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET'],
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=params['pool_size'],
+        pool_maxsize=params['pool_size'],
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class HostRateLimiter:
+    """Thread-safe limiter spacing out requests to the same host."""
+    
+    def __init__(self, requests_per_second: float):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            requests_per_second: Maximum request rate per host (0 disables limiting)
+        """
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {}
+        
+    def acquire(self, url: str) -> None:
+        """
+        Block until a request to the host of the URL is allowed.
+        
+        Args:
+            url: Request URL
+        """
+        if not self.interval:
+            return
+            
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into a single execution."""
+    
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._lock = threading.Lock()
+        self._calls = {}
+        
+    def do(self, key: Any, func, *args) -> Tuple[Any, bool]:
+        """
+        Run func(*args) unless a call with the same key is already running,
+        in which case wait for that call and return its result.
+        
+        Args:
+            key: Hashable key identifying the call
+            func: Function to run
+            *args: Arguments for func
+            
+        Returns:
+            Tuple of (result, shared) where shared is True if the result came
+            from another caller's execution
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        
+        if not leader:
+            return future.result(), True
+        
+        try:
+            result = func(*args)
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+def power_grid_cell(lat: Any, lon: Any) -> Tuple[Any, Any]:
+    """
+    Snap coordinates to the centre of the NASA POWER grid cell containing them.
+    
+    Args:
+        lat: Latitude, or array of latitudes
+        lon: Longitude, or array of longitudes
+        
+    Returns:
+        Tuple of (lat, lon) of the grid cell centre, as floats for scalar
+        input and arrays for array input
+    """
+    lat_step, lon_step = NASA_POWER_GRID
+    cell_lat = np.round(np.round((np.asarray(lat) + 90) / lat_step) * lat_step - 90, 4)
+    cell_lon = np.round(np.round((np.asarray(lon) + 180) / lon_step) * lon_step - 180, 4)
+    if cell_lat.ndim == 0:
+        return float(cell_lat), float(cell_lon)
+    return cell_lat, cell_lon
+
+
+def _parse_parameter_values(values: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert one POWER parameter dict into date and value arrays in bulk.
+    
+    Args:
+        values: Mapping of YYYYMMDD date string to value
+        
+    Returns:
+        Tuple of (datetime64 dates, float64 values) with missing values as NaN
+    """
+    if 'units' in values:  # Skip the units entry
+        values = {k: v for k, v in values.items() if k != 'units'}
+    
+    dates = pd.to_datetime(pd.Index(list(values.keys()), dtype=object), format="%Y%m%d",
+                           errors='coerce').to_numpy()
+    try:
+        data = np.fromiter(values.values(), dtype=np.float64, count=len(values))
+    except (ValueError, TypeError):
+        # Mixed or malformed values: coerce the bad ones to NaN
+        data = pd.to_numeric(pd.Series(list(values.values()), dtype=object),
+                             errors='coerce').to_numpy(dtype=np.float64)
+    
+    # -999 is NASA's missing data indicator
+    data[data == -999] = np.nan
+    
+    valid = ~np.isnat(dates)
+    if not valid.all():
+        print(f"Skipping {int((~valid).sum())} values with invalid dates")
+        dates, data = dates[valid], data[valid]
+    
+    return dates, data
+
+
+def parse_power_parameters(parameters: Dict[str, Dict[str, float]]) -> pd.DataFrame:
+    """
+    Parse the parameter section of a POWER response into a columnar DataFrame.
+    
+    Each parameter is converted with vectorized date parsing and missing
+    value masking instead of a per-row loop.
+    
+    Args:
+        parameters: Mapping of POWER parameter name to {date_str: value}
+        
+    Returns:
+        DataFrame with POWER_COLUMNS, one row per date with any valid value
+    """
+    # Use GWETROOT (root zone soil moisture, fraction 0-1) and fall back
+    # to GWETPROF (profile) and GWETTOP (top soil layer) if not available
+    moisture_param = next(
+        (p for p in SOIL_MOISTURE_PARAMETERS if parameters.get(p)), None
+    )
+    
+    index = None
+    aligned = True
+    columns = {}
+    for param, column in POWER_COLUMN_MAP.items():
+        if column == 'soil_moisture' and param != moisture_param:
+            continue
+        if not parameters.get(param):
+            continue
+        
+        dates, data = _parse_parameter_values(parameters[param])
+        if column == 'soil_moisture':
+            # Convert fraction to percentage (0-100%)
+            data = data * 100.0
+        
+        if index is None:
+            index = dates
+        elif aligned and not np.array_equal(index, dates):
+            aligned = False
+        columns[column] = (dates, data)
+    
+    if not columns:
+        return pd.DataFrame(columns=POWER_COLUMNS)
+    
+    if aligned:
+        # Common case: every parameter covers the same dates in the same order
+        df = pd.DataFrame({column: data for column, (_, data) in columns.items()},
+                          index=pd.DatetimeIndex(index))
+    else:
+        df = pd.concat({column: pd.Series(data, index=dates)
+                        for column, (dates, data) in columns.items()}, axis=1)
+    
+    df = df.reindex(columns=POWER_COLUMNS[1:]).dropna(how='all')
+    if df.empty:
+        return pd.DataFrame(columns=POWER_COLUMNS)
+    
+    # Sort by date
+    return df.sort_index().rename_axis('date').reset_index()
+
+
+def area_grid_cells(lat: float, lon: float, radius: float,
+                    samples: int = 101) -> List[Tuple[Tuple[float, float], float]]:
+    """
+    Find the NASA POWER grid cells intersecting a circle and their area weights.
+    
+    The circle is sampled on a regular grid of points, and each cell's weight
+    is the fraction of sample points falling inside it.
+    
+    Args:
+        lat: Latitude of the circle centre
+        lon: Longitude of the circle centre
+        radius: Radius in km
+        samples: Number of sample points along each axis
+        
+    Returns:
+        List of ((cell_lat, cell_lon), weight) with weights summing to 1
+    """
+    if radius <= 0:
+        return [(power_grid_cell(lat, lon), 1.0)]
+    
+    # Sample points of the circle on a local flat approximation (km offsets)
+    offsets = np.linspace(-radius, radius, samples)
+    dx, dy = np.meshgrid(offsets, offsets)
+    inside = dx ** 2 + dy ** 2 <= radius ** 2
+    point_lat = lat + dy[inside] / 110.574
+    point_lon = lon + dx[inside] / (111.320 * np.cos(np.radians(lat)))
+    
+    # Snap every sample point to its grid cell and count points per cell
+    cell_lat, cell_lon = power_grid_cell(point_lat, point_lon)
+    cells, counts = np.unique(np.column_stack([cell_lat, cell_lon]), axis=0, return_counts=True)
+    
+    weights = counts / counts.sum()
+    return [((float(c_lat), float(c_lon)), float(w)) for (c_lat, c_lon), w in zip(cells, weights)]
+
 
 class NASAEarthdata:
     """Class to handle NASA Earthdata API requests and data processing."""
     
-    def __init__(self, api_key: str = NASA_API_KEY):
-        """Initialize with NASA API key for open data access."""
+    def __init__(self, api_key: str = NASA_API_KEY, cache: Optional[PowerCache] = None,
+                 use_cache: bool = True, session: Optional[requests.Session] = None,
+                 http_params: Dict[str, Any] = None, base_url: str = NASA_POWER_URL):
+        """
+        Initialize with NASA API key for open data access.
+        
+        Args:
+            api_key: NASA API key
+            cache: Response cache to use (a default on-disk cache if None)
+            use_cache: Whether to cache POWER responses at all
+            session: HTTP session to use (a pooled session with retries if None)
+            http_params: HTTP client settings (POWER_HTTP_PARAMS if None)
+            base_url: NASA POWER daily point endpoint (e.g. a local stand-in server)
+        """
         self.api_key = api_key
+        self.base_url = base_url
+        self.cache = (cache or PowerCache()) if use_cache else None
+        
+        # Shared keep-alive session so repeated calls reuse the TLS connection
+        self.http_params = http_params or POWER_HTTP_PARAMS
+        self.session = session or create_power_session(self.http_params)
+        self.timeout = (self.http_params['connect_timeout'], self.http_params['read_timeout'])
+        self.rate_limiter = HostRateLimiter(self.http_params['requests_per_second'])
+        
+        # Per-request latency counters
+        self._stats_lock = threading.Lock()
+        self.request_stats = {
+            'requests': 0,
+            'failures': 0,
+            'retries': 0,
+            'total_latency': 0.0,
+            'max_latency': 0.0,
+            'last_latency': None,
+            'coalesced': 0
+        }
+        
+        # Coalesces concurrent requests for the same grid cell and date range
+        self._in_flight = SingleFlight()
+        
+        # Last combined frame fetched for get_lst_data / get_soil_moisture
+        self._view_lock = threading.Lock()
+        self._last_view = None
         
         # For NASA Earth Data API v1
         self.headers = {
@@ -32,10 +362,11 @@ class NASAEarthdata:
             "api_key": self.api_key
         }
         
-    def get_lst_data(self, lat: float, lon: float, radius: float, 
-                     days: int = 6) -> pd.DataFrame:
+    def fetch_power_data(self, lat: float, lon: float, radius: float,
+                         days: int = 6) -> pd.DataFrame:
         """
-        Get Land Surface Temperature data for a location using NASA POWER API.
+        Get temperature and soil moisture data for a location in a single
+        NASA POWER API request. Dates already in the cache are not refetched.
         
         Args:
             lat: Latitude
@@ -44,93 +375,216 @@ class NASAEarthdata:
             days: Number of days of historical data
             
         Returns:
-            DataFrame with date and temperature data
+            DataFrame with date, temperature, temperature_max, temperature_min,
+            precipitation, humidity and soil_moisture columns
+            
+        Raises:
+            NASADataError: If the request fails after all retries
         """
         # Calculate date range
         end_date = datetime.datetime.now()
         start_date = end_date - datetime.timedelta(days=days)
+        dates = pd.date_range(start_date.date(), end_date.date(), freq='D').strftime("%Y%m%d").tolist()
+        
+        parameters = self._get_parameters(lat, lon, dates)
+        
+        if not any(parameters.values()):
+            print("No data found in the response")
+            return pd.DataFrame(columns=POWER_COLUMNS)
+        
+        return self._build_power_frame(parameters)
+    
+    def resolve_grid_cell(self, lat: float, lon: float) -> Tuple[float, float]:
+        """
+        Resolve coordinates to the NASA POWER grid cell serving them.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            
+        Returns:
+            Tuple of (lat, lon) of the grid cell centre
+        """
+        return power_grid_cell(lat, lon)
+    
+    def final_dates(self, lat: float, lon: float, dates: List[str]) -> List[str]:
+        """
+        Get the dates whose fetched values POWER will no longer revise.
+        
+        Values served from the cache may have been fetched while POWER could
+        still revise them, and those are left out. Without a cache every
+        value was just fetched, so all the given dates are final.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            dates: Dates older than the revision window as YYYYMMDD strings
+            
+        Returns:
+            Sorted list of final dates
+        """
+        if self.cache is None:
+            return sorted(dates)
+        return self.cache.final_dates(self.resolve_grid_cell(lat, lon), NASA_POWER_PARAMETERS, dates)
+    
+    def _get_parameters(self, lat: float, lon: float, dates: List[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Get POWER parameter values for a list of dates, using the cache if enabled.
+        
+        Coordinates are snapped to their grid cell, and concurrent calls for
+        the same cell and date range share a single fetch.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            dates: Consecutive dates as YYYYMMDD strings
+            
+        Returns:
+            Mapping of POWER parameter name to {date_str: value}
+        """
+        cell = self.resolve_grid_cell(lat, lon)
+        key = (cell, dates[0], dates[-1])
+        result, shared = self._in_flight.do(key, self._get_cell_parameters, cell, dates)
+        if shared:
+            print(f"Reusing in-flight NASA POWER request for grid cell {cell}")
+            with self._stats_lock:
+                self.request_stats['coalesced'] += 1
+        return result
+    
+    def _get_cell_parameters(self, cell: Tuple[float, float], dates: List[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Get POWER parameter values for a grid cell.
+        
+        Only the span of dates missing from the cache is requested; the
+        fetched values are stored and then stitched to the cached ones.
         
-        # Format dates for API
-        start_str = start_date.strftime("%Y%m%d")
-        end_str = end_date.strftime("%Y%m%d")
+        Args:
+            cell: Grid cell (lat, lon) centre
+            dates: Consecutive dates as YYYYMMDD strings
+            
+        Returns:
+            Mapping of POWER parameter name to {date_str: value}
+        """
+        lat, lon = cell
+        if self.cache is None:
+            return self._request_parameters(lat, lon, dates[0], dates[-1])
+        
+        missing = self.cache.missing_dates(cell, NASA_POWER_PARAMETERS, dates)
+        fetched = {}
         
-        # Use NASA POWER API which is open and doesn't require authentication
-        base_url = "https://power.larc.nasa.gov/api/temporal/daily/point"
+        if missing:
+            fetched = self._request_parameters(lat, lon, missing[0], missing[-1])
+            fetched_dates = dates[dates.index(missing[0]):dates.index(missing[-1]) + 1]
+            self.cache.store(cell, NASA_POWER_PARAMETERS, fetched, fetched_dates)
+        else:
+            print(f"Using cached NASA POWER data for grid cell {cell}")
         
-        # Build parameters
+        # Provisional values the cache did not keep still belong in this response
+        result = self.cache.load(cell, NASA_POWER_PARAMETERS, dates)
+        for param, values in fetched.items():
+            for date_str, value in values.items():
+                result.setdefault(param, {}).setdefault(date_str, value)
+        return result
+    
+    def _request_parameters(self, lat: float, lon: float, start: str, end: str) -> Dict[str, Dict[str, float]]:
+        """
+        Request all POWER parameters for a date range.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            start: Start date as YYYYMMDD
+            end: End date as YYYYMMDD
+            
+        Returns:
+            Mapping of POWER parameter name to {date_str: value}
+            
+        Raises:
+            NASADataError: If the request fails after all retries
+        """
+        # Build parameters - all temperature and soil moisture parameters at once
         params = {
-            "start": start_str,
-            "end": end_str,
+            "start": start,
+            "end": end,
             "latitude": lat,
             "longitude": lon,
             "community": "AG",  # Agricultural community
-            "parameters": "T2M,T2M_MAX,T2M_MIN",  # Temperature parameters
+            "parameters": ",".join(NASA_POWER_PARAMETERS),
             "format": "JSON",
             **self.api_params  # Add API key if needed
         }
         
+        # Make API request to NASA POWER
+        print(f"Fetching NASA POWER data at coordinates ({lat}, {lon}) from {start} to {end}")
+        self.rate_limiter.acquire(self.base_url)
+        started = time.perf_counter()
         try:
-            # Make API request to NASA POWER
-            print(f"Fetching NASA POWER temperature data at coordinates ({lat}, {lon})")
-            response = requests.get(base_url, params=params, headers=self.headers)
+            response = self.session.get(self.base_url, params=params, headers=self.headers,
+                                        timeout=self.timeout)
             response.raise_for_status()
             
             # Process the response
             data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            self._record_request(time.perf_counter() - started, failed=True)
+            raise NASADataError(f"NASA POWER request failed: {e}") from e
+        
+        retries = getattr(getattr(response, 'raw', None), 'retries', None)
+        self._record_request(time.perf_counter() - started, failed=False,
+                             retries=len(retries.history) if retries is not None else 0)
+        
+        if 'properties' not in data or 'parameter' not in data['properties']:
+            return {}
+        
+        return data['properties']['parameter']
+    
+    def _record_request(self, latency: float, failed: bool, retries: int = 0) -> None:
+        """Update the per-request latency counters."""
+        with self._stats_lock:
+            self.request_stats['requests'] += 1
+            self.request_stats['failures'] += int(failed)
+            self.request_stats['retries'] += retries
+            self.request_stats['total_latency'] += latency
+            self.request_stats['max_latency'] = max(self.request_stats['max_latency'], latency)
+            self.request_stats['last_latency'] = latency
+    
+    def get_request_stats(self) -> Dict[str, Any]:
+        """
+        Get NASA POWER request counters.
+        
+        Returns:
+            Dictionary with request, failure and retry counts and latencies in seconds
+        """
+        with self._stats_lock:
+            stats = dict(self.request_stats)
+        stats['mean_latency'] = stats['total_latency'] / stats['requests'] if stats['requests'] else None
+        return stats
+    
+    def _build_power_frame(self, parameters: Dict[str, Dict[str, float]]) -> pd.DataFrame:
+        """
+        Build a single frame from the parameter section of a POWER response.
+        
+        Args:
+            parameters: Mapping of POWER parameter name to {date_str: value}
             
-            if 'properties' not in data or 'parameter' not in data['properties']:
-                print("No temperature data found in the response")
-                return pd.DataFrame(columns=['date', 'temperature'])
-            
-            # Extract temperature data
-            temp_data = data['properties']['parameter']
-            
-            # Create lists for date and temperature
-            dates = []
-            temperatures = []
-            
-            # Process each date in the response
-            for date_str, values in temp_data.get('T2M', {}).items():
-                if date_str != 'units':  # Skip the units entry
-                    try:
-                        # Parse the date
-                        date = datetime.datetime.strptime(date_str, "%Y%m%d")
-                        # Get temperature in Celsius (POWER data is already in Celsius)
-                        temp = float(values)
-                        
-                        # Skip invalid temperature values (-999 is NASA's missing data indicator)
-                        if temp == -999:
-                            continue
-                        
-                        dates.append(date)
-                        temperatures.append(temp)
-                    except (ValueError, TypeError) as e:
-                        print(f"Error processing date {date_str}: {e}")
-            
-            # Create DataFrame
-            if dates and temperatures:
-                df = pd.DataFrame({
-                    'date': dates,
-                    'temperature': temperatures
-                })
-                
-                # Sort by date
-                df = df.sort_values('date')
-                
-                return df
-            else:
-                print("No temperature data could be extracted")
-                return pd.DataFrame(columns=['date', 'temperature'])
-            
-        except Exception as e:
-            print(f"Error fetching NASA temperature data: {e}")
-            # Return empty DataFrame with correct columns
-            return pd.DataFrame(columns=['date', 'temperature'])
+        Returns:
+            DataFrame with one row per date and one column per variable
+        """
+        df = parse_power_parameters(parameters)
+        
+        if df.empty:
+            print("No data could be extracted")
+        
+        return df
     
-    def get_soil_moisture(self, lat: float, lon: float, radius: float, 
-                         days: int = 6) -> pd.DataFrame:
+    def fetch_area_data(self, lat: float, lon: float, radius: float,
+                        days: int = 6) -> pd.DataFrame:
         """
-        Get soil moisture data for a location using NASA POWER API.
+        Get POWER data aggregated over every grid cell within the radius.
+        
+        Cells are fetched concurrently through a bounded worker pool, so the
+        latency stays close to that of a single request. Values are averaged
+        with weights proportional to each cell's area inside the radius.
         
         Args:
             lat: Latitude
@@ -139,98 +593,269 @@ class NASAEarthdata:
             days: Number of days of historical data
             
         Returns:
-            DataFrame with date and soil moisture data
+            DataFrame with POWER_COLUMNS holding the area-weighted mean plus
+            <column>_spread columns holding the weighted standard deviation
+            across cells and a cells column with the number of cells
+            
+        Raises:
+            NASADataError: If no cell could be fetched
         """
-        # Calculate date range
-        end_date = datetime.datetime.now()
-        start_date = end_date - datetime.timedelta(days=days)
+        cells = area_grid_cells(lat, lon, radius)
+        print(f"Fetching NASA POWER data for {len(cells)} grid cells within {radius} km of ({lat}, {lon})")
         
-        # Format dates for API
-        start_str = start_date.strftime("%Y%m%d")
-        end_str = end_date.strftime("%Y%m%d")
+        frames, weights = [], []
+        max_workers = min(len(cells), self.http_params['max_concurrency'])
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.fetch_power_data, cell_lat, cell_lon, 0, days): weight
+                for (cell_lat, cell_lon), weight in cells
+            }
+            errors = []
+            for future, weight in futures.items():
+                try:
+                    df = future.result()
+                except NASADataError as e:
+                    errors.append(e)
+                    continue
+                if not df.empty:
+                    frames.append(df.set_index('date'))
+                    weights.append(weight)
         
-        # Use NASA POWER API which is open and doesn't require authentication
-        base_url = "https://power.larc.nasa.gov/api/temporal/daily/point"
+        if not frames:
+            if errors:
+                raise NASADataError(f"No grid cell within {radius} km could be fetched: {errors[0]}")
+            return pd.DataFrame(columns=POWER_COLUMNS)
+        if errors:
+            print(f"Skipping {len(errors)} grid cells that could not be fetched")
         
-        # Build parameters - use soil moisture parameters
-        params = {
-            "start": start_str,
-            "end": end_str,
-            "latitude": lat,
-            "longitude": lon,
-            "community": "AG",  # Agricultural community
-            "parameters": "PRECTOTCORR,RH2M,GWETPROF,GWETROOT,GWETTOP",  # Soil moisture related parameters
-            "format": "JSON",
-            **self.api_params  # Add API key if needed
-        }
+        # Stack every column into a (dates x cells) matrix
+        dates = frames[0].index
+        for df in frames[1:]:
+            dates = dates.union(df.index)
+        weight_row = np.asarray(weights)[np.newaxis, :]
+        
+        result = {}
+        for column in POWER_COLUMNS[1:]:
+            values = np.column_stack([df[column].reindex(dates).to_numpy(dtype=float) for df in frames])
+            valid = ~np.isnan(values)
+            w = np.where(valid, weight_row, 0.0)
+            total = w.sum(axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = (np.where(valid, values, 0.0) * w).sum(axis=1) / total
+                variance = (np.where(valid, values - mean[:, np.newaxis], 0.0) ** 2 * w).sum(axis=1) / total
+            result[column] = mean
+            result[f"{column}_spread"] = np.sqrt(variance)
+        
+        df = pd.DataFrame(result, index=dates)
+        df['cells'] = len(frames)
+        return df.rename_axis('date').reset_index()
+    
+    def backfill(self, lat: float, lon: float, start: datetime.date, end: datetime.date,
+                 chunk_days: int = 365, max_concurrency: Optional[int] = None,
+                 checkpoint_path: Optional[str] = None) -> Iterator[Tuple[str, str, pd.DataFrame]]:
+        """
+        Fetch a long date range as chunks, yielding each parsed chunk as it arrives.
+        
+        Chunks are fetched with bounded concurrency, so at most
+        max_concurrency responses are held in memory at once. If a checkpoint
+        file is given, each chunk is recorded there once the consumer has
+        processed it, and a rerun skips the chunks already recorded.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            start: First date of the range
+            end: Last date of the range
+            chunk_days: Number of days per request
+            max_concurrency: Maximum number of chunks fetched at once
+                (POWER_HTTP_PARAMS['max_concurrency'] if None)
+            checkpoint_path: JSON file recording completed chunks (optional)
+            
+        Yields:
+            Tuples of (chunk_start, chunk_end, DataFrame) in completion order,
+            with dates as YYYYMMDD strings
+            
+        Raises:
+            NASADataError: If a chunk fails after all retries
+        """
+        cell_lat, cell_lon = self.resolve_grid_cell(lat, lon)
+        
+        # Split the range into chunks
+        chunks = []
+        chunk_start = pd.Timestamp(start)
+        while chunk_start <= pd.Timestamp(end):
+            chunk_end = min(chunk_start + pd.Timedelta(days=chunk_days - 1), pd.Timestamp(end))
+            chunks.append((chunk_start.strftime("%Y%m%d"), chunk_end.strftime("%Y%m%d")))
+            chunk_start = chunk_end + pd.Timedelta(days=1)
+        
+        # Skip chunks completed by a previous run
+        completed = set()
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            with open(checkpoint_path, 'r') as f:
+                completed = {tuple(chunk) for chunk in json.load(f).get('completed', [])}
+        pending = [chunk for chunk in chunks if chunk not in completed]
+        print(f"Backfilling {len(pending)} of {len(chunks)} chunks for grid cell ({cell_lat}, {cell_lon})")
         
+        def fetch_chunk(chunk: Tuple[str, str]) -> pd.DataFrame:
+            return parse_power_parameters(self._request_parameters(cell_lat, cell_lon, *chunk))
+        
+        max_concurrency = max_concurrency or self.http_params['max_concurrency']
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
         try:
-            # Make API request to NASA POWER
-            print(f"Fetching NASA POWER soil moisture data at coordinates ({lat}, {lon})")
-            response = requests.get(base_url, params=params, headers=self.headers)
-            response.raise_for_status()
+            queue = iter(pending)
+            in_flight = {}
+            for chunk in itertools.islice(queue, max_concurrency):
+                in_flight[executor.submit(fetch_chunk, chunk)] = chunk
             
-            # Process the response
-            data = response.json()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = in_flight.pop(future)
+                    df = future.result()
+                    
+                    # Keep the window full before handing the chunk to the consumer
+                    for next_chunk in itertools.islice(queue, 1):
+                        in_flight[executor.submit(fetch_chunk, next_chunk)] = next_chunk
+                    
+                    yield chunk[0], chunk[1], df
+                    
+                    if checkpoint_path:
+                        completed.add(chunk)
+                        self._write_checkpoint(checkpoint_path, completed)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _write_checkpoint(self, path: str, completed: set) -> None:
+        """Atomically write the set of completed backfill chunks."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'completed': sorted(completed)}, f)
+        os.replace(tmp_path, path)
+    
+    def fetch_merged_data(self, lat: float, lon: float, radius: float,
+                          days: int = 6) -> pd.DataFrame:
+        """
+        Fetch, process and gap-fill data for one location.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            radius: Radius in km
+            days: Number of days of historical data
             
-            if 'properties' not in data or 'parameter' not in data['properties']:
-                print("No soil moisture data found in the response")
-                return pd.DataFrame(columns=['date', 'soil_moisture'])
+        Returns:
+            DataFrame in the same schema as merge_datasets produces
             
-            # Extract soil moisture data - use GWETROOT (Root zone soil moisture)
-            # GWETROOT is the fraction of soil moisture in the root zone (0-1)
-            moisture_data = data['properties']['parameter'].get('GWETROOT', {})
+        Raises:
+            NASADataError: If the request fails after all retries
+        """
+        df = self.fetch_power_data(lat, lon, radius, days)
+        df = self.process_temperature_data(df)
+        return self.fill_missing_values(df)
+    
+    async def fetch_many(self, sites: List[Dict[str, Any]], days: int = 6,
+                         max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Fetch data for many sites concurrently.
+        
+        Each site is fetched on a worker thread using the shared session, so
+        requests overlap while the cache, retries and per-host rate limit
+        still apply.
+        
+        Args:
+            sites: List of dicts with 'lat', 'lon' and optional 'name' and 'radius'
+            days: Number of days of historical data
+            max_concurrency: Maximum number of sites fetched at once
+                (POWER_HTTP_PARAMS['max_concurrency'] if None)
             
-            if not moisture_data or moisture_data == {}:
-                # Try GWETPROF (Soil moisture profile) if GWETROOT is not available
-                moisture_data = data['properties']['parameter'].get('GWETPROF', {})
-                
-            if not moisture_data or moisture_data == {}:
-                # Try GWETTOP (Top soil layer moisture) as last resort
-                moisture_data = data['properties']['parameter'].get('GWETTOP', {})
-            
-            # Create lists for date and soil moisture
-            dates = []
-            moisture_values = []
-            
-            # Process each date in the response
-            for date_str, value in moisture_data.items():
-                if date_str != 'units':  # Skip the units entry
-                    try:
-                        # Parse the date
-                        date = datetime.datetime.strptime(date_str, "%Y%m%d")
-                        
-                        # Skip invalid moisture values (-999 is NASA's missing data indicator)
-                        if float(value) == -999:
-                            continue
-                        
-                        # Convert fraction to percentage (0-100%)
-                        moisture = float(value) * 100.0
-                        
-                        dates.append(date)
-                        moisture_values.append(moisture)
-                    except (ValueError, TypeError) as e:
-                        print(f"Error processing date {date_str}: {e}")
-            
-            # Create DataFrame
-            if dates and moisture_values:
-                df = pd.DataFrame({
-                    'date': dates,
-                    'soil_moisture': moisture_values
-                })
-                
-                # Sort by date
-                df = df.sort_values('date')
-                
-                return df
-            else:
-                print("No soil moisture data could be extracted")
-                return pd.DataFrame(columns=['date', 'soil_moisture'])
+        Returns:
+            Mapping of site name to its merged DataFrame, or to the exception
+            raised while fetching it
+        """
+        max_concurrency = max_concurrency or self.http_params['max_concurrency']
+        semaphore = asyncio.Semaphore(max_concurrency)
+        loop = asyncio.get_running_loop()
+        
+        # Dedicated workers so concurrency does not depend on the default executor size
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            async def fetch_site(site: Dict[str, Any]) -> pd.DataFrame:
+                async with semaphore:
+                    return await loop.run_in_executor(
+                        executor, self.fetch_merged_data,
+                        site['lat'], site['lon'], site.get('radius', 0), days
+                    )
             
-        except Exception as e:
+            names = [site.get('name', f"{site['lat']},{site['lon']}") for site in sites]
+            results = await asyncio.gather(*(fetch_site(site) for site in sites), return_exceptions=True)
+        
+        return dict(zip(names, results))
+    
+    def _view_frame(self, lat: float, lon: float, radius: float, days: int) -> pd.DataFrame:
+        """
+        Get the combined POWER frame that the single-variable views slice.
+        
+        The last frame is reused for NASA_POWER_VIEW_TTL seconds, so calling
+        get_lst_data and then get_soil_moisture for the same window makes a
+        single request even when the response cache is off. Concurrent
+        calls for the same window share one fetch.
+        """
+        key = (self.resolve_grid_cell(lat, lon), days, datetime.date.today())
+        with self._view_lock:
+            last = self._last_view
+        if last is not None and last[0] == key and time.monotonic() - last[1] < NASA_POWER_VIEW_TTL:
+            return last[2]
+        
+        df, _ = self._in_flight.do(('view',) + key, self.fetch_power_data, lat, lon, radius, days)
+        with self._view_lock:
+            self._last_view = (key, time.monotonic(), df)
+        return df
+    
+    def get_lst_data(self, lat: float, lon: float, radius: float, 
+                     days: int = 6) -> pd.DataFrame:
+        """
+        Get Land Surface Temperature data for a location using NASA POWER API.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            radius: Radius in km
+            days: Number of days of historical data
+            
+        Returns:
+            DataFrame with date and temperature data
+        """
+        try:
+            df = self._view_frame(lat, lon, radius, days)
+        except NASADataError as e:
+            print(f"Error fetching NASA temperature data: {e}")
+            # Return empty DataFrame with correct columns
+            return pd.DataFrame(columns=['date', 'temperature'])
+        return df[['date', 'temperature']].dropna(subset=['temperature']).reset_index(drop=True)
+    
+    def get_soil_moisture(self, lat: float, lon: float, radius: float, 
+                         days: int = 6) -> pd.DataFrame:
+        """
+        Get soil moisture data for a location using NASA POWER API.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            radius: Radius in km
+            days: Number of days of historical data
+            
+        Returns:
+            DataFrame with date and soil moisture data
+        """
+        try:
+            df = self._view_frame(lat, lon, radius, days)
+        except NASADataError as e:
             print(f"Error fetching NASA soil moisture data: {e}")
             # Return empty DataFrame with correct columns
             return pd.DataFrame(columns=['date', 'soil_moisture'])
+        return df[['date', 'soil_moisture']].dropna(subset=['soil_moisture']).reset_index(drop=True)
         
     def process_temperature_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -315,4 +940,19 @@ class NASAEarthdata:
         except Exception as e:
             print(f"Error merging datasets: {e}")
             # If merge fails, return the temperature DataFrame as fallback
-            return temp_df 
\ No newline at end of file
+            return temp_df
+        
+    def fill_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fill gaps in a combined POWER DataFrame the same way merge_datasets does.
+        
+        Args:
+            df: Combined DataFrame from fetch_power_data
+            
+        Returns:
+            DataFrame sorted by date with missing values filled
+        """
+        if df.empty:
+            return df
+            
+        return df.sort_values('date').ffill().bfill().reset_index(drop=True)
@@ -0,0 +1,301 @@
+"""
+Online (streaming) statistics for temperature analysis.
+"""
+
+from collections import deque
+from typing import Dict, Any, Optional, Union
+import math
+import numpy as np
+import pandas as pd
+
+# Slope (per sample, or per day for time-based windows) beyond which the
+# temperature trend counts as rising or falling
+TREND_THRESHOLD = 0.1
+
+
+def trend_label(slope: Optional[float]) -> str:
+    """
+    Classify a least-squares slope as a trend.
+
+    Args:
+        slope: Slope of the fitted line, or None with fewer than two points
+
+    Returns:
+        'rising', 'falling', 'stable' or 'unknown'
+    """
+    if slope is None:
+        return 'unknown'
+    return 'rising' if slope > TREND_THRESHOLD else 'falling' if slope < -TREND_THRESHOLD else 'stable'
+
+
+class OnlineStats:
+    """
+    Running count, mean/variance (Welford), min/max and least-squares slope.
+
+    The slope is fitted against x (the sample index unless given) from the
+    running co-moment of x and y, so adding a reading is O(1) and the
+    result matches np.polyfit(x, y, 1)[0] over all readings seen.
+    """
+
+    def __init__(self):
+        """Initialize an empty accumulator."""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.x_mean = 0.0
+        self.x_m2 = 0.0
+        self.cov = 0.0
+
+    @classmethod
+    def from_values(cls, values, x=None) -> 'OnlineStats':
+        """
+        Build an accumulator from a batch of values in one vectorized pass.
+
+        Args:
+            values: Readings (NaN values are skipped)
+            x: Positions of the readings (sample index if None)
+
+        Returns:
+            OnlineStats instance
+        """
+        stats = cls()
+        stats.update(values, x)
+        return stats
+
+    def add(self, value: float, x: Optional[float] = None) -> None:
+        """
+        Add one reading in O(1).
+
+        Args:
+            value: Reading (NaN is ignored)
+            x: Position of the reading (next sample index if None)
+        """
+        if value is None or math.isnan(value):
+            return
+        if x is None:
+            x = float(self.count)
+
+        self.count += 1
+        dx = x - self.x_mean
+        self.x_mean += dx / self.count
+        dy = value - self.mean
+        self.mean += dy / self.count
+        self.x_m2 += dx * (x - self.x_mean)
+        self.m2 += dy * (value - self.mean)
+        self.cov += dx * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def remove(self, value: float, x: float) -> None:
+        """
+        Remove a previously added reading in O(1).
+
+        Only the moments are updated; min and max cannot be reverted and
+        are tracked by SlidingWindowStats instead.
+
+        Args:
+            value: Reading that was added
+            x: Position it was added at
+        """
+        if value is None or math.isnan(value):
+            return
+        if self.count <= 1:
+            self.__init__()
+            return
+
+        self.count -= 1
+        dx = x - self.x_mean
+        self.x_mean -= dx / self.count
+        dy = value - self.mean
+        self.mean -= dy / self.count
+        self.x_m2 -= dx * (x - self.x_mean)
+        self.m2 -= dy * (value - self.mean)
+        self.cov -= dx * (value - self.mean)
+
+    def update(self, values, x=None) -> None:
+        """
+        Add a batch of readings with NumPy and merge them in.
+
+        Args:
+            values: Readings (NaN values are skipped)
+            x: Positions of the readings (continuing the sample index if None)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if x is None:
+            x = np.arange(self.count, self.count + len(values), dtype=np.float64)
+        else:
+            x = np.asarray(x, dtype=np.float64)
+        valid = ~np.isnan(values)
+        values, x = values[valid], x[valid]
+        if len(values) == 0:
+            return
+
+        batch = OnlineStats()
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.x_mean = float(x.mean())
+        dy = values - batch.mean
+        dx = x - batch.x_mean
+        batch.m2 = float(dy @ dy)
+        batch.x_m2 = float(dx @ dx)
+        batch.cov = float(dx @ dy)
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        self.merge(batch)
+
+    def merge(self, other: 'OnlineStats') -> None:
+        """
+        Merge another accumulator into this one (Chan et al. parallel update).
+
+        Args:
+            other: Accumulator over a disjoint set of readings
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            return
+
+        count = self.count + other.count
+        dy = other.mean - self.mean
+        dx = other.x_mean - self.x_mean
+        weight = self.count * other.count / count
+        self.m2 += other.m2 + dy * dy * weight
+        self.x_m2 += other.x_m2 + dx * dx * weight
+        self.cov += other.cov + dx * dy * weight
+        self.mean += dy * other.count / count
+        self.x_mean += dx * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Sample variance, or None with fewer than two readings."""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def slope(self) -> Optional[float]:
+        """Least-squares slope of the readings against x, or None if undefined."""
+        if self.count < 2 or self.x_m2 <= 0:
+            return None
+        return self.cov / self.x_m2
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the metrics in the shape returned by EnvironmentalAgent.analyze_temperature.
+
+        Returns:
+            Dictionary with mean, min, max and trend
+        """
+        if self.count == 0:
+            return {'mean': None, 'min': None, 'max': None, 'trend': None}
+        return {
+            'mean': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'trend': trend_label(self.slope)
+        }
+
+
+class SlidingWindowStats:
+    """
+    OnlineStats over the most recent readings only.
+
+    The window is either a number of readings or a time span. Evicted
+    readings are subtracted from the running moments and min/max come from
+    monotonic deques, so each reading is added and evicted in amortised
+    O(1). Readings are expected to arrive in time order.
+    """
+
+    def __init__(self, window: Union[int, str, pd.Timedelta]):
+        """
+        Initialize an empty window.
+
+        Args:
+            window: Number of readings, or a time span such as '24h'
+        """
+        self.size = window if isinstance(window, int) else None
+        self.span = None if self.size is not None else pd.Timedelta(window).value
+        self.stats = OnlineStats()
+        self._entries = deque()
+        self._min = deque()
+        self._max = deque()
+        self._seq = 0
+
+    def add(self, value: float, timestamp: Optional[Any] = None) -> None:
+        """
+        Add a reading and evict those that fell out of the window.
+
+        Args:
+            value: Reading (NaN is ignored)
+            timestamp: Time of the reading (required for time-based windows)
+        """
+        if value is None or math.isnan(value):
+            return
+
+        if self.span is not None:
+            t = pd.Timestamp(timestamp).value
+            x = t / 86_400e9  # Days, so slopes are per day
+        else:
+            t = self._seq
+            x = float(self._seq)
+        self._seq += 1
+
+        self.stats.add(value, x)
+        self._entries.append((t, x, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((t, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((t, value))
+
+        self._evict(t)
+
+    def update(self, values, timestamps=None) -> None:
+        """
+        Add a batch of readings in order.
+
+        Args:
+            values: Readings
+            timestamps: Times of the readings (required for time-based windows)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if timestamps is None:
+            for value in values.tolist():
+                self.add(value)
+        else:
+            timestamps = np.asarray(timestamps, dtype='datetime64[ns]').view(np.int64)
+            for value, timestamp in zip(values.tolist(), timestamps.tolist()):
+                self.add(value, timestamp)
+
+    def _evict(self, now: int) -> None:
+        """Drop readings that are no longer inside the window."""
+        cutoff = now - (self.span if self.span is not None else self.size)
+
+        while self._entries and self._entries[0][0] <= cutoff:
+            t, x, value = self._entries.popleft()
+            self.stats.remove(value, x)
+        while self._min and self._min[0][0] <= cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] <= cutoff:
+            self._max.popleft()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the window's metrics in the analyze_temperature shape.
+
+        Returns:
+            Dictionary with mean, min, max and trend
+        """
+        metrics = self.stats.metrics()
+        if self._entries:
+            metrics['min'] = self._min[0][1]
+            metrics['max'] = self._max[0][1]
+        return metrics
@@ -0,0 +1,280 @@
+"""
+Columnar local archive of historical NASA POWER data.
+"""
+
+import os
+import sys
+import uuid
+import datetime
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Add the project root to the path so we can import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.nasa_data import POWER_COLUMNS
+
+# Default location of the archive
+POWER_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "data", "power_archive")
+
+# Arrow schema of the archived columns
+ARCHIVE_SCHEMA = pa.schema(
+    [pa.field('date', pa.timestamp('ms'))] +
+    [pa.field(column, pa.float64()) for column in POWER_COLUMNS[1:]]
+)
+
+
+class PowerArchive:
+    """
+    Append-only Parquet archive of daily POWER data.
+
+    Files are partitioned by grid cell and year
+    (<root>/cell=<lat>_<lon>/year=<year>/part-*.parquet), so range reads
+    only open the years they need and only decode the requested columns.
+    """
+
+    def __init__(self, root: str = POWER_ARCHIVE_DIR, max_parts_per_year: int = 32):
+        """
+        Initialize the archive.
+
+        Args:
+            root: Root directory of the archive
+            max_parts_per_year: Number of part files in a year partition
+                after which the partition is compacted into one file
+        """
+        self.root = root
+        self.max_parts_per_year = max_parts_per_year
+        self._lock = threading.Lock()
+
+    def _cell_dir(self, cell: Tuple[float, float]) -> str:
+        """Get the directory holding one grid cell."""
+        lat, lon = cell
+        return os.path.join(self.root, f"cell={lat:+08.3f}_{lon:+08.3f}")
+
+    def _year_dir(self, cell: Tuple[float, float], year: int) -> str:
+        """Get the directory holding one year of a grid cell."""
+        return os.path.join(self._cell_dir(cell), f"year={year}")
+
+    def _part_files(self, cell: Tuple[float, float], year: int) -> List[str]:
+        """List the part files of a year partition."""
+        year_dir = self._year_dir(cell, year)
+        if not os.path.isdir(year_dir):
+            return []
+        return sorted(os.path.join(year_dir, name) for name in os.listdir(year_dir)
+                      if name.endswith('.parquet'))
+
+    def _to_table(self, df: pd.DataFrame) -> pa.Table:
+        """Convert a POWER frame to an Arrow table with the archive schema."""
+        df = df.reindex(columns=POWER_COLUMNS).copy()
+        df['date'] = pd.to_datetime(df['date']).astype('datetime64[ms]')
+        return pa.Table.from_pandas(df, schema=ARCHIVE_SCHEMA, preserve_index=False)
+
+    def append(self, cell: Tuple[float, float], df: pd.DataFrame) -> int:
+        """
+        Append rows for a grid cell. Dates already archived are skipped, so
+        archived values are never rewritten.
+
+        Args:
+            cell: Grid cell (lat, lon) the data belongs to
+            df: Frame with POWER_COLUMNS
+
+        Returns:
+            Number of rows written
+        """
+        if df.empty:
+            return 0
+
+        df = df.drop_duplicates(subset='date', keep='last')
+        years = pd.to_datetime(df['date']).dt.year
+        written = 0
+
+        with self._lock:
+            for year, year_df in df.groupby(years.to_numpy()):
+                existing = self._archived_dates(cell, int(year))
+                new_rows = year_df[~pd.to_datetime(year_df['date']).isin(existing)]
+                if new_rows.empty:
+                    continue
+
+                year_dir = self._year_dir(cell, int(year))
+                os.makedirs(year_dir, exist_ok=True)
+                path = os.path.join(year_dir, f"part-{uuid.uuid4().hex}.parquet")
+                pq.write_table(self._to_table(new_rows.sort_values('date')), path)
+                written += len(new_rows)
+
+                if len(self._part_files(cell, int(year))) > self.max_parts_per_year:
+                    self._compact_year(cell, int(year))
+
+        return written
+
+    def _archived_dates(self, cell: Tuple[float, float], year: int) -> pd.DatetimeIndex:
+        """Read only the date column of a year partition."""
+        files = self._part_files(cell, year)
+        if not files:
+            return pd.DatetimeIndex([])
+        table = ds.dataset(files, schema=ARCHIVE_SCHEMA, format='parquet').to_table(columns=['date'])
+        return pd.DatetimeIndex(table.column('date').to_pandas())
+
+    def _compact_year(self, cell: Tuple[float, float], year: int) -> None:
+        """Rewrite all part files of a year partition as a single sorted file."""
+        files = self._part_files(cell, year)
+        if len(files) <= 1:
+            return
+
+        table = ds.dataset(files, schema=ARCHIVE_SCHEMA, format='parquet').to_table()
+        table = table.sort_by('date')
+        path = os.path.join(self._year_dir(cell, year), f"part-{uuid.uuid4().hex}.parquet")
+        pq.write_table(table, path)
+        for old_path in files:
+            os.remove(old_path)
+
+    def compact(self, cell: Tuple[float, float]) -> None:
+        """
+        Compact every year partition of a grid cell into one file per year.
+
+        Args:
+            cell: Grid cell (lat, lon)
+        """
+        with self._lock:
+            for year in self.years(cell):
+                self._compact_year(cell, year)
+
+    def checkpoint_path(self, cell: Tuple[float, float]) -> str:
+        """
+        Get the path of the backfill checkpoint file of a grid cell.
+
+        Args:
+            cell: Grid cell (lat, lon)
+
+        Returns:
+            Path of the checkpoint JSON file
+        """
+        return os.path.join(self._cell_dir(cell), "backfill_checkpoint.json")
+
+    def years(self, cell: Tuple[float, float]) -> List[int]:
+        """
+        List the archived years of a grid cell.
+
+        Args:
+            cell: Grid cell (lat, lon)
+
+        Returns:
+            Sorted list of years
+        """
+        cell_dir = self._cell_dir(cell)
+        if not os.path.isdir(cell_dir):
+            return []
+        return sorted(int(name.split('=', 1)[1]) for name in os.listdir(cell_dir)
+                      if name.startswith('year='))
+
+    def read(self, cell: Tuple[float, float], start: Optional[datetime.datetime] = None,
+             end: Optional[datetime.datetime] = None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read archived rows for a grid cell.
+
+        Only the year partitions overlapping the range are opened, the date
+        filter is pushed down to the Parquet reader, and only the requested
+        columns are decoded.
+
+        Args:
+            cell: Grid cell (lat, lon)
+            start: First date to include (None for no lower bound)
+            end: Last date to include (None for no upper bound)
+            columns: Columns to return besides date (all if None)
+
+        Returns:
+            Frame sorted by date with the date column and requested columns
+        """
+        columns = ['date'] + [c for c in (columns or POWER_COLUMNS[1:]) if c != 'date']
+        start = pd.Timestamp(start).normalize() if start is not None else None
+        end = pd.Timestamp(end).normalize() if end is not None else None
+
+        expression = None
+        if start is not None:
+            expression = ds.field('date') >= pa.scalar(start.to_pydatetime(), pa.timestamp('ms'))
+        if end is not None:
+            upper = ds.field('date') <= pa.scalar(end.to_pydatetime(), pa.timestamp('ms'))
+            expression = upper if expression is None else expression & upper
+
+        # Hold the lock so a compaction cannot show both the compacted file
+        # and the parts it replaces, or delete a part while it is read
+        with self._lock:
+            files = []
+            for year in self.years(cell):
+                if (start is not None and year < start.year) or (end is not None and year > end.year):
+                    continue
+                files.extend(self._part_files(cell, year))
+
+            if not files:
+                return pd.DataFrame(columns=columns)
+
+            table = ds.dataset(files, schema=ARCHIVE_SCHEMA, format='parquet').to_table(
+                columns=columns, filter=expression
+            )
+        return table.to_pandas().sort_values('date').reset_index(drop=True)
+
+    @staticmethod
+    def missing_ranges(dates: pd.Series, start: datetime.datetime,
+                       end: datetime.datetime) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Find the days of a range that are not covered by archived rows.
+
+        Args:
+            dates: Dates of the rows read for the range
+            start: First date of the range
+            end: Last date of the range
+
+        Returns:
+            List of (first, last) dates of each run of consecutive missing days
+        """
+        expected = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq='D')
+        archived = pd.DatetimeIndex(pd.to_datetime(dates)).normalize()
+        missing = expected[~expected.isin(archived)]
+        if missing.empty:
+            return []
+
+        # A new run starts wherever consecutive missing days are more than a day apart
+        breaks = np.flatnonzero((missing[1:] - missing[:-1]) > pd.Timedelta(days=1)) + 1
+        firsts = np.concatenate([[0], breaks])
+        lasts = np.concatenate([breaks - 1, [len(missing) - 1]])
+        return [(missing[first], missing[last]) for first, last in zip(firsts, lasts)]
+
+    def last_date(self, cell: Tuple[float, float]) -> Optional[pd.Timestamp]:
+        """
+        Get the most recent archived date of a grid cell.
+
+        Args:
+            cell: Grid cell (lat, lon)
+
+        Returns:
+            Last archived date, or None if the cell is not archived
+        """
+        with self._lock:
+            years = self.years(cell)
+            if not years:
+                return None
+            dates = self._archived_dates(cell, years[-1])
+        return dates.max() if len(dates) else None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get archive size statistics.
+
+        Returns:
+            Dictionary with number of cells, part files and bytes on disk
+        """
+        cells = files = size = 0
+        if os.path.isdir(self.root):
+            for dirpath, _, filenames in os.walk(self.root):
+                if os.path.basename(dirpath).startswith('cell='):
+                    cells += 1
+                for name in filenames:
+                    if name.endswith('.parquet'):
+                        files += 1
+                        size += os.path.getsize(os.path.join(dirpath, name))
+        return {'cells': cells, 'files': files, 'bytes': size}
@@ -0,0 +1,231 @@
+"""
+Persistent on-disk cache for NASA POWER daily data.
+"""
+
+import os
+import sys
+import json
+import time
+import datetime
+import threading
+from typing import Dict, List, Tuple
+
+# Add the project root to the path so we can import the config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import POWER_CACHE_PARAMS
+
+# Default location of the cache files
+POWER_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "data", "power_cache")
+
+# NASA's missing data indicator
+MISSING_VALUE = -999
+
+
+class PowerCache:
+    """
+    Cache of daily NASA POWER values keyed by grid cell, parameter set and date.
+
+    Each (grid cell, parameter set) pair is stored as one JSON file holding the
+    values and fetch time for every cached date. Values for past dates never
+    change, except for the last few days which POWER still revises, so those
+    expire after a TTL.
+    """
+
+    def __init__(self, cache_dir: str = POWER_CACHE_DIR,
+                 max_files: int = POWER_CACHE_PARAMS['max_files'],
+                 revision_days: int = POWER_CACHE_PARAMS['revision_days'],
+                 recent_ttl_hours: float = POWER_CACHE_PARAMS['recent_ttl_hours']):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache files
+            max_files: Maximum number of cache files kept before evicting the
+                least recently used ones
+            revision_days: Number of most recent days that POWER may still revise
+            recent_ttl_hours: Time after which values for those days expire
+        """
+        self.cache_dir = cache_dir
+        self.max_files = max_files
+        self.revision_days = revision_days
+        self.recent_ttl = recent_ttl_hours * 3600
+        self._lock = threading.Lock()
+
+    def _path(self, cell: Tuple[float, float], parameters: List[str]) -> str:
+        """Get the cache file path for a grid cell and parameter set."""
+        lat, lon = cell
+        param_key = "-".join(sorted(parameters))
+        return os.path.join(self.cache_dir, f"{lat:+08.3f}_{lon:+08.3f}_{param_key}.json")
+
+    def _read(self, path: str) -> Dict[str, Dict]:
+        """Read a cache file, returning an empty entry if missing or corrupt."""
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    entry = json.load(f)
+                # Mark the file as recently used for LRU eviction
+                os.utime(path, None)
+                return entry
+            except (json.JSONDecodeError, OSError):
+                pass
+        return {'values': {}, 'fetched_at': {}}
+
+    def _final_after(self, date_str: str) -> float:
+        """Get the time after which POWER no longer revises a date's values."""
+        date = datetime.datetime.strptime(date_str, "%Y%m%d")
+        return (date + datetime.timedelta(days=self.revision_days)).timestamp()
+
+    def _is_fresh(self, date_str: str, fetched_at: float, now: float) -> bool:
+        """
+        Check whether a cached date is still valid.
+
+        Values fetched once the date left the revision window are final;
+        values fetched earlier were provisional and expire after the TTL,
+        even if the date has left the window since.
+        """
+        if fetched_at >= self._final_after(date_str):
+            return True
+        return now - fetched_at < self.recent_ttl
+
+    def missing_dates(self, cell: Tuple[float, float], parameters: List[str],
+                      dates: List[str]) -> List[str]:
+        """
+        Get the dates that are not cached or whose cached values have expired.
+
+        Args:
+            cell: Grid cell (lat, lon) the data belongs to
+            parameters: POWER parameter names
+            dates: Requested dates as YYYYMMDD strings
+
+        Returns:
+            Sorted list of dates that must be fetched
+        """
+        with self._lock:
+            entry = self._read(self._path(cell, parameters))
+
+        now = time.time()
+        missing = []
+        for date_str in dates:
+            fetched_at = entry['fetched_at'].get(date_str)
+            if fetched_at is None or not self._is_fresh(date_str, fetched_at, now):
+                missing.append(date_str)
+        return sorted(missing)
+
+    def final_dates(self, cell: Tuple[float, float], parameters: List[str],
+                    dates: List[str]) -> List[str]:
+        """
+        Get the cached dates whose values POWER will no longer revise.
+
+        Args:
+            cell: Grid cell (lat, lon) the data belongs to
+            parameters: POWER parameter names
+            dates: Dates to check as YYYYMMDD strings
+
+        Returns:
+            Sorted list of dates cached with values fetched after their
+            revision window closed
+        """
+        with self._lock:
+            entry = self._read(self._path(cell, parameters))
+
+        return sorted(date_str for date_str in dates
+                      if entry['fetched_at'].get(date_str, 0) >= self._final_after(date_str))
+
+    def load(self, cell: Tuple[float, float], parameters: List[str],
+             dates: List[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Load cached values in the POWER response layout.
+
+        Args:
+            cell: Grid cell (lat, lon) the data belongs to
+            parameters: POWER parameter names
+            dates: Requested dates as YYYYMMDD strings
+
+        Returns:
+            Mapping of parameter name to {date_str: value}
+        """
+        with self._lock:
+            entry = self._read(self._path(cell, parameters))
+
+        result = {param: {} for param in parameters}
+        for date_str in dates:
+            row = entry['values'].get(date_str)
+            if row is None:
+                continue
+            for param in parameters:
+                result[param][date_str] = row.get(param, MISSING_VALUE)
+        return result
+
+    def store(self, cell: Tuple[float, float], parameters: List[str],
+              values: Dict[str, Dict[str, float]], dates: List[str]) -> None:
+        """
+        Store fetched values for a range of dates.
+
+        Only dates the response actually includes are stored, so an empty
+        or truncated response is requested again next time. Dates reported
+        as missing are stored as such once they have left the revision
+        window; inside it POWER may still fill them in, so they are left
+        out and requested again.
+
+        Args:
+            cell: Grid cell (lat, lon) the data belongs to
+            parameters: POWER parameter names
+            values: Mapping of parameter name to {date_str: value}
+            dates: Dates that were requested
+        """
+        path = self._path(cell, parameters)
+        now = time.time()
+
+        returned = [date_str for date_str in dates
+                    if any(date_str in values.get(param, {}) for param in parameters)]
+        if not returned:
+            return
+
+        with self._lock:
+            entry = self._read(path)
+            for date_str in returned:
+                row = {
+                    param: values.get(param, {}).get(date_str, MISSING_VALUE)
+                    for param in parameters
+                }
+                if now < self._final_after(date_str) and MISSING_VALUE in row.values():
+                    continue
+                entry['values'][date_str] = row
+                entry['fetched_at'][date_str] = now
+
+            # Write atomically so concurrent readers never see a partial file
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used files beyond the size cap."""
+        try:
+            files = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                     if name.endswith('.json')]
+        except OSError:
+            return
+
+        if len(files) <= self.max_files:
+            return
+
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Remove all cache files."""
+        with self._lock:
+            if not os.path.isdir(self.cache_dir):
+                return
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,275 @@
+"""
+Local stand-in server for the NASA POWER temporal/daily/point endpoint.
+
+In record mode requests are forwarded to the real API and the responses are
+saved; in replay mode saved responses (or synthetic ones when nothing was
+recorded) are served with configurable latency, error injection and payload
+size, so the fetch path can be tested and benchmarked offline.
+
+Usage:
+    python utils/power_stub_server.py --mode replay --port 8765 --latency 0.2
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse, parse_qsl
+import numpy as np
+import pandas as pd
+import requests
+
+# Add the project root to the path so we can import the config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import NASA_POWER_URL
+
+# Default location of recorded responses
+RECORDINGS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              "data", "power_recordings")
+
+# Query parameters that do not change the response
+IGNORED_QUERY_PARAMS = {'api_key'}
+
+
+def recording_key(query: Dict[str, str]) -> str:
+    """
+    Build a stable file name for a request's query parameters.
+
+    Args:
+        query: Query parameters of the request
+
+    Returns:
+        Hex digest identifying the request
+    """
+    relevant = sorted((k, v) for k, v in query.items() if k not in IGNORED_QUERY_PARAMS)
+    return hashlib.sha1(json.dumps(relevant).encode()).hexdigest()
+
+
+def synthetic_response(query: Dict[str, str], extra_parameters: int = 0,
+                       missing_rate: float = 0.0) -> Dict[str, Any]:
+    """
+    Build a POWER-like response for the requested point, dates and parameters.
+
+    Values are deterministic for a given location so repeated runs are
+    comparable.
+
+    Args:
+        query: Query parameters of the request
+        extra_parameters: Number of additional dummy parameters to inflate the payload
+        missing_rate: Fraction of values reported as -999
+
+    Returns:
+        Response body as a dictionary
+    """
+    lat = float(query.get('latitude', 0))
+    lon = float(query.get('longitude', 0))
+    dates = pd.date_range(query['start'], query['end'], freq='D')
+    date_strs = dates.strftime("%Y%m%d")
+    rng = np.random.default_rng(abs(hash((round(lat, 3), round(lon, 3)))) % (2 ** 32))
+
+    # Seasonal temperature curve around a latitude-dependent mean
+    season = np.cos(2 * np.pi * (dates.dayofyear.to_numpy() - 200) / 365.25)
+    base = 28 - abs(lat) * 0.4 + 8 * season * np.sign(lat or 1)
+
+    parameters = [p for p in query.get('parameters', 'T2M').split(',') if p]
+    parameters += [f"EXTRA{i}" for i in range(extra_parameters)]
+
+    values = {}
+    for param in parameters:
+        if param.startswith('GWET'):
+            series = np.clip(0.5 + 0.1 * rng.standard_normal(len(dates)), 0, 1)
+        elif param == 'T2M_MAX':
+            series = base + 6 + rng.standard_normal(len(dates))
+        elif param == 'T2M_MIN':
+            series = base - 6 + rng.standard_normal(len(dates))
+        elif param == 'PRECTOTCORR':
+            series = np.maximum(0, rng.gamma(0.5, 4, len(dates)))
+        elif param == 'RH2M':
+            series = np.clip(65 + 15 * rng.standard_normal(len(dates)), 5, 100)
+        else:
+            series = base + rng.standard_normal(len(dates))
+        series = series.round(2)
+        if missing_rate:
+            series[rng.random(len(dates)) < missing_rate] = -999
+        values[param] = dict(zip(date_strs, series.tolist()))
+
+    return {
+        'type': 'Feature',
+        'geometry': {'type': 'Point', 'coordinates': [lon, lat, 0]},
+        'properties': {'parameter': values},
+        'header': {'title': 'NASA/POWER stand-in', 'start': query['start'], 'end': query['end']}
+    }
+
+
+class PowerStubServer:
+    """Threaded HTTP server standing in for the NASA POWER daily point API."""
+
+    def __init__(self, mode: str = 'replay', host: str = '127.0.0.1', port: int = 0,
+                 recordings_dir: str = RECORDINGS_DIR, upstream_url: str = NASA_POWER_URL,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, extra_parameters: int = 0,
+                 missing_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Initialize the server.
+
+        Args:
+            mode: 'record' to proxy and save upstream responses, 'replay' to
+                serve saved or synthetic responses
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            recordings_dir: Directory of recorded responses
+            upstream_url: Real endpoint used in record mode
+            latency: Added delay per request in seconds
+            jitter: Maximum random extra delay in seconds
+            error_rate: Fraction of requests answered with error_status
+            error_status: HTTP status used for injected errors
+            extra_parameters: Dummy parameters added to synthetic responses
+            missing_rate: Fraction of synthetic values reported as -999
+            seed: Seed for latency jitter and error injection
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown mode: {mode}")
+
+        self.mode = mode
+        self.recordings_dir = recordings_dir
+        self.upstream_url = upstream_url
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.extra_parameters = extra_parameters
+        self.missing_rate = missing_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'recorded': 0, 'replayed': 0, 'synthetic': 0}
+
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to NASAEarthdata(base_url=...)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/temporal/daily/point"
+
+    def start(self) -> 'PowerStubServer':
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'PowerStubServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _respond(self, query: Dict[str, str]) -> tuple:
+        """Produce (status, body bytes) for a request."""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            inject_error = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if inject_error:
+            self._count('errors')
+            return self.error_status, json.dumps({'messages': ['Injected error']}).encode()
+
+        path = os.path.join(self.recordings_dir, f"{recording_key(query)}.json")
+
+        if self.mode == 'record':
+            response = requests.get(self.upstream_url, params=query, timeout=(5, 120))
+            if response.ok:
+                os.makedirs(self.recordings_dir, exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(response.content)
+                self._count('recorded')
+            return response.status_code, response.content
+
+        if os.path.exists(path):
+            self._count('replayed')
+            with open(path, 'rb') as f:
+                return 200, f.read()
+
+        self._count('synthetic')
+        body = synthetic_response(query, self.extra_parameters, self.missing_rate)
+        return 200, json.dumps(body).encode()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server._count('requests')
+                query = dict(parse_qsl(urlparse(self.path).query))
+                if 'start' not in query or 'end' not in query:
+                    status, body = 422, json.dumps({'messages': ['start and end are required']}).encode()
+                else:
+                    try:
+                        status, body = server._respond(query)
+                    except Exception as e:
+                        status, body = 502, json.dumps({'messages': [str(e)]}).encode()
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    """Run the stand-in server from the command line."""
+    parser = argparse.ArgumentParser(description="NASA POWER stand-in server")
+    parser.add_argument("--mode", choices=['record', 'replay'], default='replay')
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--recordings-dir", default=RECORDINGS_DIR)
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay per request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random extra delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--extra-parameters", type=int, default=0, help="Dummy parameters to inflate payloads")
+    parser.add_argument("--missing-rate", type=float, default=0.0, help="Fraction of -999 values")
+    args = parser.parse_args()
+
+    server = PowerStubServer(
+        mode=args.mode, host=args.host, port=args.port, recordings_dir=args.recordings_dir,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        error_status=args.error_status, extra_parameters=args.extra_parameters,
+        missing_rate=args.missing_rate
+    )
+    print(f"NASA POWER stand-in ({args.mode}) listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Multi-resolution min/mean/max rollups of sensor readings.
+"""
+
+from typing import Callable, Dict, List, Optional, Any
+import numpy as np
+import pandas as pd
+
+# Rollup resolutions from finest to coarsest. There is no level at the
+# resolution of the readings themselves: spans too short for the finest
+# level are read from the raw readings instead of keeping a copy of them.
+ROLLUP_LEVELS = ['1h', '1D', '7D']
+
+
+def readings_frame(readings: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """
+    Put raw readings in the layout of a rollup frame, one bucket per reading.
+
+    Args:
+        readings: Readings indexed by timestamp
+        columns: Columns to include
+
+    Returns:
+        Frame with <column>_mean, _min, _max (the reading) and _count (1, or
+        0 for a missing reading) columns
+    """
+    data = {}
+    for column in columns:
+        values = readings[column].to_numpy(dtype=np.float64)
+        data[f"{column}_mean"] = values
+        data[f"{column}_min"] = values
+        data[f"{column}_max"] = values
+        data[f"{column}_count"] = (~np.isnan(values)).astype(np.int64)
+    return pd.DataFrame(data, index=pd.DatetimeIndex(readings.index, name='date'))
+
+
+class RollupLevel:
+    """
+    Aggregates of one resolution kept in growable NumPy arrays.
+
+    For every bucket the minimum, maximum, sum and count of each column are
+    stored, so buckets can be merged with new readings without revisiting
+    the raw data.
+    """
+
+    def __init__(self, freq: str, columns: List[str], capacity: int = 1024):
+        """
+        Initialize an empty level.
+
+        Args:
+            freq: Bucket width as a pandas frequency string
+            columns: Columns to aggregate
+            capacity: Initial number of buckets allocated
+        """
+        self.freq = freq
+        self.width = pd.Timedelta(freq).value
+        self.columns = columns
+        self.size = 0
+        self.buckets = np.empty(capacity, dtype=np.int64)
+        self.stats = {
+            column: {
+                'min': np.empty(capacity, dtype=np.float64),
+                'max': np.empty(capacity, dtype=np.float64),
+                'sum': np.empty(capacity, dtype=np.float64),
+                'count': np.empty(capacity, dtype=np.int64)
+            }
+            for column in columns
+        }
+
+    def _reserve(self, size: int) -> None:
+        """Grow the arrays geometrically so appends stay amortised O(1)."""
+        capacity = len(self.buckets)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        self.buckets = np.resize(self.buckets, capacity)
+        for column in self.columns:
+            for name, values in self.stats[column].items():
+                self.stats[column][name] = np.resize(values, capacity)
+
+    def _aggregate(self, timestamps: np.ndarray, values: Dict[str, np.ndarray]) -> tuple:
+        """Aggregate a batch of readings into per-bucket statistics."""
+        bucket_ids = timestamps - timestamps % self.width
+        order = np.argsort(bucket_ids, kind='stable')
+        bucket_ids = bucket_ids[order]
+        buckets, starts = np.unique(bucket_ids, return_index=True)
+
+        batch = {}
+        for column in self.columns:
+            data = np.asarray(values[column], dtype=np.float64)[order]
+            valid = ~np.isnan(data)
+            batch[column] = {
+                'min': np.minimum.reduceat(np.where(valid, data, np.inf), starts),
+                'max': np.maximum.reduceat(np.where(valid, data, -np.inf), starts),
+                'sum': np.add.reduceat(np.where(valid, data, 0.0), starts),
+                'count': np.add.reduceat(valid.astype(np.int64), starts)
+            }
+        return buckets, batch
+
+    def update(self, timestamps: np.ndarray, values: Dict[str, np.ndarray]) -> None:
+        """
+        Merge a batch of readings into the level.
+
+        Readings at or after the last bucket (the usual case) are merged or
+        appended in O(batch); late readings for older buckets are merged in
+        place, and only buckets that did not exist yet require an insert.
+
+        Args:
+            timestamps: int64 nanosecond timestamps
+            values: Mapping of column name to values
+        """
+        if len(timestamps) == 0:
+            return
+
+        buckets, batch = self._aggregate(timestamps, values)
+        current = self.buckets[:self.size]
+        positions = np.searchsorted(current, buckets)
+        exists = positions < self.size
+        exists[exists] = current[positions[exists]] == buckets[exists]
+
+        # Merge into buckets that already exist
+        if exists.any():
+            target = positions[exists]
+            for column in self.columns:
+                stats, new = self.stats[column], batch[column]
+                stats['min'][target] = np.minimum(stats['min'][target], new['min'][exists])
+                stats['max'][target] = np.maximum(stats['max'][target], new['max'][exists])
+                stats['sum'][target] += new['sum'][exists]
+                stats['count'][target] += new['count'][exists]
+
+        new_mask = ~exists
+        if not new_mask.any():
+            return
+
+        new_buckets = buckets[new_mask]
+        self._reserve(self.size + len(new_buckets))
+        if self.size == 0 or new_buckets[0] > self.buckets[self.size - 1]:
+            # Append at the end
+            end = self.size + len(new_buckets)
+            self.buckets[self.size:end] = new_buckets
+            for column in self.columns:
+                for name, values_array in self.stats[column].items():
+                    values_array[self.size:end] = batch[column][name][new_mask]
+        else:
+            # Insert late buckets in sorted position
+            insert_at = positions[new_mask]
+            size = self.size + len(new_buckets)
+            self.buckets[:size] = np.insert(self.buckets[:self.size], insert_at, new_buckets)
+            for column in self.columns:
+                for name, values_array in self.stats[column].items():
+                    values_array[:size] = np.insert(values_array[:self.size], insert_at,
+                                                    batch[column][name][new_mask])
+        self.size += len(new_buckets)
+
+    def count_between(self, start: int, end: int) -> int:
+        """Number of buckets overlapping [start, end] (nanosecond timestamps)."""
+        current = self.buckets[:self.size]
+        lo = np.searchsorted(current, start - start % self.width, 'left')
+        hi = np.searchsorted(current, end, 'right')
+        return int(max(0, hi - lo))
+
+    def frame(self, start: int, end: int, columns: List[str]) -> pd.DataFrame:
+        """Aggregates of the buckets overlapping [start, end] as a DataFrame."""
+        current = self.buckets[:self.size]
+        lo = np.searchsorted(current, start - start % self.width, 'left')
+        hi = np.searchsorted(current, end, 'right')
+
+        data = {}
+        for column in columns:
+            stats = self.stats[column]
+            count = stats['count'][lo:hi]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                data[f"{column}_mean"] = np.where(count > 0, stats['sum'][lo:hi] / count, np.nan)
+            data[f"{column}_min"] = np.where(count > 0, stats['min'][lo:hi], np.nan)
+            data[f"{column}_max"] = np.where(count > 0, stats['max'][lo:hi], np.nan)
+            data[f"{column}_count"] = count
+        index = pd.DatetimeIndex(current[lo:hi].view('datetime64[ns]'), name='date')
+        return pd.DataFrame(data, index=index)
+
+
+class RollupPyramid:
+    """
+    Min/mean/max/count aggregates of sensor readings at several resolutions.
+
+    Queries pick the coarsest level that still has enough points for the
+    requested span, so the number of returned points (and the cost of
+    charting or analysing them) stays bounded as history grows. Spans too
+    short for even the finest level are read from the raw readings through
+    `source`, which is then bounded by that level's width times min_points.
+    """
+
+    def __init__(self, columns: List[str], levels: List[str] = ROLLUP_LEVELS,
+                 source: Optional[Callable[[pd.Timestamp, pd.Timestamp, List[str]], pd.DataFrame]] = None):
+        """
+        Initialize an empty pyramid.
+
+        Args:
+            columns: Columns to aggregate
+            levels: Resolutions from finest to coarsest
+            source: Function returning the raw readings of a [start, end]
+                range for the given columns (the finest level is used if None)
+        """
+        self.columns = columns
+        self.levels = [RollupLevel(freq, columns) for freq in levels]
+        self.source = source
+        self.readings = 0
+
+    def level(self, freq: str) -> RollupLevel:
+        """
+        Get the level of a resolution.
+
+        Args:
+            freq: Resolution as given to the constructor, e.g. '1D'
+
+        Returns:
+            The RollupLevel
+
+        Raises:
+            KeyError: If the pyramid does not keep that resolution
+        """
+        for level in self.levels:
+            if level.freq == freq:
+                return level
+        raise KeyError(f"No rollup level with resolution {freq}")
+
+    def update(self, df: pd.DataFrame) -> None:
+        """
+        Add new readings to every level.
+
+        Args:
+            df: Readings indexed by timestamp with the pyramid's columns
+        """
+        if df.empty:
+            return
+        timestamps = pd.DatetimeIndex(df.index).as_unit('ns').asi8
+        values = {column: df[column].to_numpy() for column in self.columns}
+        self.update_arrays(timestamps, values)
+
+    def update_arrays(self, timestamps: np.ndarray, values: Dict[str, np.ndarray]) -> None:
+        """
+        Add new readings given as arrays to every level.
+
+        Args:
+            timestamps: int64 nanosecond (or datetime64[ns]) timestamps
+            values: Mapping of column name to values
+        """
+        timestamps = np.asarray(timestamps).view(np.int64)
+        for level in self.levels:
+            level.update(timestamps, values)
+        self.readings += len(timestamps)
+
+    def span(self) -> Optional[tuple]:
+        """
+        Get the time span covered by the pyramid.
+
+        Returns:
+            Tuple of (start of the first, end of the last) bucket of the
+            finest level, or None
+        """
+        finest = self.levels[0]
+        if finest.size == 0:
+            return None
+        return (pd.Timestamp(int(finest.buckets[0])),
+                pd.Timestamp(int(finest.buckets[finest.size - 1]) + finest.width - 1))
+
+    def query(self, start: Optional[Any] = None, end: Optional[Any] = None,
+              columns: Optional[List[str]] = None, min_points: int = 200) -> pd.DataFrame:
+        """
+        Get aggregates for a time range at the coarsest sufficient resolution.
+
+        Args:
+            start: First timestamp to include (None for the beginning)
+            end: Last timestamp to include (None for the end)
+            columns: Columns to return (all if None)
+            min_points: Minimum number of points wanted for the span
+
+        Returns:
+            Frame indexed by bucket start with <column>_mean, _min, _max and
+            _count columns; the chosen resolution is in .attrs['resolution']
+            ('raw' for readings from the source)
+        """
+        columns = columns or self.columns
+        span = self.span()
+        if span is None:
+            return pd.DataFrame(columns=[f"{c}_{s}" for c in columns for s in ('mean', 'min', 'max', 'count')])
+
+        start_ns = pd.Timestamp(start).value if start is not None else span[0].value
+        end_ns = pd.Timestamp(end).value if end is not None else span[1].value
+
+        chosen = None
+        for level in reversed(self.levels):
+            if level.count_between(start_ns, end_ns) >= min_points:
+                chosen = level
+                break
+
+        if chosen is None and self.source is not None:
+            df = readings_frame(self.source(pd.Timestamp(start_ns), pd.Timestamp(end_ns), columns), columns)
+            df.attrs['resolution'] = 'raw'
+            return df
+
+        chosen = chosen or self.levels[0]
+        df = chosen.frame(start_ns, end_ns, columns)
+        df.attrs['resolution'] = chosen.freq
+        return df
@@ -0,0 +1,179 @@
+"""
+Tail-follow ingestion of sensor CSV files that gateways keep appending to.
+"""
+
+import io
+import os
+import sys
+import threading
+from typing import Callable, Optional
+import pandas as pd
+
+# Add the project root to the path so we can import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.iot_data import IoTDataLoader, IOT_COLUMNS
+
+
+class SensorFileFollower:
+    """
+    Follows an appending sensor CSV like `tail -F`.
+
+    Only bytes appended since the last poll are read and parsed; a partial
+    last line is left for the next poll. If the file is truncated it is
+    re-read from the start, and if it is replaced (rotated) the rest of the
+    old file is drained before switching to the new one.
+    """
+
+    def __init__(self, path: str, loader: Optional[IoTDataLoader] = None,
+                 from_start: bool = True):
+        """
+        Initialize the follower.
+
+        Args:
+            path: Path of the CSV file to follow
+            loader: Loader used to normalise parsed rows
+            from_start: Whether to ingest rows already in the file; if False
+                only rows appended after the first poll are returned
+        """
+        self.path = path
+        self.loader = loader or IoTDataLoader()
+        self.from_start = from_start
+        self.offset = 0
+        self.stats = {'polls': 0, 'rows': 0, 'bytes': 0, 'truncations': 0, 'rotations': 0}
+        self._file = None
+        self._inode = None
+        self._header = None
+        self._options = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _open(self, skip_existing: bool) -> bool:
+        """Open the current file at the path and read its header."""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return False
+
+        header = f.readline()
+        if not header.endswith(b'\n'):
+            # Header not completely written yet
+            f.close()
+            return False
+
+        inode = os.fstat(f.fileno()).st_ino
+        if inode == self._inode and self.offset >= len(header):
+            # Reopened after stop(): resume where we left off
+            pass
+        elif skip_existing:
+            self.offset = os.fstat(f.fileno()).st_size
+        else:
+            self.offset = len(header)
+
+        self._file = f
+        self._inode = inode
+        self._header = header
+        self._options = self.loader.read_options(header.decode().strip().split(','))
+        return True
+
+    def _read_new(self) -> bytes:
+        """Read complete lines appended to the open file since the last poll."""
+        size = os.fstat(self._file.fileno()).st_size
+        if size < self.offset:
+            # Truncated in place: start over after the header
+            self.stats['truncations'] += 1
+            self.offset = len(self._header) if size >= len(self._header) else 0
+
+        if size <= self.offset:
+            return b''
+
+        self._file.seek(self.offset)
+        data = self._file.read(size - self.offset)
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+        return data[:end]
+
+    def _rotated(self) -> bool:
+        """Whether the path now points at a different file."""
+        try:
+            return os.stat(self.path).st_ino != self._inode
+        except FileNotFoundError:
+            return False
+
+    def _parse(self, data: bytes) -> pd.DataFrame:
+        """Parse complete CSV lines into the compact reading layout."""
+        raw = pd.read_csv(io.BytesIO(self._header + data), **self._options)
+        return self.loader.normalise(raw)
+
+    def poll(self) -> pd.DataFrame:
+        """
+        Read the rows appended since the last poll.
+
+        Returns:
+            Frame with IOT_COLUMNS indexed by datetime64 'date' in file order
+            (empty if nothing new was appended)
+        """
+        self.stats['polls'] += 1
+        chunks = []
+
+        if self._file is None and not self._open(skip_existing=not self.from_start and self.stats['polls'] == 1):
+            return pd.DataFrame(columns=IOT_COLUMNS, index=pd.DatetimeIndex([], name='date'))
+
+        data = self._read_new()
+        if data:
+            chunks.append(self._parse(data))
+            self.stats['bytes'] += len(data)
+
+        if self._rotated():
+            # The old file is drained; continue with the new one from its start
+            self.stats['rotations'] += 1
+            self._file.close()
+            self._file = None
+            self._inode = None
+            if self._open(skip_existing=False):
+                data = self._read_new()
+                if data:
+                    chunks.append(self._parse(data))
+                    self.stats['bytes'] += len(data)
+
+        if not chunks:
+            return pd.DataFrame(columns=IOT_COLUMNS, index=pd.DatetimeIndex([], name='date'))
+
+        rows = pd.concat(chunks) if len(chunks) > 1 else chunks[0]
+        self.stats['rows'] += len(rows)
+        return rows
+
+    def follow(self, callback: Callable[[pd.DataFrame], None], interval: float = 1.0) -> 'SensorFileFollower':
+        """
+        Poll on a background thread and pass each non-empty batch to a callback.
+
+        Args:
+            callback: Function called with each batch of new rows
+            interval: Seconds between polls
+
+        Returns:
+            The follower, so it can be stopped later
+        """
+        def run():
+            while not self._stop.is_set():
+                try:
+                    batch = self.poll()
+                    if not batch.empty:
+                        callback(batch)
+                except Exception as e:
+                    print(f"Error following {self.path}: {e}")
+                self._stop.wait(interval)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background thread and close the file."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,131 @@
+"""
+Small dependency graph of stages run concurrently on a thread pool.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Any, Iterable, Optional
+
+
+class StageGraph:
+    """
+    Runs named stages as soon as the stages they depend on have finished.
+
+    Each stage is a function called with the results of its dependencies,
+    in the order they were declared. Stages without a path between them run
+    at the same time, so the wall-clock time of a run approaches that of its
+    slowest chain of stages rather than the sum of all stages. A stage whose
+    dependency failed is skipped.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        """
+        Create an empty graph.
+
+        Args:
+            max_workers: Maximum number of stages running at once
+        """
+        self.max_workers = max_workers
+        self.stages = {}
+
+    def add(self, name: str, func: Callable[..., Any], deps: Iterable[str] = ()) -> 'StageGraph':
+        """
+        Add a stage.
+
+        Args:
+            name: Unique stage name
+            func: Function called with the results of deps
+            deps: Names of stages that must finish first (already added)
+
+        Returns:
+            The graph, for chaining
+        """
+        deps = list(deps)
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        missing = [dep for dep in deps if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Stage {name} depends on unknown stage(s): {', '.join(missing)}")
+        self.stages[name] = (func, deps)
+        return self
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run every stage.
+
+        Returns:
+            Dictionary with the 'results' and 'errors' (exceptions) per stage
+            name, 'timings' per stage ('status', 'start' offset and
+            'seconds'), the 'wall' time and the 'total' time of all stages,
+            in seconds
+        """
+        results, errors, timings = {}, {}, {}
+        pending = dict(self.stages)
+        started = time.perf_counter()
+
+        def timed(name: str, func: Callable[..., Any], args: list) -> Any:
+            start = time.perf_counter()
+            timings[name] = {'status': 'running', 'start': start - started, 'seconds': None}
+            try:
+                return func(*args)
+            finally:
+                timings[name]['seconds'] = time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as executor:
+            in_flight = {}
+
+            def schedule() -> None:
+                for name, (func, deps) in list(pending.items()):
+                    if any(dep in errors or timings.get(dep, {}).get('status') == 'skipped' for dep in deps):
+                        del pending[name]
+                        timings[name] = {'status': 'skipped', 'start': None, 'seconds': 0.0}
+                    elif all(dep in results for dep in deps):
+                        del pending[name]
+                        args = [results[dep] for dep in deps]
+                        in_flight[executor.submit(timed, name, func, args)] = name
+
+            # Dependencies are added before their dependents, so one pass in
+            # insertion order also propagates skips down the graph
+            schedule()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = in_flight.pop(future)
+                    try:
+                        results[name] = future.result()
+                        timings[name]['status'] = 'success'
+                    except Exception as e:
+                        errors[name] = e
+                        timings[name]['status'] = 'error'
+                schedule()
+
+        return {
+            'results': results,
+            'errors': errors,
+            'timings': timings,
+            'wall': time.perf_counter() - started,
+            'total': sum(timing['seconds'] or 0.0 for timing in timings.values())
+        }
+
+
+def format_timings(run: Dict[str, Any], order: Optional[Iterable[str]] = None) -> str:
+    """
+    Format the stage timings of a run as a small table.
+
+    Args:
+        run: Output of StageGraph.run
+        order: Stage names in display order (by start time if None)
+
+    Returns:
+        One line per stage, then the wall and summed stage times
+    """
+    timings = run['timings']
+    if order is None:
+        order = sorted(timings, key=lambda name: (timings[name]['start'] is None, timings[name]['start'] or 0.0))
+    lines = []
+    for name in order:
+        timing = timings[name]
+        start = f"{timing['start'] * 1000:8.1f}" if timing['start'] is not None else f"{'-':>8}"
+        lines.append(f"{name:<16} {timing['status']:<8} start {start} ms  {(timing['seconds'] or 0.0) * 1000:8.1f} ms")
+    lines.append(f"{'wall':<16} {'':<8} {'':>15}    {run['wall'] * 1000:8.1f} ms (stages sum {run['total'] * 1000:.1f} ms)")
+    return "\n".join(lines)
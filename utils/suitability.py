@@ -0,0 +1,114 @@
+"""
+Vectorized crop suitability scoring against temperature arrays.
+"""
+
+from typing import Dict, Tuple, Any, List
+import numpy as np
+import pandas as pd
+
+# Status codes of the dense status array and their labels
+STATUS_IDEAL = 0
+STATUS_BELOW = 1
+STATUS_ABOVE = 2
+STATUS_UNKNOWN = 3
+STATUS_LABELS = np.array(['Ideal', 'Below Ideal', 'Above Ideal', 'Unknown'])
+
+# Score lost per degree outside the ideal range
+SCORE_PER_DEGREE = 10
+
+
+class SuitabilityScorer:
+    """
+    Scores every crop against every temperature of an array at once.
+
+    The crop bounds are compiled into arrays when the scorer is created, so
+    scoring is a single broadcast over (crops, *temperature shape) instead
+    of a Python loop per crop and value.
+    """
+
+    def __init__(self, crop_temp_ranges: Dict[str, Tuple[float, float]]):
+        """
+        Compile the crop temperature ranges.
+
+        Args:
+            crop_temp_ranges: Mapping of crop name to (min, max) ideal temperature
+        """
+        self.crops = list(crop_temp_ranges)
+        bounds = np.array([crop_temp_ranges[crop] for crop in self.crops], dtype=np.float64).reshape(-1, 2)
+        self.min_temps = bounds[:, 0]
+        self.max_temps = bounds[:, 1]
+        self.ideal_ranges = [f"{lo:g}°C – {hi:g}°C" for lo, hi in bounds]
+
+    def score(self, temperatures: Any) -> Dict[str, np.ndarray]:
+        """
+        Score all crops against a scalar or an array of temperatures.
+
+        Args:
+            temperatures: Temperature(s) of any shape, e.g. (timesteps,) or
+                (sites, timesteps)
+
+        Returns:
+            Dictionary of arrays shaped (crops, *temperatures.shape):
+            'score' (0-100), 'deviation' (degrees outside the ideal range)
+            and 'status' (STATUS_* codes)
+        """
+        temps = np.asarray(temperatures, dtype=np.float64)
+        shape = (-1,) + (1,) * temps.ndim
+        below = self.min_temps.reshape(shape) - temps
+        above = temps - self.max_temps.reshape(shape)
+
+        deviation = np.maximum(np.maximum(below, above), 0.0)
+        status = np.where(below > 0, STATUS_BELOW, np.where(above > 0, STATUS_ABOVE, STATUS_IDEAL))
+        status = np.where(np.isnan(deviation), STATUS_UNKNOWN, status).astype(np.int8)
+        score = np.clip(100.0 - SCORE_PER_DEGREE * deviation, 0.0, 100.0)
+
+        return {'score': score, 'deviation': deviation, 'status': status}
+
+    def to_dict(self, result: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Any]]:
+        """
+        Convert the scores of a single temperature to the per-crop dictionary.
+
+        Args:
+            result: Output of score() for a scalar temperature
+
+        Returns:
+            Dictionary mapping crop names to status, deviation, score and ideal range
+        """
+        return {
+            crop: {
+                'status': str(STATUS_LABELS[result['status'][i]]),
+                'deviation': float(result['deviation'][i]),
+                'score': float(result['score'][i]),
+                'ideal_range': self.ideal_ranges[i]
+            }
+            for i, crop in enumerate(self.crops)
+        }
+
+    def timeline(self, temperatures: pd.Series) -> pd.DataFrame:
+        """
+        Score all crops at every timestep of a temperature series.
+
+        Args:
+            temperatures: Temperatures indexed by time
+
+        Returns:
+            Frame of scores indexed like the series with one column per crop
+        """
+        scores = self.score(temperatures.to_numpy())['score']
+        return pd.DataFrame(scores.T, index=temperatures.index, columns=self.crops)
+
+    def best_crops(self, temperatures: Any, top: int = 3) -> List[List[str]]:
+        """
+        Rank crops by score for each temperature.
+
+        Args:
+            temperatures: 1-D array of temperatures
+            top: Number of crops to return per temperature
+
+        Returns:
+            List with the names of the best crops for each temperature
+        """
+        scores = self.score(np.atleast_1d(temperatures))['score']
+        order = np.argsort(-scores, axis=0, kind='stable')[:top]
+        crops = np.array(self.crops)
+        return [crops[order[:, i]].tolist() for i in range(order.shape[1])]
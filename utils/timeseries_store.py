@@ -0,0 +1,289 @@
+"""
+Memory-mapped columnar time-series store for greenhouse sensor readings.
+"""
+
+import os
+import sys
+import json
+import threading
+import contextlib
+from typing import Dict, List, Optional, Any
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path so we can import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.iot_data import IOT_COLUMNS
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within the process
+    fcntl = None
+
+# Default location of the sensor store
+SENSOR_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "data", "sensor_store")
+
+# Name of the timestamp column file (int64 nanoseconds since the epoch)
+TIMESTAMP_COLUMN = '_timestamp'
+
+
+class SensorStore:
+    """
+    Append-only columnar store with one fixed-width binary file per column.
+
+    Timestamps are kept sorted in their own int64 column, so a time range is
+    located with two binary searches and returned as zero-copy slices of
+    read-only memory maps. The maps are backed by the OS page cache, so
+    several processes reading the same store share one copy in memory.
+    """
+
+    def __init__(self, directory: str = SENSOR_STORE_DIR):
+        """
+        Open or create a store.
+
+        Args:
+            directory: Directory holding the column files
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._maps = {}
+        self._mapped_length = -1
+        self.meta = self._read_meta()
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    def _column_path(self, column: str) -> str:
+        return os.path.join(self.directory, f"{column}.bin")
+
+    def _read_meta(self) -> Dict[str, Any]:
+        """Read the store metadata, or an empty schema for a new store."""
+        if os.path.exists(self._meta_path()):
+            with open(self._meta_path(), 'r') as f:
+                return json.load(f)
+        return {'columns': {}, 'length': 0}
+
+    def _write_meta(self) -> None:
+        """Atomically write the metadata; readers only see committed rows."""
+        tmp_path = f"{self._meta_path()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self._meta_path())
+
+    def __len__(self) -> int:
+        return self.meta['length']
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of the stored value columns."""
+        return list(self.meta['columns'])
+
+    @contextlib.contextmanager
+    def _append_lock(self):
+        """
+        Hold an exclusive lock on the store across processes.
+
+        The lock is taken on a separate file because meta.json is replaced
+        on every commit, which would leave a lock on the old file behind.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, "append.lock"), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def refresh(self) -> None:
+        """Pick up rows appended by another process."""
+        with self._lock:
+            self.meta = self._read_meta()
+
+    def _map(self, column: str) -> np.ndarray:
+        """Get a read-only memory map of a column covering the committed rows."""
+        length = self.meta['length']
+        if self._mapped_length != length:
+            self._maps = {}
+            self._mapped_length = length
+        if column not in self._maps:
+            dtype = np.int64 if column == TIMESTAMP_COLUMN else np.dtype(self.meta['columns'][column])
+            if length == 0:
+                self._maps[column] = np.empty(0, dtype=dtype)
+            else:
+                self._maps[column] = np.memmap(self._column_path(column), dtype=dtype,
+                                               mode='r', shape=(length,))
+        return self._maps[column]
+
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        """
+        Get the most recent stored timestamp.
+
+        Returns:
+            Last timestamp, or None if the store is empty
+        """
+        with self._lock:
+            if self.meta['length'] == 0:
+                return None
+            return pd.Timestamp(int(self._map(TIMESTAMP_COLUMN)[-1]))
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Append readings indexed by timestamp.
+
+        The first append fixes the schema (column names and dtypes). Rows
+        not newer than the last stored timestamp are dropped, since the
+        timestamp column must stay sorted and re-appending the same
+        readings must not duplicate them. Rows committed by another process
+        are picked up first, so they are never overwritten.
+
+        Args:
+            df: Readings with a DatetimeIndex
+
+        Returns:
+            Number of rows appended
+        """
+        if df.empty:
+            return 0
+
+        df = df.sort_index(kind='stable')
+        timestamps = df.index.as_unit('ns').asi8
+
+        with self._lock, self._append_lock():
+            if os.path.exists(self._meta_path()):
+                self.meta = self._read_meta()
+            if not self.meta['columns']:
+                self.meta['columns'] = {c: np.dtype(df[c].dtype).str for c in df.columns}
+
+            if self.meta['length']:
+                last = int(self._map(TIMESTAMP_COLUMN)[-1])
+                late = timestamps <= last
+                if late.any():
+                    print(f"Dropping {int(late.sum())} readings not newer than the last stored timestamp")
+                    df, timestamps = df[~late], timestamps[~late]
+                    if df.empty:
+                        return 0
+
+            self._write_column(TIMESTAMP_COLUMN, np.asarray(timestamps, dtype=np.int64))
+            for column, dtype in self.meta['columns'].items():
+                if column in df.columns:
+                    values = df[column].to_numpy(dtype=np.dtype(dtype))
+                else:
+                    values = np.zeros(len(df), dtype=np.dtype(dtype))
+                self._write_column(column, values)
+
+            # Commit the new rows only once every column file is written
+            self.meta['length'] += len(df)
+            self._write_meta()
+
+        return len(df)
+
+    def _write_column(self, column: str, values: np.ndarray) -> None:
+        """
+        Write new values after the committed rows of a column file.
+
+        The file is first cut back to the committed length, so bytes left by
+        an interrupted append are discarded instead of shifting every later
+        row of this column against the others.
+        """
+        offset = self.meta['length'] * values.dtype.itemsize
+        path = self._column_path(column)
+        with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+            f.truncate(offset)
+            f.seek(offset)
+            f.write(np.ascontiguousarray(values).tobytes())
+
+    def _bounds(self, start: Optional[Any], end: Optional[Any]) -> slice:
+        """Binary-search the timestamp column for a [start, end] range."""
+        timestamps = self._map(TIMESTAMP_COLUMN)
+        lo = 0 if start is None else int(np.searchsorted(timestamps, pd.Timestamp(start).value, 'left'))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, pd.Timestamp(end).value, 'right'))
+        return slice(lo, max(lo, hi))
+
+    def range_arrays(self, start: Optional[Any] = None, end: Optional[Any] = None,
+                     columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Get readings in a time range as zero-copy NumPy slices.
+
+        Args:
+            start: First timestamp to include (None for the beginning)
+            end: Last timestamp to include (None for the end)
+            columns: Value columns to return (all if None)
+
+        Returns:
+            Mapping of 'timestamp' (datetime64[ns]) and each column to a
+            read-only array view
+        """
+        with self._lock:
+            bounds = self._bounds(start, end)
+            result = {'timestamp': self._map(TIMESTAMP_COLUMN)[bounds].view('datetime64[ns]')}
+            for column in (self.columns if columns is None else columns):
+                result[column] = self._map(column)[bounds]
+        return result
+
+    def rows_since(self, offset: int, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Get the readings stored after the first `offset` rows as zero-copy slices.
+
+        Lets consumers that keep derived data (such as rollups) catch up on
+        new rows without rescanning the store.
+
+        Args:
+            offset: Number of rows already consumed
+            columns: Value columns to return (all if None)
+
+        Returns:
+            Mapping of 'timestamp' (datetime64[ns]) and each column to a
+            read-only array view
+        """
+        with self._lock:
+            rows = slice(min(offset, self.meta['length']), self.meta['length'])
+            result = {'timestamp': self._map(TIMESTAMP_COLUMN)[rows].view('datetime64[ns]')}
+            for column in (self.columns if columns is None else columns):
+                result[column] = self._map(column)[rows]
+        return result
+
+    def range(self, start: Optional[Any] = None, end: Optional[Any] = None,
+              columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Get readings in a time range as a DataFrame.
+
+        Args:
+            start: First timestamp to include (None for the beginning)
+            end: Last timestamp to include (None for the end)
+            columns: Value columns to return (all if None)
+
+        Returns:
+            Frame indexed by datetime64 'date'
+        """
+        arrays = self.range_arrays(start, end, columns)
+        index = pd.DatetimeIndex(arrays.pop('timestamp'), name='date')
+        return pd.DataFrame(arrays, index=index, copy=False)
+
+    def clear(self) -> None:
+        """Delete every stored reading and the schema."""
+        with self._lock:
+            self._maps = {}
+            self._mapped_length = -1
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if name.endswith('.bin') or name == 'meta.json':
+                        os.remove(os.path.join(self.directory, name))
+            self.meta = {'columns': {}, 'length': 0}
+
+
+def open_sensor_store(directory: str = SENSOR_STORE_DIR) -> SensorStore:
+    """
+    Open the sensor store, creating it with the IoT reading schema if new.
+
+    Args:
+        directory: Directory holding the column files
+
+    Returns:
+        SensorStore instance
+    """
+    store = SensorStore(directory)
+    if not store.meta['columns']:
+        store.meta['columns'] = {
+            column: np.dtype(np.uint8 if column in ('N', 'P', 'K', 'actuator_state') else np.float32).str
+            for column in IOT_COLUMNS
+        }
+    return store